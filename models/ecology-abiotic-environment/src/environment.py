@@ -4,7 +4,13 @@
 """Environment module: broadcasts environmental conditions."""
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING
+import math
+import time
+import weakref
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional, Set, Tuple, TYPE_CHECKING
+
+import numpy as np
 
 if TYPE_CHECKING:  # pragma: no cover - typing only
     from biosim.visuals import VisualSpec
@@ -12,6 +18,151 @@ if TYPE_CHECKING:  # pragma: no cover - typing only
 from biosim import BioModule
 from biosim.signals import BioSignal, SignalMetadata
 
+from .ecology_support import (
+    EMPTY_OUTPUTS,
+    History,
+    PerfCounters,
+    ReadOnlyOutputs,
+    downsample_points,
+    memoized_visual,
+    timed,
+    with_perf,
+)
+
+
+_CONDITIONS_META = SignalMetadata(units=None, description="Environmental conditions", kind="state")
+
+
+# Fixed slot order of the float64 payload in a SharedConditions buffer.
+CONDITION_FIELDS: Tuple[str, ...] = ("t", "temperature", "water", "food", "sunlight")
+
+
+class SharedConditions:
+    """Fixed-layout shared-memory buffer broadcasting environmental conditions.
+
+    Layout: one int64 sequence number followed by one float64 per entry of
+    ``CONDITION_FIELDS``. The writer makes the sequence odd while a write is
+    in progress and even once it is complete, so readers in other processes
+    can take consistent snapshots without locks or pickling.
+
+    Use ``create`` in the process that owns the environment and ``attach``
+    (by ``name``) in workers. The owner's segment is unlinked by ``close()``,
+    or at garbage collection / interpreter exit if ``close()`` is never called.
+    """
+
+    _HEADER_BYTES = 8
+    _SPINS = 100  # busy retries in ``read`` before backing off
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        self._shm = shm
+        self._owner = owner
+        self._seq = np.ndarray((1,), dtype=np.int64, buffer=shm.buf, offset=0)
+        self._values = np.ndarray(
+            (len(CONDITION_FIELDS),), dtype=np.float64, buffer=shm.buf, offset=self._HEADER_BYTES
+        )
+        self._finalizer = weakref.finalize(self, _release_segment, shm, owner)
+
+    @classmethod
+    def create(cls, name: Optional[str] = None) -> "SharedConditions":
+        size = cls._HEADER_BYTES + 8 * len(CONDITION_FIELDS)
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError as exc:
+            raise FileExistsError(
+                f"shared-memory segment {name!r} already exists; choose another "
+                "shared_memory_name or close the environment that owns it"
+            ) from exc
+        buf = cls(shm, owner=True)
+        buf._seq[0] = 0
+        buf._values[:] = 0.0
+        return buf
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedConditions":
+        try:
+            # Python >= 3.13: keep the worker's resource tracker from unlinking
+            # a segment it does not own.
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def sequence(self) -> int:
+        """Number of completed writes (0 before the first write)."""
+        return int(self._seq[0]) // 2
+
+    @property
+    def values(self) -> np.ndarray:
+        """Zero-copy view of the payload slots, ordered as ``CONDITION_FIELDS``."""
+        return self._values
+
+    def write(self, conditions: Dict[str, float]) -> None:
+        if not self._owner:
+            raise RuntimeError("only the creating process may write shared conditions")
+        self._seq[0] += 1
+        for i, field in enumerate(CONDITION_FIELDS):
+            self._values[i] = float(conditions.get(field, 0.0))
+        self._seq[0] += 1
+
+    def read(self, timeout: float = 1.0) -> Tuple[int, Dict[str, float]]:
+        """Return ``(sequence, conditions)`` from a consistent snapshot.
+
+        Retries while a write is in progress, spinning briefly and then
+        sleeping with exponential backoff; raises ``TimeoutError`` if no
+        consistent snapshot is seen within ``timeout`` seconds.
+        """
+        deadline = time.monotonic() + timeout
+        delay = 0.0
+        attempts = 0
+        while True:
+            before = int(self._seq[0])
+            if not before % 2:
+                snapshot = self._values.copy()
+                if int(self._seq[0]) == before:
+                    return before // 2, dict(zip(CONDITION_FIELDS, snapshot.tolist()))
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"no consistent snapshot of {self.name!r} within {timeout}s")
+            attempts += 1
+            if attempts > self._SPINS:
+                delay = min(max(delay * 2, 1e-6), 1e-3)
+                time.sleep(delay)
+
+    def close(self) -> None:
+        """Release the mapping (and unlink it if owned); later calls do nothing."""
+        if self._seq is None:
+            return
+        # Drop the views before releasing the mapping they point into.
+        self._seq = self._values = None  # type: ignore[assignment]
+        self._finalizer()
+
+
+def _release_segment(shm: shared_memory.SharedMemory, owner: bool) -> None:
+    try:
+        shm.close()
+    except BufferError:
+        # Views into the mapping are still alive (e.g. at interpreter exit);
+        # the mapping goes with the process, the name must still be removed.
+        pass
+    if owner:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+_HISTORY_COLUMNS = {
+    "t": np.float64,
+    "temperature": np.float64,
+    "water": np.float64,
+    "food": np.float64,
+    "sunlight": np.float64,
+}
+
 
 class Environment(BioModule):
     """Broadcasts environmental conditions to all connected organism modules.
@@ -27,8 +178,26 @@ class Environment(BioModule):
         temperature_variation: Random variation in temperature per step.
         seasonal_cycle: If True, apply sinusoidal seasonal variation.
         season_period: Period of seasonal cycle in simulation time units.
+        horizon: Planned run length. When set, the seasonal and noise forcing
+            for every tick on the ``min_dt`` grid is precomputed in
+            ``setup``/``reset`` so ``advance_to`` is a table lookup.
+        seed: Random seed for temperature noise.
+        shared_memory_name: If set, every published conditions payload is also
+            written to a ``SharedConditions`` buffer of this name so worker
+            processes can read it zero-copy. The buffer is created in
+            ``setup`` (or on the first ``advance_to`` if ``setup`` is never
+            called); ``close()`` releases it.
+        history: Per-tick history retention: ``"full"``, ``"decimate:N"``,
+            ``"ring:N"`` or ``"none"``.
+        max_visual_points: Points per plotted series above which LTTB
+            downsampling applies (0 plots every point).
+        perf: Time ``set_inputs``/``advance_to``/``visualize``, count RNG draws
+            and report history size as a `perf` output and in
+            ``get_state()`` (off by default).
     """
 
+    _visual_params: Tuple[str, ...] = ("max_visual_points",)
+
     def __init__(
         self,
         temperature: float = 25.0,
@@ -38,9 +207,24 @@ class Environment(BioModule):
         temperature_variation: float = 0.0,
         seasonal_cycle: bool = False,
         season_period: float = 365.0,
+        horizon: Optional[float] = None,
+        seed: Optional[int] = None,
+        shared_memory_name: Optional[str] = None,
+        history: str = "full",
+        max_visual_points: int = 2000,
+        perf: bool = False,
         min_dt: float = 1.0,
     ) -> None:
         self.min_dt = min_dt
+        self.perf = bool(perf)
+        self._perf: Optional[PerfCounters] = PerfCounters(count_rng=True) if perf else None
+        self.horizon = horizon
+        self._horizon = horizon  # horizon the forcing table was last built for
+        self.seed = seed
+        self._rng = np.random.default_rng(seed)
+        self._forcing: Optional[np.ndarray] = None
+        self.shared_memory_name = shared_memory_name
+        self._shared: Optional[SharedConditions] = None
         self._temperature = temperature
         self._water = water
         self._food = food_availability
@@ -51,8 +235,13 @@ class Environment(BioModule):
         self._base_temperature = temperature
         self._base_water = water
         self._time: float = 0.0
-        self._history: List[Dict[str, float]] = []
-        self._outputs: Dict[str, BioSignal] = {}
+        self.history = history
+        self.max_visual_points = max_visual_points
+        self._history = History(_HISTORY_COLUMNS, history)
+        self._epoch = 0  # bumped by reset() to invalidate delta cursors
+        self._generation = 0
+        self._visual_cache: Dict[str, Tuple[Any, Any]] = {}
+        self._outputs: Dict[str, BioSignal] = EMPTY_OUTPUTS
 
         # Allow external control to modify these
         self.temperature = temperature
@@ -64,20 +253,90 @@ class Environment(BioModule):
         return set()
 
     def outputs(self) -> Set[str]:
-        return {"conditions"}
+        return {"conditions", "perf"} if self.perf else {"conditions"}
+
+    def setup(self, config: Optional[Dict[str, Any]] = None) -> None:
+        """Precompute the forcing table for the planned horizon.
+
+        The noise generator is reseeded first, so repeated calls with the same
+        ``seed`` build identical tables.
+        """
+        self._horizon = (config or {}).get("horizon", self.horizon)
+        self._rng = np.random.default_rng(self.seed)
+        self._forcing = self._build_forcing_table(self._horizon)
+        self._open_shared()
+
+    def _open_shared(self) -> Optional[SharedConditions]:
+        if self._shared is None and self.shared_memory_name is not None:
+            self._shared = SharedConditions.create(self.shared_memory_name)
+        return self._shared
 
     def reset(self) -> None:
         """Reset to initial state."""
+        self._generation += 1
         self._time = 0.0
-        self._history = []
+        self._history = History(_HISTORY_COLUMNS, self.history)
+        self._epoch += 1
         self._temperature = self._base_temperature
         self.temperature = self._base_temperature
-        self._outputs = {}
+        self._outputs = EMPTY_OUTPUTS
+        self._rng = np.random.default_rng(self.seed)
+        self._forcing = self._build_forcing_table(self._horizon)
+
+    @property
+    def forcing_table(self) -> Optional[np.ndarray]:
+        """Per-tick temperature offsets (seasonal + noise), or None if not precomputed.
+
+        Index ``k`` holds the offset applied at ``t = k * min_dt``. A batch
+        runner can hand the same table to several replicates via the setter.
+        """
+        return self._forcing
+
+    @forcing_table.setter
+    def forcing_table(self, table: Optional[np.ndarray]) -> None:
+        if table is None:
+            self._forcing = None
+            return
+        arr = np.asarray(table, dtype=np.float64)
+        if arr.ndim != 1:
+            raise ValueError("forcing_table must be one-dimensional")
+        arr.flags.writeable = False
+        self._forcing = arr
+
+    def _build_forcing_table(self, horizon: Optional[float]) -> Optional[np.ndarray]:
+        """Vectorized seasonal harmonic and seeded noise for ticks 0..horizon."""
+        if horizon is None or self.min_dt <= 0:
+            return None
+        if not self._seasonal_cycle and self._temp_variation <= 0:
+            return None
+
+        n_ticks = int(math.floor(float(horizon) / self.min_dt + 1e-9)) + 1
+        offsets = np.zeros(n_ticks, dtype=np.float64)
+        if self._seasonal_cycle:
+            t = np.arange(n_ticks, dtype=np.float64) * self.min_dt
+            offsets += 15.0 * np.sin(2 * np.pi * t / self._season_period)
+        if self._temp_variation > 0:
+            offsets += self._rng.normal(0.0, self._temp_variation, size=n_ticks)
+            if self._perf is not None:
+                self._perf.rng_draws += n_ticks
+        offsets.flags.writeable = False
+        return offsets
+
+    def _lookup_forcing(self, t: float) -> Optional[float]:
+        """Return the precomputed offset for ``t`` if it lies on the table grid."""
+        table = self._forcing
+        if table is None:
+            return None
+        k = int(round(t / self.min_dt))
+        if 0 <= k < table.shape[0] and abs(k * self.min_dt - t) <= 1e-9 * max(1.0, abs(t)):
+            return float(table[k])
+        return None
 
     def _compute_temperature(self, t: float) -> float:
         """Compute current temperature with optional seasonal cycle."""
-        import math
-        import random
+        offset = self._lookup_forcing(t)
+        if offset is not None:
+            return self.temperature + offset
 
         temp = self.temperature
 
@@ -89,11 +348,15 @@ class Environment(BioModule):
 
         # Apply random variation
         if self._temp_variation > 0:
-            temp += random.gauss(0, self._temp_variation)
+            temp += float(self._rng.normal(0.0, self._temp_variation))
+            if self._perf is not None:
+                self._perf.rng_draws += 1
 
         return temp
 
+    @timed
     def advance_to(self, t: float) -> None:
+        self._generation += 1
         self._time = t
 
         # Compute current environmental state
@@ -109,42 +372,85 @@ class Environment(BioModule):
         }
 
         # Record history
-        self._history.append(conditions.copy())
+        self._history.append(**conditions)
+
+        shared = self._open_shared()
+        if shared is not None:
+            shared.write(conditions)
 
         source_name = getattr(self, "_world_name", self.__class__.__name__)
-        self._outputs = {
+        self._outputs = ReadOnlyOutputs({
             "conditions": BioSignal(
                 source=source_name,
                 name="conditions",
                 value=conditions,
                 time=t,
-                metadata=SignalMetadata(units=None, description="Environmental conditions", kind="state"),
+                metadata=_CONDITIONS_META,
             )
-        }
+        })
+        if self._perf is not None:
+            self._outputs = with_perf(self._outputs, source_name, t, self._perf_snapshot())
 
     def get_outputs(self) -> Dict[str, BioSignal]:
-        return dict(self._outputs)
+        return self._outputs
+
+    def _perf_snapshot(self) -> Dict[str, Any]:
+        return self._perf.snapshot(len(self._history), self._history.nbytes)  # type: ignore[union-attr]
 
+    def get_state(self) -> Dict[str, Any]:
+        state: Dict[str, Any] = {
+            "time": self._time,
+            "temperature": self._temperature,
+        }
+        if self._perf is not None:
+            state["perf"] = self._perf_snapshot()
+        return state
+
+    def close(self) -> None:
+        """Release the shared-memory conditions buffer, if one was created."""
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+
+    @timed
+    @memoized_visual
     def visualize(self) -> Optional["VisualSpec"]:
         """Generate a multi-series timeseries of environmental conditions."""
-        if not self._history:
+        if not len(self._history):
+            return None
+        return self._timeseries(self._history.columns())
+
+    @memoized_visual
+    def visualize_delta(self, since: Optional[float] = None, epoch: Optional[int] = None) -> Optional["VisualSpec"]:
+        """Points recorded after ``since``; a full snapshot when the cursor is stale.
+
+        Pass back ``delta["cursor"]`` and ``delta["epoch"]`` from the previous
+        result. A missing cursor, an epoch from before the last `reset`, or a
+        cursor older than a ``ring:N`` history returns every retained point
+        with ``delta["full"]`` set.
+        """
+        if not len(self._history):
             return None
+        full = since is None or epoch != self._epoch or not self._history.covers(since)
+        delta = {"epoch": self._epoch, "cursor": self._history.last("t"), "full": full}
+        return {**self._timeseries(self._history.columns(None if full else since)), "delta": delta}
 
+    def _timeseries(self, cols: Dict[str, np.ndarray]) -> "VisualSpec":
         return {
             "render": "timeseries",
             "data": {
                 "series": [
                     {
                         "name": "Temperature (\u00b0C)",
-                        "points": [[h["t"], h["temperature"]] for h in self._history],
+                        "points": downsample_points(cols["t"], cols["temperature"], self.max_visual_points),
                     },
                     {
                         "name": "Water (%)",
-                        "points": [[h["t"], h["water"]] for h in self._history],
+                        "points": downsample_points(cols["t"], cols["water"], self.max_visual_points),
                     },
                     {
                         "name": "Food",
-                        "points": [[h["t"], h["food"]] for h in self._history],
+                        "points": downsample_points(cols["t"], cols["food"], self.max_visual_points),
                     },
                 ],
                 "title": "Environmental Conditions",
@@ -1,6 +1,16 @@
 from __future__ import annotations
 
 
+def _read_shared_in_child(name, queue):
+    from src.environment import SharedConditions
+
+    reader = SharedConditions.attach(name)
+    try:
+        queue.put(reader.read())
+    finally:
+        reader.close()
+
+
 def test_emits_conditions(biosim):
     from src.environment import Environment
 
@@ -14,3 +24,187 @@ def test_emits_conditions(biosim):
     assert sig.value["water"] == 80.0
     assert sig.value["food"] == 1.2
 
+
+
+def test_seasonal_forcing_table_matches_direct_computation(biosim):
+    from src.environment import Environment
+
+    direct = Environment(temperature=20.0, seasonal_cycle=True, season_period=12.0)
+    tabled = Environment(temperature=20.0, seasonal_cycle=True, season_period=12.0, horizon=24.0)
+    tabled.setup()
+    assert tabled.forcing_table is not None
+    assert len(tabled.forcing_table) == 25
+    for step in range(1, 25):
+        t = float(step)
+        direct.advance_to(t)
+        tabled.advance_to(t)
+        a = direct.get_outputs()["conditions"].value["temperature"]
+        b = tabled.get_outputs()["conditions"].value["temperature"]
+        assert abs(a - b) < 1e-9
+
+
+def test_seeded_noise_is_reproducible_across_reset(biosim):
+    from src.environment import Environment
+
+    env = Environment(temperature=20.0, temperature_variation=2.0, horizon=10.0, seed=7)
+    env.setup()
+    first = []
+    for step in range(1, 11):
+        env.advance_to(float(step))
+        first.append(env.get_outputs()["conditions"].value["temperature"])
+    env.reset()
+    second = []
+    for step in range(1, 11):
+        env.advance_to(float(step))
+        second.append(env.get_outputs()["conditions"].value["temperature"])
+    assert first == second
+    assert len(set(first)) > 1
+
+
+def test_reset_keeps_the_horizon_passed_to_setup(biosim):
+    import numpy as np
+
+    from src.environment import Environment
+
+    env = Environment(temperature=20.0, temperature_variation=2.0, seed=7)
+    env.setup({"horizon": 10.0})
+    table = env.forcing_table.copy()
+    assert len(table) == 11
+    env.advance_to(1.0)
+    env.reset()
+    assert env.forcing_table is not None
+    assert np.array_equal(env.forcing_table, table)
+
+
+def test_repeated_setup_rebuilds_the_same_noise_table(biosim):
+    import numpy as np
+
+    from src.environment import Environment
+
+    env = Environment(temperature=20.0, temperature_variation=2.0, horizon=20.0, seed=11)
+    env.setup()
+    first = env.forcing_table.copy()
+    env.advance_to(1.0)
+    env.setup()
+    assert np.array_equal(env.forcing_table, first)
+
+    fresh = Environment(temperature=20.0, temperature_variation=2.0, horizon=20.0, seed=11)
+    fresh.setup()
+    assert np.array_equal(fresh.forcing_table, first)
+
+
+def test_shared_memory_broadcast(biosim):
+    import uuid
+
+    from src.environment import SharedConditions, Environment
+
+    name = f"ecoenv_{uuid.uuid4().hex[:12]}"
+    env = Environment(temperature=18.0, water=60.0, shared_memory_name=name)
+    try:
+        env.advance_to(1.0)
+        env.advance_to(2.0)
+        reader = SharedConditions.attach(name)
+        seq, conditions = reader.read()
+        assert seq == 2
+        assert conditions["t"] == 2.0
+        assert conditions["temperature"] == 18.0
+        assert conditions["water"] == 60.0
+        reader.close()
+        reader.close()
+    finally:
+        env.close()
+        env.close()
+
+
+def test_shared_memory_is_readable_from_a_spawned_process(biosim):
+    import multiprocessing
+    import uuid
+
+    import pytest
+
+    from src.environment import Environment, SharedConditions
+
+    name = f"ecoenv_{uuid.uuid4().hex[:12]}"
+    env = Environment(temperature=18.0, water=60.0, shared_memory_name=name)
+    env.setup()
+    try:
+        with pytest.raises(FileExistsError, match=name):
+            Environment(shared_memory_name=name).setup()
+        for step in range(1, 4):
+            env.advance_to(float(step))
+
+        ctx = multiprocessing.get_context("spawn")
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_read_shared_in_child, args=(name, queue))
+        proc.start()
+        seq, conditions = queue.get(timeout=30)
+        proc.join(timeout=30)
+        assert proc.exitcode == 0
+        assert seq == 3
+        assert conditions["t"] == 3.0 and conditions["water"] == 60.0
+
+        # The worker detaching must not remove the owner's segment.
+        reader = SharedConditions.attach(name)
+        assert reader.read()[0] == 3
+        reader.close()
+    finally:
+        env.close()
+    with pytest.raises(FileNotFoundError):
+        SharedConditions.attach(name)
+
+
+def test_shared_read_times_out_on_a_stuck_writer(biosim):
+    import pytest
+
+    from src.environment import SharedConditions
+
+    buf = SharedConditions.create()
+    try:
+        buf._seq[0] = 1  # a write that never completes
+        with pytest.raises(TimeoutError):
+            buf.read(timeout=0.05)
+        buf._seq[0] = 2
+    finally:
+        buf.close()
+
+
+def test_visualize_delta_returns_only_new_points(biosim):
+    from src.environment import Environment
+
+    env = Environment(temperature=20.0, min_dt=1.0)
+    assert env.visualize_delta() is None
+    for i in range(10):
+        env.advance_to(float(i))
+
+    first = env.visualize_delta()
+    assert first["delta"] == {"epoch": 0, "cursor": 9.0, "full": True}
+    assert len(first["data"]["series"][0]["points"]) == 10
+
+    for i in range(10, 13):
+        env.advance_to(float(i))
+    delta = env.visualize_delta(since=first["delta"]["cursor"], epoch=first["delta"]["epoch"])
+    assert delta["delta"]["full"] is False
+    assert [p[0] for p in delta["data"]["series"][0]["points"]] == [10.0, 11.0, 12.0]
+    assert delta["data"]["series"] and delta["data"]["title"] == env.visualize()["data"]["title"]
+
+    env.reset()
+    env.advance_to(0.0)
+    stale = env.visualize_delta(since=delta["delta"]["cursor"], epoch=delta["delta"]["epoch"])
+    assert stale["delta"] == {"epoch": 1, "cursor": 0.0, "full": True}
+    assert len(stale["data"]["series"][0]["points"]) == 1
+
+
+def test_perf_counts_numpy_draws_and_history(biosim):
+    from src.environment import Environment
+
+    env = Environment(temperature_variation=1.0, seed=4, perf=True, min_dt=1.0)
+    for i in range(10):
+        env.advance_to(float(i + 1))
+    perf = env.get_outputs()["perf"].value
+    assert perf["rng_draws"] == 10
+    assert perf["calls"]["advance_to"] == 9
+    assert perf["history_len"] == 10 and perf["history_bytes"] >= 10 * 5 * 8
+
+    env = Environment(temperature_variation=1.0, seasonal_cycle=True, horizon=100.0, seed=4, perf=True, min_dt=1.0)
+    env.reset()
+    assert env.get_state()["perf"]["rng_draws"] == 101
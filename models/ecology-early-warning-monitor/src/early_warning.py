@@ -0,0 +1,283 @@
+# SPDX-FileCopyrightText: 2025-present Demi <bjaiye1@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Early-warning monitor: rolling critical-slowing-down indicators for regime shifts."""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from biosim import BioWorld
+    from biosim.visuals import VisualSpec
+
+from biosim import BioModule
+from biosim.signals import BioSignal, SignalMetadata
+
+from .ecology_support import EMPTY_OUTPUTS, ReadOnlyOutputs, memoized_visual, population_state
+
+
+_INDICATORS_META = SignalMetadata(description="Early-warning indicators", kind="state")
+_EARLY_WARNING_META = SignalMetadata(description="Early-warning alerts", kind="event")
+
+
+class _RollingMoments:
+    """Variance, lag-1 autocorrelation and skewness over the last ``size`` samples.
+
+    Running sums of x, x^2, x^3 and of adjacent products x[j] * x[j-1] are
+    updated in O(1) per sample from a circular buffer.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._buf = np.zeros(size, dtype=np.float64)
+        self._n = 0
+        self._s1 = 0.0
+        self._s2 = 0.0
+        self._s3 = 0.0
+        self._s_lag = 0.0
+
+    @property
+    def full(self) -> bool:
+        return self._n >= self.size
+
+    def push(self, value: float) -> None:
+        i = self._n
+        size = self.size
+        slot = i % size
+        if i >= size:
+            old = float(self._buf[slot])
+            self._s1 -= old
+            self._s2 -= old * old
+            self._s3 -= old * old * old
+            self._s_lag -= old * float(self._buf[(i + 1) % size])
+        if i > 0:
+            self._s_lag += float(self._buf[(i - 1) % size]) * value
+        self._buf[slot] = value
+        self._s1 += value
+        self._s2 += value * value
+        self._s3 += value * value * value
+        self._n += 1
+
+    def indicators(self) -> Dict[str, Optional[float]]:
+        m = min(self._n, self.size)
+        if m < 3:
+            return {"variance": None, "ar1": None, "skewness": None}
+        mean = self._s1 / m
+        var = max(0.0, self._s2 / m - mean * mean)
+        if var == 0.0:
+            return {"variance": 0.0, "ar1": None, "skewness": None}
+        first = float(self._buf[(self._n - m) % self.size])
+        last = float(self._buf[(self._n - 1) % self.size])
+        lag_cov = (self._s_lag - mean * (2 * self._s1 - first - last) + (m - 1) * mean * mean) / (m - 1)
+        m3 = self._s3 / m - 3 * mean * self._s2 / m + 2 * mean ** 3
+        return {
+            "variance": var,
+            "ar1": lag_cov / var,
+            "skewness": m3 / var ** 1.5,
+        }
+
+
+class _KendallTrend:
+    """Kendall tau of the last ``size`` values against time, updated in O(size)."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._buf = np.zeros(size, dtype=np.float64)
+        self._n = 0
+        self._score = 0.0  # sum of sign(later - earlier) over pairs in the window
+
+    @property
+    def full(self) -> bool:
+        return self._n >= self.size
+
+    def push(self, value: float) -> None:
+        m = min(self._n, self.size)
+        slot = self._n % self.size
+        if m == self.size:
+            old = self._buf[slot]
+            rest = np.delete(self._buf, slot)
+            self._score -= float(np.sign(rest - old).sum())
+            self._buf[slot] = value
+            self._score += float(np.sign(value - rest).sum())
+        else:
+            self._score += float(np.sign(value - self._buf[:m]).sum())
+            self._buf[slot] = value
+        self._n += 1
+
+    def tau(self) -> Optional[float]:
+        m = min(self._n, self.size)
+        if m < 2:
+            return None
+        return self._score / (m * (m - 1) / 2)
+
+
+class _SpeciesWarning:
+    """Indicator state for one species."""
+
+    def __init__(self, window: int, trend_window: int) -> None:
+        self.moments = _RollingMoments(window)
+        self.trends = {key: _KendallTrend(trend_window) for key in ("variance", "ar1", "skewness")}
+        self.latest: Dict[str, Optional[float]] = {"variance": None, "ar1": None, "skewness": None}
+        self.alerting = False
+
+    def push(self, value: float) -> None:
+        self.moments.push(value)
+        if not self.moments.full:
+            return
+        self.latest = self.moments.indicators()
+        for key, trend in self.trends.items():
+            v = self.latest[key]
+            if v is not None:
+                trend.push(v)
+
+    def summary(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = dict(self.latest)
+        for key, trend in self.trends.items():
+            out[f"tau_{key}"] = trend.tau()
+        return out
+
+
+class EarlyWarningMonitor(BioModule):
+    """Flags rising critical-slowing-down indicators ahead of regime shifts.
+
+    Receives `population_state` signals and, per species, keeps rolling
+    variance, lag-1 autocorrelation and skewness over the last ``window``
+    samples, plus the Kendall tau trend of each indicator over its last
+    ``trend_window`` values. Memory is constant and each sample costs
+    O(trend_window).
+
+    Publishes the current indicators in the `indicators` state signal and, when
+    both the variance and autocorrelation trends of a species reach
+    ``tau_threshold``, a one-off alert in the `early_warning` event signal
+    (re-armed once the trends fall back below the threshold).
+
+    Parameters:
+        window: Samples per rolling indicator window (>= 3).
+        trend_window: Indicator values per Kendall tau trend window (>= 2).
+        tau_threshold: Kendall tau above which a rising trend raises an alert.
+    """
+
+    def __init__(
+        self,
+        window: int = 50,
+        trend_window: int = 50,
+        tau_threshold: float = 0.7,
+        min_dt: float = 1.0,
+    ) -> None:
+        if window < 3:
+            raise ValueError("window must be at least 3")
+        if trend_window < 2:
+            raise ValueError("trend_window must be at least 2")
+        self.min_dt = min_dt
+        self.window = int(window)
+        self.trend_window = int(trend_window)
+        self.tau_threshold = float(tau_threshold)
+        self._species: Dict[str, _SpeciesWarning] = {}
+        self._alerts: List[Dict[str, Any]] = []
+        self._generation = 0
+        self._visual_cache: Dict[str, Tuple[Any, Any]] = {}
+        self._outputs: Dict[str, BioSignal] = EMPTY_OUTPUTS
+
+    def inputs(self) -> Set[str]:
+        return {"population_state"}
+
+    def outputs(self) -> Set[str]:
+        return {"indicators", "early_warning"}
+
+    def reset(self) -> None:
+        self._generation += 1
+        self._species = {}
+        self._alerts = []
+        self._outputs = EMPTY_OUTPUTS
+
+    def set_inputs(self, signals: Dict[str, BioSignal]) -> None:
+        signal = signals.get("population_state")
+        if signal is None:
+            return
+        payload = population_state(signal.value, signal.time)
+        if payload is None:
+            return
+        self._generation += 1
+        species, count, t = payload.species, payload.count, payload.t
+
+        tracker = self._species.get(species)
+        if tracker is None:
+            tracker = self._species[species] = _SpeciesWarning(self.window, self.trend_window)
+        tracker.push(count)
+
+        var_trend = tracker.trends["variance"]
+        ar1_trend = tracker.trends["ar1"]
+        rising = (
+            var_trend.full
+            and ar1_trend.full
+            and (var_trend.tau() or 0.0) >= self.tau_threshold
+            and (ar1_trend.tau() or 0.0) >= self.tau_threshold
+        )
+        if rising and not tracker.alerting:
+            self._alerts.append({
+                "species": species,
+                "t": t,
+                "tau_variance": var_trend.tau(),
+                "tau_ar1": ar1_trend.tau(),
+            })
+        tracker.alerting = rising
+
+    def advance_to(self, t: float) -> None:
+        self._generation += 1
+        alerts, self._alerts = self._alerts, []
+
+        source = getattr(self, "_world_name", self.__class__.__name__)
+        self._outputs = ReadOnlyOutputs({
+            "indicators": BioSignal(
+                source=source,
+                name="indicators",
+                value={
+                    "t": float(t),
+                    "species": {name: s.summary() for name, s in self._species.items()},
+                },
+                time=float(t),
+                metadata=_INDICATORS_META,
+            ),
+            "early_warning": BioSignal(
+                source=source,
+                name="early_warning",
+                value=alerts,
+                time=float(t),
+                metadata=_EARLY_WARNING_META,
+            ),
+        })
+
+    def get_outputs(self) -> Dict[str, BioSignal]:
+        return self._outputs
+
+    @memoized_visual
+    def visualize(self) -> Optional["VisualSpec"]:
+        """Generate a table of current indicators and trends."""
+        if not self._species:
+            return None
+
+        def fmt(v: Optional[float]) -> str:
+            return "-" if v is None else f"{v:.3f}"
+
+        rows = []
+        for name in sorted(self._species.keys()):
+            s = self._species[name].summary()
+            rows.append([
+                name,
+                fmt(s["variance"]),
+                fmt(s["ar1"]),
+                fmt(s["skewness"]),
+                fmt(s["tau_variance"]),
+                fmt(s["tau_ar1"]),
+                "yes" if self._species[name].alerting else "no",
+            ])
+
+        return {
+            "render": "table",
+            "data": {
+                "columns": ["Species", "Variance", "AR(1)", "Skewness", "Tau Var", "Tau AR(1)", "Warning"],
+                "rows": rows,
+            },
+        }
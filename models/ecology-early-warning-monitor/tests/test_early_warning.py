@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+
+def _state(species, count, t):
+    from biosim.signals import BioSignal, SignalMetadata
+
+    return {
+        "population_state": BioSignal(
+            source="pop",
+            name="population_state",
+            value={"species": species, "count": count, "t": t},
+            time=t,
+            metadata=SignalMetadata(description="test", kind="state"),
+        )
+    }
+
+
+def _slowing_series(n, seed=0):
+    """AR(1) series whose autocorrelation and noise amplitude rise over time."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    x = 0.0
+    out = []
+    for i in range(n):
+        phi = 0.1 + 0.85 * i / n
+        x = phi * x + (1.0 + 4.0 * i / n) * rng.normal()
+        out.append(int(round(1000 + 20 * x)))
+    return out
+
+
+def test_rolling_indicators_match_direct_computation(biosim):
+    import numpy as np
+    from src.early_warning import EarlyWarningMonitor
+
+    window = 30
+    mon = EarlyWarningMonitor(window=window, trend_window=10, min_dt=1.0)
+    series = _slowing_series(200, seed=3)
+    for i, count in enumerate(series):
+        mon.set_inputs(_state("Rabbits", count, float(i)))
+    mon.advance_to(200.0)
+
+    got = mon.get_outputs()["indicators"].value["species"]["Rabbits"]
+    x = np.asarray(series[-window:], dtype=np.float64)
+    mean = x.mean()
+    var = x.var()
+    ar1 = ((x[1:] - mean) * (x[:-1] - mean)).sum() / (window - 1) / var
+    skew = ((x - mean) ** 3).mean() / var ** 1.5
+    assert np.isclose(got["variance"], var)
+    assert np.isclose(got["ar1"], ar1)
+    assert np.isclose(got["skewness"], skew)
+
+
+def test_kendall_trend_matches_direct_computation(biosim):
+    import numpy as np
+    from src.early_warning import _KendallTrend
+
+    rng = np.random.default_rng(5)
+    values = rng.normal(size=60)
+    trend = _KendallTrend(15)
+    for v in values:
+        trend.push(float(v))
+
+    w = values[-15:]
+    i, j = np.triu_indices(15, k=1)
+    expected = np.sign(w[j] - w[i]).sum() / (15 * 14 / 2)
+    assert np.isclose(trend.tau(), expected)
+
+
+def test_alert_fires_once_on_rising_indicators(biosim):
+    from src.early_warning import EarlyWarningMonitor
+
+    mon = EarlyWarningMonitor(window=40, trend_window=100, tau_threshold=0.5, min_dt=1.0)
+    alerts = []
+    for i, count in enumerate(_slowing_series(600, seed=1)):
+        mon.set_inputs(_state("Rabbits", count, float(i)))
+        mon.advance_to(float(i + 1))
+        out = mon.get_outputs()
+        assert out["early_warning"].metadata.kind == "event"
+        alerts.extend(out["early_warning"].value)
+
+    assert alerts
+    assert all(a["species"] == "Rabbits" for a in alerts)
+    first = alerts[0]
+    assert first["tau_variance"] >= 0.5 and first["tau_ar1"] >= 0.5
+    # Alerts are edge-triggered, not repeated every tick.
+    assert len(alerts) < 20
+
+
+def test_stationary_series_raises_no_alert(biosim):
+    import numpy as np
+    from src.early_warning import EarlyWarningMonitor
+
+    rng = np.random.default_rng(2)
+    mon = EarlyWarningMonitor(window=40, trend_window=100, tau_threshold=0.7, min_dt=1.0)
+    for i in range(600):
+        mon.set_inputs(_state("Rabbits", int(1000 + rng.normal(0, 20)), float(i)))
+        mon.advance_to(float(i + 1))
+        assert mon.get_outputs()["early_warning"].value == []
+
+
+def test_reset_and_visualize(biosim):
+    from src.early_warning import EarlyWarningMonitor
+
+    mon = EarlyWarningMonitor(window=5, trend_window=5, min_dt=1.0)
+    assert mon.visualize() is None
+    for i in range(20):
+        mon.set_inputs(_state("Rabbits", 100 + (i % 3), float(i)))
+    spec = mon.visualize()
+    assert spec["render"] == "table"
+    assert spec["data"]["rows"][0][0] == "Rabbits"
+
+    mon.reset()
+    assert mon.visualize() is None
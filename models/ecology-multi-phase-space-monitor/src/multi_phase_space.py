@@ -0,0 +1,212 @@
+# SPDX-FileCopyrightText: 2025-present Demi <bjaiye1@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Multi-species phase space monitor: pairwise and PCA phase plots from one buffer."""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from biosim.visuals import VisualSpec
+
+from biosim import BioModule
+from biosim.signals import BioSignal, SignalMetadata
+
+from .ecology_support import EMPTY_OUTPUTS, ReadOnlyOutputs, memoized_visual, population_state
+from .phase_svg import phase_svg, svg_data_uri
+
+
+_MULTI_PHASE_POINT_META = SignalMetadata(description="Multi-species phase space current point", kind="state")
+
+
+SVG_W, SVG_H = 500, 400
+
+
+class MultiPhaseSpaceMonitor(BioModule):
+    """Phase-space plots for many species from one shared trajectory buffer.
+
+    Each species is interned to a column slot on first sight, and every
+    `advance_to` writes the current counts of all species as one row of a
+    preallocated ``max_points x max_species`` ring buffer. Running column
+    sums and cross-products over the retained rows are updated as rows enter
+    and leave the ring, so the window covariance (and hence a PCA
+    projection) is available at any time without a rescan.
+
+    ``projection="pairs"`` renders one phase plot per species pair (all
+    pairs, or those listed in ``pairs``); ``projection="pca"`` renders the
+    trajectory on its first two principal components.
+
+    Parameters:
+        species: Species to track (default: first ``max_species`` seen).
+        max_points: Maximum rows (time points) to store.
+        max_species: Column capacity of the buffer.
+        projection: ``"pairs"`` or ``"pca"``.
+        pairs: ``[x_species, y_species]`` pairs to plot in pairs mode.
+        svg_encoding: ``"base64"`` or ``"raw"`` image ``src`` encoding.
+    """
+
+    _visual_params: Tuple[str, ...] = ("svg_encoding",)
+
+    def __init__(
+        self,
+        species: Optional[List[str]] = None,
+        max_points: int = 5000,
+        max_species: int = 16,
+        projection: str = "pairs",
+        pairs: Optional[List[List[str]]] = None,
+        svg_encoding: str = "base64",
+        min_dt: float = 1.0,
+    ) -> None:
+        if projection not in ("pairs", "pca"):
+            raise ValueError("projection must be 'pairs' or 'pca'")
+        if svg_encoding not in ("base64", "raw"):
+            raise ValueError("svg_encoding must be 'base64' or 'raw'")
+        self.min_dt = min_dt
+        self.species = list(species) if species is not None else None
+        self.max_points = max(1, int(max_points))
+        self.max_species = len(self.species) if self.species is not None else int(max_species)
+        self.projection = projection
+        self.pairs = [(str(x), str(y)) for x, y in pairs] if pairs is not None else None
+        self.svg_encoding = svg_encoding
+        self._init_storage()
+        self._generation = 0
+        self._visual_cache: Dict[str, Tuple[Any, Any]] = {}
+        self._outputs: Dict[str, BioSignal] = EMPTY_OUTPUTS
+
+    def _init_storage(self) -> None:
+        self._names: List[str] = list(self.species or [])
+        self._slots: Dict[str, int] = {name: i for i, name in enumerate(self._names)}
+        self._current = np.zeros(self.max_species, dtype=np.int64)
+        self._buf = np.zeros((self.max_points, self.max_species), dtype=np.int64)
+        self._n = 0
+        self._sum = np.zeros(self.max_species, dtype=np.float64)
+        self._cross = np.zeros((self.max_species, self.max_species), dtype=np.float64)
+
+    def _intern(self, name: str) -> int:
+        """Slot of ``name``, or -1 if it is not (and cannot be) tracked."""
+        slot = self._slots.get(name, -1)
+        if slot == -1 and self.species is None and len(self._names) < self.max_species:
+            slot = self._slots[name] = len(self._names)
+            self._names.append(name)
+        return slot
+
+    def inputs(self) -> Set[str]:
+        return {"population_state"}
+
+    def outputs(self) -> Set[str]:
+        return {"phase_point"}
+
+    def reset(self) -> None:
+        self._generation += 1
+        self._init_storage()
+        self._outputs = EMPTY_OUTPUTS
+
+    def set_inputs(self, signals: Dict[str, BioSignal]) -> None:
+        signal = signals.get("population_state")
+        if signal is None:
+            return
+        state = population_state(signal.value, signal.time, species="")
+        if state is None:
+            return
+        slot = self._intern(state.species)
+        if slot >= 0:
+            self._current[slot] = state.count
+
+    def advance_to(self, t: float) -> None:
+        self._generation += 1
+        slot = self._n % self.max_points
+        if self._n >= self.max_points:
+            old = self._buf[slot].astype(np.float64)
+            self._sum -= old
+            self._cross -= np.outer(old, old)
+        row = self._current.astype(np.float64)
+        self._buf[slot] = self._current
+        self._sum += row
+        self._cross += np.outer(row, row)
+        self._n += 1
+
+        source = getattr(self, "_world_name", self.__class__.__name__)
+        self._outputs = ReadOnlyOutputs({
+            "phase_point": BioSignal(
+                source=source,
+                name="phase_point",
+                value={
+                    "t": float(t),
+                    "counts": {name: int(self._current[i]) for i, name in enumerate(self._names)},
+                },
+                time=float(t),
+                metadata=_MULTI_PHASE_POINT_META,
+            )
+        })
+
+    def get_outputs(self) -> Dict[str, BioSignal]:
+        return self._outputs
+
+    def _rows(self) -> np.ndarray:
+        """Retained rows (time points x tracked species) in chronological order."""
+        k = len(self._names)
+        if self._n <= self.max_points:
+            return self._buf[: self._n, :k]
+        start = self._n % self.max_points
+        return np.concatenate((self._buf[start:, :k], self._buf[:start, :k]))
+
+    def covariance(self) -> Optional[np.ndarray]:
+        """Covariance of the retained rows, from the running sums."""
+        m = min(self._n, self.max_points)
+        k = len(self._names)
+        if m < 2 or k == 0:
+            return None
+        mean = self._sum[:k] / m
+        return (self._cross[:k, :k] - m * np.outer(mean, mean)) / (m - 1)
+
+    def _image(self, svg: str, alt: str) -> "VisualSpec":
+        return {
+            "render": "image",
+            "data": {
+                "src": svg_data_uri(svg, self.svg_encoding),
+                "alt": alt,
+                "width": 500,
+                "height": 400,
+            },
+        }
+
+    @memoized_visual
+    def visualize(self) -> Optional[List["VisualSpec"]]:
+        """Generate pairwise or PCA phase plots from the shared buffer."""
+        if min(self._n, self.max_points) < 2 or len(self._names) < 2:
+            return None
+        rows = self._rows()
+
+        if self.projection == "pca":
+            cov = self.covariance()
+            eigvals, eigvecs = np.linalg.eigh(cov)
+            order = np.argsort(eigvals)[::-1][:2]
+            total = float(eigvals.sum())
+            mean = self._sum[: len(self._names)] / min(self._n, self.max_points)
+            proj = (rows - mean) @ eigvecs[:, order]
+            labels = [
+                f"PC{i + 1} ({100.0 * eigvals[j] / total:.0f}%)" if total > 0 else f"PC{i + 1}"
+                for i, j in enumerate(order)
+            ]
+            xs, ys = proj[:, 0], proj[:, 1]
+            bounds = (xs.min(), xs.max(), ys.min(), ys.max())
+            svg = phase_svg(xs, ys, bounds, labels[0], labels[1], title="Phase Space (PCA)")
+            return [self._image(svg, "Phase space: PCA projection")]
+
+        if self.pairs is not None:
+            pairs = [(x, y) for x, y in self.pairs if x in self._slots and y in self._slots]
+        else:
+            pairs = [(x, y) for i, x in enumerate(self._names) for y in self._names[i + 1:]]
+        if not pairs:
+            return None
+
+        lo = rows.min(axis=0)
+        hi = rows.max(axis=0)
+        specs = []
+        for x_name, y_name in pairs:
+            i, j = self._slots[x_name], self._slots[y_name]
+            svg = phase_svg(rows[:, i], rows[:, j], (lo[i], hi[i], lo[j], hi[j]), x_name, y_name)
+            specs.append(self._image(svg, f"Phase space: {x_name} vs {y_name}"))
+        return specs
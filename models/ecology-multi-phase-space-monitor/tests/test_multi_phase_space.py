@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+
+def _multi_state(species, count, t):
+    from biosim.signals import BioSignal, SignalMetadata
+
+    return {
+        "population_state": BioSignal(
+            source=species,
+            name="population_state",
+            value={"species": species, "count": count, "t": t},
+            time=t,
+            metadata=SignalMetadata(description="test", kind="state"),
+        )
+    }
+
+
+def test_multi_phase_shared_buffer_and_covariance(biosim):
+    import numpy as np
+    from src.multi_phase_space import MultiPhaseSpaceMonitor
+
+    rng = np.random.default_rng(7)
+    names = ["A", "B", "C", "D"]
+    mon = MultiPhaseSpaceMonitor(max_points=30, max_species=3, min_dt=1.0)
+    history = []
+    for i in range(100):
+        row = rng.integers(0, 500, size=4)
+        for name, count in zip(names, row.tolist()):
+            mon.set_inputs(_multi_state(name, count, float(i)))
+        mon.advance_to(float(i + 1))
+        history.append(row[:3])
+
+    # Capacity is three species; "D" is ignored.
+    assert mon._names == ["A", "B", "C"]
+    assert set(mon.get_outputs()["phase_point"].value["counts"]) == {"A", "B", "C"}
+
+    window = np.array(history[-30:])
+    assert np.array_equal(mon._rows(), window)
+    assert np.allclose(mon.covariance(), np.cov(window, rowvar=False))
+
+    specs = mon.visualize()
+    assert len(specs) == 3
+    assert all(spec["render"] == "image" for spec in specs)
+    assert specs[0]["data"]["alt"] == "Phase space: A vs B"
+
+
+def test_multi_phase_selected_pairs_and_pca(biosim):
+    import math
+
+    import pytest
+    from src.multi_phase_space import MultiPhaseSpaceMonitor
+
+    with pytest.raises(ValueError):
+        MultiPhaseSpaceMonitor(projection="tsne")
+
+    pairs_mon = MultiPhaseSpaceMonitor(species=["A", "B", "C"], pairs=[["C", "A"], ["A", "Z"]], min_dt=1.0)
+    pca_mon = MultiPhaseSpaceMonitor(species=["A", "B", "C"], projection="pca", min_dt=1.0)
+    assert pairs_mon.visualize() is None
+    for i in range(200):
+        phase = 2 * math.pi * i / 50
+        counts = {"A": 500 + 200 * math.cos(phase), "B": 100 + 40 * math.sin(phase), "C": 300 + 100 * math.cos(phase)}
+        for mon in (pairs_mon, pca_mon):
+            for name, count in counts.items():
+                mon.set_inputs(_multi_state(name, int(round(count)), float(i)))
+            mon.advance_to(float(i + 1))
+
+    specs = pairs_mon.visualize()
+    assert [spec["data"]["alt"] for spec in specs] == ["Phase space: C vs A"]
+
+    specs = pca_mon.visualize()
+    assert len(specs) == 1
+    assert specs[0]["data"]["alt"] == "Phase space: PCA projection"
+
+    pca_mon.reset()
+    assert pca_mon.visualize() is None
+    assert pca_mon._names == ["A", "B", "C"]
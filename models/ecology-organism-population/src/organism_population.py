@@ -6,7 +6,9 @@ from __future__ import annotations
 
 import random
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING
+from typing import Any, Dict, Optional, Set, Tuple, TYPE_CHECKING
+
+import numpy as np
 
 if TYPE_CHECKING:  # pragma: no cover - typing only
     from biosim import BioWorld
@@ -15,11 +17,42 @@ if TYPE_CHECKING:  # pragma: no cover - typing only
 from biosim import BioModule
 from biosim.signals import BioSignal, SignalMetadata
 
+from .ecology_support import (
+    CountingRandom,
+    EMPTY_OUTPUTS,
+    History,
+    PerfCounters,
+    PopulationState,
+    ReadOnlyOutputs,
+    downsample_points,
+    memoized_visual,
+    timed,
+    with_perf,
+)
+
+
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# Signal metadata is immutable, so every tick reuses the same instances.
+_POPULATION_STATE_META = SignalMetadata(units=None, description="Population state", kind="state")
+
+
+_HISTORY_COLUMNS = {
+    "t": np.float64,
+    "count": np.int64,
+    "births": np.int64,
+    "deaths": np.int64,
+    "predation_deaths": np.int64,
+    "temp_stress": np.float64,
+    "water_stress": np.float64,
+    "effective_birth": np.float64,
+    "effective_death": np.float64,
+}
+
+
 @dataclass
 class SpeciesPreset:
     """Preset parameters for common species archetypes."""
@@ -90,7 +123,9 @@ class OrganismPopulation(BioModule):
     """A population of organisms with environmental response and population dynamics.
 
     Receives environmental `conditions` signals and responds to predation/competition.
-    Publishes `population_state` signals with current population count and food demand.
+    Publishes `population_state` signals with current population count and food demand;
+    the payload is a read-only ``PopulationState`` dict that also carries an
+    integer ``species_id`` derived from the name.
 
     Population dynamics include:
     - Birth rate modulated by food availability and environmental conditions
@@ -109,8 +144,17 @@ class OrganismPopulation(BioModule):
         carrying_capacity: Maximum population size (0 = unlimited).
         preset: Optional preset name to use ("rabbit", "fox", "deer", "wolf", "bacteria").
         seed: Random seed for reproducibility.
+        history: Per-tick history retention: ``"full"``, ``"decimate:N"``,
+            ``"ring:N"`` or ``"none"``.
+        max_visual_points: Points per plotted series above which LTTB
+            downsampling applies (0 plots every point).
+        perf: Time ``set_inputs``/``advance_to``/``visualize``, count RNG draws
+            and report history size as a `perf` output and in
+            ``get_state()`` (off by default).
     """
 
+    _visual_params: Tuple[str, ...] = ("max_visual_points",)
+
     def __init__(
         self,
         name: str = "Species",
@@ -124,15 +168,20 @@ class OrganismPopulation(BioModule):
         carrying_capacity: int = 0,
         preset: Optional[str] = None,
         seed: Optional[int] = None,
+        history: str = "full",
+        max_visual_points: int = 2000,
+        perf: bool = False,
         min_dt: float = 1.0,
     ) -> None:
         self.min_dt = min_dt
+        self.perf = bool(perf)
+        self._perf: Optional[PerfCounters] = PerfCounters(count_rng=True) if perf else None
         self.name = name
         self.initial_count = initial_count
         self.count = initial_count
         self.carrying_capacity = carrying_capacity
         self.seed = seed
-        self._rng = random.Random(seed)
+        self._rng = self._new_rng()
 
         # Apply preset if specified
         if preset and preset in PRESETS:
@@ -152,29 +201,42 @@ class OrganismPopulation(BioModule):
             self.food_efficiency = food_efficiency
 
         self._time: float = 0.0
-        self._history: List[Dict[str, Any]] = []
+        self.history = history
+        self.max_visual_points = max_visual_points
+        self._history = History(_HISTORY_COLUMNS, history)
+        self._epoch = 0  # bumped by reset() to invalidate delta cursors
         self._current_conditions: Dict[str, float] = {}
         self._pending_deaths: int = 0  # Deaths from predation
         self._food_from_predation: float = 0.0  # Food gained if predator
-        self._outputs: Dict[str, BioSignal] = {}
+        self._generation = 0
+        self._visual_cache: Dict[str, Tuple[Any, Any]] = {}
+        self._outputs: Dict[str, BioSignal] = EMPTY_OUTPUTS
 
     def inputs(self) -> Set[str]:
         return {"conditions", "predation", "competition", "food_gained"}
 
     def outputs(self) -> Set[str]:
-        return {"population_state"}
+        return {"population_state", "perf"} if self.perf else {"population_state"}
 
     def reset(self) -> None:
         """Reset population to initial state."""
-        self._rng = random.Random(self.seed)
+        self._generation += 1
+        self._rng = self._new_rng()
         self.count = self.initial_count
         self._time = 0.0
-        self._history = []
+        self._history = History(_HISTORY_COLUMNS, self.history)
+        self._epoch += 1
         self._current_conditions = {}
         self._pending_deaths = 0
         self._food_from_predation = 0.0
-        self._outputs = {}
+        self._outputs = EMPTY_OUTPUTS
+
+    def _new_rng(self) -> random.Random:
+        if self._perf is None:
+            return random.Random(self.seed)
+        return CountingRandom(self.seed, self._perf)
 
+    @timed
     def set_inputs(self, signals: Dict[str, BioSignal]) -> None:
         signal = signals.get("conditions")
         if signal is not None and isinstance(signal.value, dict):
@@ -190,7 +252,9 @@ class OrganismPopulation(BioModule):
             except (KeyError, ValueError, TypeError):  # narrowed from bare Exception
                 pass
 
+    @timed
     def advance_to(self, t: float) -> None:
+        self._generation += 1
         dt = t - self._time if t > self._time else self.min_dt
         self._time = t
 
@@ -258,17 +322,17 @@ class OrganismPopulation(BioModule):
             self.count = min(self.count, self.carrying_capacity)
 
         # Record history
-        self._history.append({
-            "t": t,
-            "count": self.count,
-            "births": births,
-            "deaths": total_deaths,
-            "predation_deaths": predation_deaths,
-            "temp_stress": temp_stress,
-            "water_stress": water_stress,
-            "effective_birth": effective_birth,
-            "effective_death": effective_death,
-        })
+        self._history.append(
+            t=t,
+            count=self.count,
+            births=births,
+            deaths=total_deaths,
+            predation_deaths=predation_deaths,
+            temp_stress=temp_stress,
+            water_stress=water_stress,
+            effective_birth=effective_birth,
+            effective_death=effective_death,
+        )
 
         # Publish state
         self._publish_state(t)
@@ -305,43 +369,66 @@ class OrganismPopulation(BioModule):
 
     def _publish_state(self, t: float) -> None:
         """Publish current population state."""
-        payload = {
-            "species": self.name,
-            "count": self.count,
-            "t": t,
-        }
+        payload = PopulationState(self.name, self.count, t)
         source_name = getattr(self, "_world_name", self.__class__.__name__)
-        self._outputs = {
+        self._outputs = ReadOnlyOutputs({
             "population_state": BioSignal(
                 source=source_name,
                 name="population_state",
                 value=payload,
                 time=t,
-                metadata=SignalMetadata(units=None, description="Population state", kind="state"),
+                metadata=_POPULATION_STATE_META,
             )
-        }
+        })
+        if self._perf is not None:
+            self._outputs = with_perf(self._outputs, source_name, t, self._perf_snapshot())
 
     def get_outputs(self) -> Dict[str, BioSignal]:
-        return dict(self._outputs)
+        return self._outputs
+
+    def _perf_snapshot(self) -> Dict[str, Any]:
+        return self._perf.snapshot(len(self._history), self._history.nbytes)  # type: ignore[union-attr]
 
     def get_state(self) -> Dict[str, Any]:
-        return {
+        state: Dict[str, Any] = {
             "time": self._time,
             "count": self.count,
         }
+        if self._perf is not None:
+            state["perf"] = self._perf_snapshot()
+        return state
 
+    @timed
+    @memoized_visual
     def visualize(self) -> Optional["VisualSpec"]:
         """Generate population count timeseries visualization."""
-        if not self._history:
+        if not len(self._history):
+            return None
+        return self._timeseries(self._history.columns())
+
+    @memoized_visual
+    def visualize_delta(self, since: Optional[float] = None, epoch: Optional[int] = None) -> Optional["VisualSpec"]:
+        """Points recorded after ``since``; a full snapshot when the cursor is stale.
+
+        Pass back ``delta["cursor"]`` and ``delta["epoch"]`` from the previous
+        result. A missing cursor, an epoch from before the last `reset`, or a
+        cursor older than a ``ring:N`` history returns every retained point
+        with ``delta["full"]`` set.
+        """
+        if not len(self._history):
             return None
+        full = since is None or epoch != self._epoch or not self._history.covers(since)
+        delta = {"epoch": self._epoch, "cursor": self._history.last("t"), "full": full}
+        return {**self._timeseries(self._history.columns(None if full else since)), "delta": delta}
 
+    def _timeseries(self, cols: Dict[str, np.ndarray]) -> "VisualSpec":
         return {
             "render": "timeseries",
             "data": {
                 "series": [
                     {
                         "name": f"{self.name} Count",
-                        "points": [[h["t"], h["count"]] for h in self._history],
+                        "points": downsample_points(cols["t"], cols["count"], self.max_visual_points),
                     },
                 ],
                 "title": f"{self.name} Population",
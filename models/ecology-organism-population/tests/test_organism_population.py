@@ -24,3 +24,181 @@ def test_emits_population_state(biosim):
     assert payload["species"] == "Rabbits"
     assert isinstance(payload["count"], int)
 
+
+
+def test_history_retention_policies(biosim):
+    import pytest
+    from src.organism_population import OrganismPopulation
+
+    with pytest.raises(ValueError):
+        OrganismPopulation(history="ring:0")
+    with pytest.raises(ValueError):
+        OrganismPopulation(history="keep")
+
+    pops = {
+        policy: OrganismPopulation(name="Rabbits", initial_count=100, seed=1, history=policy, min_dt=1.0)
+        for policy in ("full", "decimate:10", "ring:25", "none")
+    }
+    for pop in pops.values():
+        for i in range(100):
+            pop.advance_to(float(i + 1))
+
+    full = pops["full"].visualize()["data"]["series"][0]["points"]
+    assert len(full) == 100
+    # Identical seeds give identical dynamics regardless of retention.
+    assert pops["decimate:10"].visualize()["data"]["series"][0]["points"] == full[::10]
+    assert pops["ring:25"].visualize()["data"]["series"][0]["points"] == full[-25:]
+    assert pops["none"].visualize() is None
+    assert pops["none"]._history.nbytes == 0
+    assert pops["none"].get_outputs()["population_state"].value["count"] == full[-1][1]
+
+    ring = pops["ring:25"]
+    assert ring.visualize_delta(since=10.0, epoch=0)["delta"]["full"] is True
+    delta = ring.visualize_delta(since=95.0, epoch=0)
+    assert delta["delta"]["full"] is False
+    assert delta["data"]["series"][0]["points"] == full[-5:]
+
+
+def test_lttb_matches_reference_implementation(biosim):
+    import numpy as np
+    from src.ecology_support import lttb
+
+    def reference(x, y, n_out):
+        n = len(x)
+        every = (n - 2) / (n_out - 2)
+        out = [0]
+        a = 0
+        for i in range(n_out - 2):
+            lo = int(np.floor(i * every)) + 1
+            hi = int(np.floor((i + 1) * every)) + 1
+            nlo, nhi = hi, min(int(np.floor((i + 2) * every)) + 1, n)
+            if i == n_out - 3:
+                cx, cy = x[-1], y[-1]
+            else:
+                cx, cy = np.mean(x[nlo:nhi]), np.mean(y[nlo:nhi])
+            best, best_area = lo, -1.0
+            for j in range(lo, hi):
+                area = abs((x[a] - cx) * (y[j] - y[a]) - (x[a] - x[j]) * (cy - y[a]))
+                if area > best_area:
+                    best, best_area = j, area
+            out.append(best)
+            a = best
+        out.append(n - 1)
+        return out
+
+    rng = np.random.default_rng(2)
+    x = np.arange(1000, dtype=np.float64)
+    y = np.cumsum(rng.normal(size=1000))
+    assert lttb(x, y, 100).tolist() == reference(x, y, 100)
+    assert lttb(x, y, 5000).tolist() == list(range(1000))
+
+
+def test_outputs_are_shared_read_only_and_reuse_metadata(biosim):
+    import copy
+
+    import pytest
+    from src.organism_population import OrganismPopulation
+
+    pop = OrganismPopulation(name="Rabbits", initial_count=50, seed=1, min_dt=1.0)
+    assert pop.get_outputs() == {}
+    pop.advance_to(1.0)
+    first = pop.get_outputs()
+    assert first is pop.get_outputs()
+    with pytest.raises(TypeError):
+        first["population_state"] = None
+    with pytest.raises(TypeError):
+        first.update({})
+    assert copy.deepcopy(first).keys() == first.keys()
+
+    pop.advance_to(2.0)
+    second = pop.get_outputs()
+    assert second is not first
+    assert second["population_state"].metadata is first["population_state"].metadata
+
+
+def test_population_state_payload_is_a_dict_with_a_stable_species_id(biosim):
+    import json
+    import zlib
+
+    from src.organism_population import OrganismPopulation
+
+    pop = OrganismPopulation(name="Rabbits", initial_count=50, seed=1, min_dt=1.0)
+    pop.advance_to(1.0)
+    state = pop.get_outputs()["population_state"].value
+    assert isinstance(state, dict)
+    assert "count" in state
+    assert json.loads(json.dumps(state)) == {
+        "species": "Rabbits",
+        "count": state["count"],
+        "t": 1.0,
+        "species_id": zlib.crc32(b"Rabbits"),
+    }
+
+    other = OrganismPopulation(name="Foxes", initial_count=5, seed=1, min_dt=1.0)
+    other.advance_to(1.0)
+    assert other.get_outputs()["population_state"].value["species_id"] != state["species_id"]
+
+    # Consumers take the producer's typed record as is instead of re-parsing it.
+    from src.ecology_support import population_state
+
+    assert population_state(state, 0.0) is state
+    assert (state.species, state.count, state.t) == ("Rabbits", state["count"], 1.0)
+
+
+def test_perf_counters_are_opt_in_and_leave_the_stream_unchanged(biosim):
+    from biosim.signals import BioSignal, SignalMetadata
+    from src.organism_population import OrganismPopulation
+
+    conditions = {
+        "conditions": BioSignal(
+            source="env",
+            name="conditions",
+            value={"temperature": 20.0, "water": 100.0, "food": 1.0, "sunlight": 1.0, "t": 0.0},
+            time=0.0,
+            metadata=SignalMetadata(description="test", kind="state"),
+        )
+    }
+    plain = OrganismPopulation(name="Rabbits", initial_count=100, seed=3, min_dt=1.0)
+    timed = OrganismPopulation(name="Rabbits", initial_count=100, seed=3, perf=True, min_dt=1.0)
+    assert "perf" not in plain.outputs() and "perf" not in plain.get_state()
+    assert "set_inputs" not in vars(plain)
+    assert timed.outputs() == {"population_state", "perf"}
+
+    for i in range(30):
+        for pop in (plain, timed):
+            pop.set_inputs(conditions)
+            pop.advance_to(float(i + 1))
+        assert timed.count == plain.count
+    timed.visualize()
+
+    perf = timed.get_outputs()["perf"].value
+    # Published from inside advance_to, so the current call is not yet counted.
+    assert perf["calls"]["advance_to"] == 29 and perf["calls"]["set_inputs"] == 30
+    assert perf["seconds"]["advance_to"] > 0.0
+    assert perf["rng_draws"] > 0
+    assert perf["history_len"] == 30 and perf["history_bytes"] > 0
+
+    state = timed.get_state()["perf"]
+    assert state["calls"]["advance_to"] == 30 and state["calls"]["visualize"] == 1
+
+
+def test_perf_module_deepcopies_with_its_own_counters(biosim):
+    import copy
+
+    from src.organism_population import OrganismPopulation
+
+    pop = OrganismPopulation(name="Rabbits", initial_count=100, seed=3, perf=True, min_dt=1.0)
+    for i in range(5):
+        pop.advance_to(float(i + 1))
+    clone = copy.deepcopy(pop)
+    assert clone._rng._perf is clone._perf
+
+    for i in range(5, 10):
+        clone.advance_to(float(i + 1))
+    assert pop.get_state()["perf"]["calls"]["advance_to"] == 5
+    assert clone.get_state()["perf"]["calls"]["advance_to"] == 10
+    assert clone.get_state()["perf"]["rng_draws"] > pop.get_state()["perf"]["rng_draws"]
+
+    for i in range(5, 10):
+        pop.advance_to(float(i + 1))
+    assert pop.count == clone.count
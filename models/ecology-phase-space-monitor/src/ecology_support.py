@@ -0,0 +1,336 @@
+# SPDX-FileCopyrightText: 2025-present Demi <bjaiye1@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Helpers shared by the ecology model packages.
+
+This file in ``libs/`` is the original. Model packages are loaded on their
+own, so every package that uses it carries an identical copy at
+``src/ecology_support.py``. Edit this file, then run
+``python scripts/sync_libs.py`` to refresh the copies.
+"""
+from __future__ import annotations
+
+import functools
+import random
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from biosim.signals import BioSignal, SignalMetadata
+
+
+class _ReadOnlyDict(Dict[str, Any]):
+    """``dict`` whose mutators raise ``TypeError``, so it can be shared."""
+
+    __slots__ = ()
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only  # type: ignore[assignment]
+    clear = pop = popitem = setdefault = update = _read_only  # type: ignore[assignment]
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (self.__class__, (dict(self),))
+
+
+class ReadOnlyOutputs(_ReadOnlyDict):
+    """Output mapping handed out by ``get_outputs()`` without copying.
+
+    Still a ``dict`` for callers that type-check, but mutation raises
+    ``TypeError`` so one tick's signals can be shared with every consumer.
+    """
+
+    __slots__ = ()
+
+
+EMPTY_OUTPUTS = ReadOnlyOutputs()
+
+
+def species_id_for(name: str) -> int:
+    """Integer id of a species name carried in `population_state` payloads.
+
+    A CRC-32 of the name, so every package and process derives the same id
+    without a shared table. Distinct names can share an id; key per-species
+    state by name.
+    """
+    return zlib.crc32(name.encode("utf-8"))
+
+
+class PopulationState(_ReadOnlyDict):
+    """`population_state` payload with its fields also held as attributes.
+
+    Producers build one per tick. It is the ``{"species", "count", "t",
+    "species_id"}`` dict every consumer already accepts, and consumers that
+    go through :func:`population_state` read the typed attributes instead of
+    parsing the dict again.
+    """
+
+    __slots__ = ("species", "count", "t", "species_id")
+
+    def __init__(self, species: str, count: int, t: float, species_id: Optional[int] = None) -> None:
+        species, count, t = str(species), int(count), float(t)
+        species_id = species_id_for(species) if species_id is None else int(species_id)
+        dict.__init__(self, species=species, count=count, t=t, species_id=species_id)
+        object.__setattr__(self, "species", species)
+        object.__setattr__(self, "count", count)
+        object.__setattr__(self, "t", t)
+        object.__setattr__(self, "species_id", species_id)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._read_only()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (self.__class__, (self.species, self.count, self.t, self.species_id))
+
+
+def population_state(value: Any, time: float, species: str = "Unknown") -> Optional[PopulationState]:
+    """Typed view of a `population_state` payload; ``None`` if unrecognised.
+
+    A :class:`PopulationState` is returned as is. The check is on the
+    attributes rather than the class because each package imports its own
+    copy of this module. Plain dicts are parsed, with ``time`` and
+    ``species`` filling in a missing ``t`` or name.
+    """
+    if not isinstance(value, dict):
+        return None
+    if hasattr(value, "species_id"):
+        return value  # type: ignore[return-value]
+    return PopulationState(
+        str(value.get("species", species)),
+        int(value.get("count", 0)),
+        float(value.get("t", time)),
+        value.get("species_id"),
+    )
+
+
+def memoized_visual(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Cache a visual method's result until the module's ``_generation`` moves.
+
+    The key also holds the call arguments and the attributes named in the
+    class's ``_visual_params``, so a new zoom window or display setting
+    misses the cache. Every call gets new top-level spec dicts (one per spec
+    when the method returns a list); the nested ``data`` is shared with the
+    cache and must be treated as read-only.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        params = tuple(getattr(self, name) for name in getattr(self, "_visual_params", ()))
+        key = (self._generation, params, args, tuple(sorted(kwargs.items())))
+        cached = self._visual_cache.get(method.__name__)
+        if cached is None or cached[0] != key:
+            cached = self._visual_cache[method.__name__] = (key, method(self, *args, **kwargs))
+        spec = cached[1]
+        if spec is None:
+            return None
+        if isinstance(spec, list):
+            return [dict(s) for s in spec]
+        return dict(spec)
+
+    return wrapper
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of a Largest-Triangle-Three-Buckets downsample of ``(x, y)``.
+
+    Keeps the first and last points and, from each of ``n_out - 2`` equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the mean of the next bucket.
+    """
+    n = len(x)
+    if n <= n_out:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1][:max(n_out, 0)], dtype=np.int64)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i < n_out - 3:
+            cx = x[hi:edges[i + 2]].mean()
+            cy = y[hi:edges[i + 2]].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def downsample_points(x: np.ndarray, y: np.ndarray, max_points: int) -> List[List[Any]]:
+    """``[[x, y], ...]`` pairs, LTTB-downsampled to ``max_points`` (0 keeps all)."""
+    if max_points and len(x) > max_points:
+        keep = lttb(x, y, max_points)
+        x, y = x[keep], y[keep]
+    return [list(p) for p in zip(x.tolist(), y.tolist())]
+
+
+class History:
+    """Column-oriented per-tick history under a retention policy.
+
+    ``policy`` is ``"full"`` (keep every record), ``"decimate:N"`` (keep every
+    Nth record), ``"ring:N"`` (keep the last N records) or ``"none"`` (keep
+    nothing, constant memory). Columns are NumPy arrays that grow by
+    doubling, or a fixed circular buffer for ``ring:N``.
+    """
+
+    _INITIAL = 64
+
+    def __init__(self, columns: Dict[str, Any], policy: str = "full") -> None:
+        kind, _, arg = str(policy).partition(":")
+        if kind in ("full", "none") and not arg:
+            n = 0
+        elif kind in ("decimate", "ring") and arg.isdigit() and int(arg) > 0:
+            n = int(arg)
+        else:
+            raise ValueError(f"history must be 'full', 'decimate:N', 'ring:N' or 'none', got {policy!r}")
+        self._keep = kind != "none"
+        self._every = n if kind == "decimate" else 1
+        self._capacity: Optional[int] = n if kind == "ring" else None
+        size = 0 if not self._keep else (n if kind == "ring" else self._INITIAL)
+        self._cols = {name: np.empty(size, dtype=dtype) for name, dtype in columns.items()}
+        self._seen = 0  # records offered
+        self._n = 0  # records stored, including ones since overwritten in a ring
+
+    def __len__(self) -> int:
+        return self._n if self._capacity is None else min(self._n, self._capacity)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(col.nbytes for col in self._cols.values())
+
+    def append(self, **values: Any) -> None:
+        seen = self._seen
+        self._seen += 1
+        if not self._keep or seen % self._every:
+            return
+        if self._capacity is None:
+            size = len(self._cols["t"])
+            if self._n == size:
+                self._cols = {name: np.resize(col, 2 * size) for name, col in self._cols.items()}
+            slot = self._n
+        else:
+            slot = self._n % self._capacity
+        for name, col in self._cols.items():
+            col[slot] = values[name]
+        self._n += 1
+
+    def _start(self) -> int:
+        """Slot of the oldest retained record."""
+        if self._capacity is None or self._n <= self._capacity:
+            return 0
+        return self._n % self._capacity
+
+    def last(self, name: str) -> Any:
+        slot = self._n - 1 if self._capacity is None else (self._n - 1) % self._capacity
+        return self._cols[name][slot].item()
+
+    def covers(self, t: float) -> bool:
+        """Whether no retained-policy record after time ``t`` has been overwritten."""
+        if self._capacity is None or self._n <= self._capacity:
+            return True
+        return bool(self._cols["t"][self._start()] <= t)
+
+    def columns(self, since: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """Retained columns in time order, optionally only records after ``since``."""
+        n = len(self)
+        start = self._start()
+        t = self._cols["t"]
+        if start == 0:
+            i = 0 if since is None else int(np.searchsorted(t[:n], since, side="right"))
+            return {name: col[i:n] for name, col in self._cols.items()}
+        # Wrapped ring: older records live in [start:], newer ones in [:start].
+        if since is not None and t[0] <= since:
+            i = int(np.searchsorted(t[:start], since, side="right"))
+            return {name: col[i:start] for name, col in self._cols.items()}
+        i = start if since is None else start + int(np.searchsorted(t[start:], since, side="right"))
+        return {name: np.concatenate((col[i:], col[:start])) for name, col in self._cols.items()}
+
+
+class PerfCounters:
+    """Call counts and wall time of a module's hot paths, kept when ``perf=True``.
+
+    Methods decorated with :func:`timed` add to these counters through the
+    module's ``_perf`` attribute. The counters are plain data on the module, so
+    a deep copy of the module gets its own. ``rng_draws`` is ``None`` unless
+    the module draws random numbers (``count_rng=True``), and then it is left
+    out of the snapshot. The `perf` signal is built inside ``advance_to`` and
+    so covers the calls completed before it.
+    """
+
+    TIMED = ("set_inputs", "advance_to", "visualize")
+
+    def __init__(self, count_rng: bool = False) -> None:
+        self.calls: Dict[str, int] = dict.fromkeys(self.TIMED, 0)
+        self.seconds: Dict[str, float] = dict.fromkeys(self.TIMED, 0.0)
+        self.rng_draws: Optional[int] = 0 if count_rng else None
+
+    def snapshot(self, history_len: int, history_bytes: int) -> Dict[str, Any]:
+        snap: Dict[str, Any] = {"calls": dict(self.calls), "seconds": dict(self.seconds)}
+        if self.rng_draws is not None:
+            snap["rng_draws"] = self.rng_draws
+        snap["history_len"] = int(history_len)
+        snap["history_bytes"] = int(history_bytes)
+        return snap
+
+
+def timed(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Record calls and wall time of ``method`` in ``self._perf`` when it is set.
+
+    Modules built without ``perf`` pay one attribute check per call.
+    """
+    name = method.__name__
+    clock = time.perf_counter
+
+    @functools.wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        perf = self._perf
+        if perf is None:
+            return method(self, *args, **kwargs)
+        start = clock()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            perf.seconds[name] += clock() - start
+            perf.calls[name] += 1
+
+    return wrapper
+
+
+class CountingRandom(random.Random):
+    """``random.Random`` that tallies every draw into a :class:`PerfCounters`.
+
+    Overrides both ``random`` and ``getrandbits`` so the generated stream is
+    identical to a plain ``random.Random`` with the same seed.
+    """
+
+    def __init__(self, seed: Optional[int] = None, perf: Optional[PerfCounters] = None) -> None:
+        self._perf = perf if perf is not None else PerfCounters(count_rng=True)
+        super().__init__(seed)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # random.Random pickles as cls() + setstate, which would drop the counters.
+        return (self.__class__, (None, self._perf), self.getstate())
+
+    def random(self) -> float:
+        self._perf.rng_draws += 1
+        return super().random()
+
+    def getrandbits(self, k: int) -> int:
+        self._perf.rng_draws += 1
+        return super().getrandbits(k)
+
+
+PERF_META = SignalMetadata(description="Module hot-path counters", kind="state")
+
+
+def with_perf(outputs: Dict[str, BioSignal], source: str, t: float, snapshot: Dict[str, Any]) -> ReadOnlyOutputs:
+    """``outputs`` plus a `perf` state signal carrying ``snapshot``."""
+    perf = BioSignal(source=source, name="perf", value=snapshot, time=float(t), metadata=PERF_META)
+    return ReadOnlyOutputs({**outputs, "perf": perf})
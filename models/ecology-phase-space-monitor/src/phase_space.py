@@ -5,7 +5,12 @@
 from __future__ import annotations
 
 import base64
-from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING
+import struct
+import zlib
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+import numpy as np
 
 if TYPE_CHECKING:  # pragma: no cover - typing only
     from biosim import BioWorld
@@ -14,75 +19,457 @@ if TYPE_CHECKING:  # pragma: no cover - typing only
 from biosim import BioModule
 from biosim.signals import BioSignal, SignalMetadata
 
+from .ecology_support import (
+    EMPTY_OUTPUTS,
+    PerfCounters,
+    ReadOnlyOutputs,
+    memoized_visual,
+    population_state,
+    timed,
+    with_perf,
+)
+
+from .phase_svg import MARGIN, PLOT_H, PLOT_W, phase_svg, svg_data_uri, svg_frame
+
+
+_PHASE_POINT_META = SignalMetadata(description="Phase space current point", kind="state")
+_REGIME_META = SignalMetadata(description="Detected dynamical regime", kind="state")
+
+
+def _png_bytes(rgb: np.ndarray) -> bytes:
+    """Encode an (H, W, 3) uint8 array as a PNG."""
+    height, width, _ = rgb.shape
+    raw = b"".join(b"\x00" + row.tobytes() for row in rgb)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        body = tag + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(raw, 9))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _density_svg(grid: "_DensityGrid", x_label: str, y_label: str, title: str = "Phase Space Density") -> str:
+    """Render a visit histogram as a log-scaled heatmap inside the phase-plot frame."""
+    counts = grid.counts
+    peak = int(counts.max())
+    level = np.log1p(counts) / np.log1p(peak) if peak > 0 else np.zeros(counts.shape)
+    # Rows run top (high y) to bottom; white for empty cells through to dark blue.
+    level = level.T[::-1]
+    low = np.array([255.0, 255.0, 255.0])
+    high = np.array([30.0, 58.0, 138.0])
+    rgb = (low + (high - low) * level[:, :, None]).round().astype(np.uint8)
+    png = base64.b64encode(_png_bytes(rgb)).decode("ascii")
+
+    x_lo, x_hi, y_lo, y_hi = grid.extent()
+    x0, y0 = MARGIN["left"], MARGIN["top"]
+    y1 = y0 + PLOT_H
+    lines = svg_frame(x_label, y_label, title)
+    lines.append(
+        f'  <image x="{x0}" y="{y0}" width="{PLOT_W}" height="{PLOT_H}" preserveAspectRatio="none" '
+        f'style="image-rendering: pixelated" href="data:image/png;base64,{png}"/>'
+    )
+    lines.append(f'  <text class="label" x="{x0}" y="{y1 + 15}" text-anchor="start">{x_lo:g}</text>')
+    lines.append(f'  <text class="label" x="{x0 + PLOT_W}" y="{y1 + 15}" text-anchor="end">{x_hi:g}</text>')
+    lines.append(f'  <text class="label" x="{x0 - 5}" y="{y1}" text-anchor="end">{y_lo:g}</text>')
+    lines.append(f'  <text class="label" x="{x0 - 5}" y="{y0 + 10}" text-anchor="end">{y_hi:g}</text>')
+    lines.append('</svg>')
+    return "\n".join(lines)
+
+
+class _PhaseRing:
+    """Fixed-capacity (x, y) trajectory with O(1) append and O(1) bounds.
+
+    Points live in preallocated circular arrays; per-axis minima and maxima
+    are tracked with monotonic deques of ``(index, value)`` so the bounds of
+    the retained window never require a rescan.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, int(capacity))
+        self._x = np.zeros(self.capacity, dtype=np.int64)
+        self._y = np.zeros(self.capacity, dtype=np.int64)
+        self._n = 0
+        self._x_min: Deque[Tuple[int, int]] = deque()
+        self._x_max: Deque[Tuple[int, int]] = deque()
+        self._y_min: Deque[Tuple[int, int]] = deque()
+        self._y_max: Deque[Tuple[int, int]] = deque()
+
+    def __len__(self) -> int:
+        return min(self._n, self.capacity)
+
+    @property
+    def nbytes(self) -> int:
+        return self._x.nbytes + self._y.nbytes
+
+    @staticmethod
+    def _track(dq: Deque[Tuple[int, int]], i: int, v: int, oldest: int, keep_min: bool) -> None:
+        if keep_min:
+            while dq and dq[-1][1] >= v:
+                dq.pop()
+        else:
+            while dq and dq[-1][1] <= v:
+                dq.pop()
+        dq.append((i, v))
+        while dq[0][0] < oldest:
+            dq.popleft()
+
+    def append(self, x: int, y: int) -> None:
+        i = self._n
+        slot = i % self.capacity
+        self._x[slot] = x
+        self._y[slot] = y
+        self._n += 1
+        oldest = self._n - len(self)
+        self._track(self._x_min, i, x, oldest, True)
+        self._track(self._x_max, i, x, oldest, False)
+        self._track(self._y_min, i, y, oldest, True)
+        self._track(self._y_max, i, y, oldest, False)
+
+    def bounds(self) -> Tuple[int, int, int, int]:
+        """``(x_min, x_max, y_min, y_max)`` of the retained points."""
+        return self._x_min[0][1], self._x_max[0][1], self._y_min[0][1], self._y_max[0][1]
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Retained x and y values in chronological order."""
+        if self._n <= self.capacity:
+            return self._x[: self._n], self._y[: self._n]
+        start = self._n % self.capacity
+        return (
+            np.concatenate((self._x[start:], self._x[:start])),
+            np.concatenate((self._y[start:], self._y[:start])),
+        )
+
+    def first(self) -> Tuple[int, int]:
+        slot = (self._n - len(self)) % self.capacity
+        return int(self._x[slot]), int(self._y[slot])
+
+    def last(self) -> Tuple[int, int]:
+        slot = (self._n - 1) % self.capacity
+        return int(self._x[slot]), int(self._y[slot])
+
+
+class _DensityGrid:
+    """Fixed ``bins x bins`` visit histogram whose range grows by doubling.
+
+    Each axis starts with unit-width bins anchored at the first value. When a
+    value falls outside the current range, that axis doubles its bin width
+    and adjacent bins are merged pairwise, so the old range lands in one half
+    of the grid and the new extreme in the other. Memory is fixed and each
+    rescale costs O(bins^2), which happens O(log range) times per run.
+    """
+
+    def __init__(self, bins: int) -> None:
+        self.bins = int(bins)
+        self.counts = np.zeros((self.bins, self.bins), dtype=np.int64)
+        self.total = 0
+        self._lo = [0.0, 0.0]
+        self._width = [1.0, 1.0]
+
+    def _grow(self, axis: int, value: float) -> None:
+        span = self._width[axis] * self.bins
+        half = self.bins // 2
+        merged = np.add.reduceat(self.counts, np.arange(0, self.bins, 2), axis=axis)
+        grown = np.zeros_like(self.counts)
+        if value < self._lo[axis]:
+            self._lo[axis] -= span
+            index = slice(half, None)
+        else:
+            index = slice(0, half)
+        if axis == 0:
+            grown[index, :] = merged
+        else:
+            grown[:, index] = merged
+        self.counts = grown
+        self._width[axis] *= 2.0
+
+    def add(self, x: float, y: float) -> None:
+        if self.total == 0:
+            self._lo = [float(x) - self.bins // 2, float(y) - self.bins // 2]
+        idx = []
+        for axis, v in enumerate((x, y)):
+            while not self._lo[axis] <= v < self._lo[axis] + self._width[axis] * self.bins:
+                self._grow(axis, v)
+            idx.append(int((v - self._lo[axis]) // self._width[axis]))
+        self.counts[idx[0], idx[1]] += 1
+        self.total += 1
+
+    def extent(self) -> Tuple[float, float, float, float]:
+        """``(x_lo, x_hi, y_lo, y_hi)`` covered by the grid."""
+        return (
+            self._lo[0],
+            self._lo[0] + self._width[0] * self.bins,
+            self._lo[1],
+            self._lo[1] + self._width[1] * self.bins,
+        )
+
+
+class _RegimeDetector:
+    """Streaming classifier for the long-run regime of an (x, y) trajectory.
+
+    Upward crossings of x through its running mean form a Poincare section.
+    Only the last ``max_crossings`` crossing times and per-cycle amplitudes
+    are kept; their coefficients of variation score how periodic the orbit
+    is. Exponentially weighted means and variances (span ``window``) score
+    convergence to a fixed point. Extinction is reported once a species that
+    has been seen with a positive count stays at zero for ``extinction_hold``
+    consecutive ticks, so the zero counts before any input arrives (or for a
+    species name that never matches) are not mistaken for it.
+
+    Each score lies in [0, 1]; a regime is reported once its score exceeds
+    0.5, otherwise the run is ``"transient"`` with confidence one minus the
+    best score.
+    """
+
+    def __init__(
+        self,
+        max_crossings: int,
+        window: int,
+        cycle_tolerance: float,
+        fixed_tolerance: float,
+        extinction_hold: int = 10,
+    ) -> None:
+        self.max_crossings = max(3, int(max_crossings))
+        self.extinction_hold = max(1, int(extinction_hold))
+        self.window = max(2, int(window))
+        self.cycle_tolerance = cycle_tolerance
+        self.fixed_tolerance = fixed_tolerance
+        self._alpha = 2.0 / (self.window + 1)
+        self._crossings: Deque[float] = deque(maxlen=self.max_crossings)
+        self._amplitudes: Deque[float] = deque(maxlen=self.max_crossings - 1)
+        self._n = 0
+        self._sum_x = 0.0
+        self._ema = [0.0, 0.0]
+        self._ema_var = [0.0, 0.0]
+        self._prev: Optional[Tuple[float, float]] = None
+        self._armed = False
+        self._cycle_lo = float("inf")
+        self._cycle_hi = float("-inf")
+        self._alive = [False, False]  # seen with a positive count
+        self._zero_run = [0, 0]  # consecutive zero ticks since last seen alive
+
+    def push(self, t: float, x: float, y: float) -> None:
+        self._n += 1
+        self._sum_x += x
+        for i, v in enumerate((x, y)):
+            if self._n == 1:
+                self._ema[i] = v
+            else:
+                delta = v - self._ema[i]
+                self._ema[i] += self._alpha * delta
+                self._ema_var[i] = (1 - self._alpha) * (self._ema_var[i] + self._alpha * delta * delta)
+            if v > 0:
+                self._alive[i] = True
+                self._zero_run[i] = 0
+            elif self._alive[i]:
+                self._zero_run[i] += 1
+
+        section = self._sum_x / self._n
+        band = 0.1 * self._ema_var[0] ** 0.5
+        self._cycle_lo = min(self._cycle_lo, x)
+        self._cycle_hi = max(self._cycle_hi, x)
+        if x < section - band:
+            self._armed = True
+        elif self._armed and x >= section and self._prev is not None:
+            t0, x0 = self._prev
+            frac = (section - x0) / (x - x0) if x != x0 else 1.0
+            if self._crossings:
+                self._amplitudes.append(0.5 * (self._cycle_hi - self._cycle_lo))
+            self._crossings.append(t0 + frac * (t - t0))
+            self._cycle_lo = self._cycle_hi = x
+            self._armed = False
+        self._prev = (t, x)
+
+    @staticmethod
+    def _cv(values: List[float]) -> float:
+        mean = sum(values) / len(values)
+        if mean <= 0:
+            return float("inf")
+        return (sum((v - mean) ** 2 for v in values) / len(values)) ** 0.5 / mean
+
+    def _periods(self) -> List[float]:
+        c = list(self._crossings)
+        return [b - a for a, b in zip(c, c[1:])]
+
+    def _cycle_score(self) -> float:
+        if len(self._amplitudes) < 2:
+            return 0.0
+        periods = self._periods()
+        cv = max(self._cv(periods), self._cv(list(self._amplitudes)))
+        coverage = len(periods) / (self.max_crossings - 1)
+        return max(0.0, 1.0 - cv / (2 * self.cycle_tolerance)) * coverage
+
+    def _fixed_score(self) -> float:
+        warm = min(1.0, self._n / (2 * self.window))
+        rel = max(
+            self._ema_var[i] ** 0.5 / max(abs(self._ema[i]), 1.0) for i in range(2)
+        )
+        return max(0.0, 1.0 - rel / (2 * self.fixed_tolerance)) * warm
+
+    def summary(self) -> Dict[str, Any]:
+        periods = self._periods()
+        period = sum(periods) / len(periods) if periods else None
+        amplitude = sum(self._amplitudes) / len(self._amplitudes) if self._amplitudes else None
+
+        zero_run = max(self._zero_run)
+        if zero_run >= self.extinction_hold:
+            regime = "extinction"
+            confidence = min(1.0, 0.5 + 0.25 * zero_run / self.extinction_hold)
+        else:
+            scores = {"limit_cycle": self._cycle_score(), "fixed_point": self._fixed_score()}
+            regime = max(scores, key=scores.get)
+            confidence = scores[regime]
+            if confidence <= 0.5:
+                regime, confidence = "transient", 1.0 - confidence
+        return {
+            "regime": regime,
+            "confidence": float(confidence),
+            "period": period,
+            "amplitude": amplitude,
+            "n_crossings": len(self._crossings),
+        }
+
 
 class PhaseSpaceMonitor(BioModule):
     """Creates a phase space plot of two populations.
 
-    Useful for visualizing predator-prey dynamics in 2D space.
+    Useful for visualizing predator-prey dynamics in 2D space. In
+    ``"trajectory"`` mode the last ``max_points`` points are drawn as a path;
+    in ``"density"`` mode every visit is accumulated into a fixed
+    ``density_bins x density_bins`` histogram rendered as a heatmap, so
+    memory and render cost stay constant however long the run.
+
+    A streaming Poincare-section detector also classifies the run as a
+    limit cycle, fixed point, extinction or still transient, with period and
+    amplitude estimates, and publishes it on the `regime` output.
 
     Parameters:
         x_species: Name of species for X axis.
         y_species: Name of species for Y axis.
-        max_points: Maximum points to store.
+        max_points: Maximum points to store (trajectory mode).
+        mode: ``"trajectory"`` or ``"density"``.
+        density_bins: Histogram bins per axis (density mode, even).
+        svg_encoding: How the SVG is embedded in the image ``src``: ``"base64"``
+            or ``"raw"`` (percent-encoded UTF-8, roughly 25% smaller).
+        regime_crossings: Poincare-section crossings kept for regime detection.
+        regime_window: Span (ticks) of the moving statistics for fixed points.
+        cycle_tolerance: Period/amplitude coefficient of variation for a limit cycle.
+        fixed_point_tolerance: Relative standard deviation for a fixed point.
+        extinction_hold: Consecutive zero-count ticks, after a species was seen
+            alive, before extinction is reported.
+        perf: Time ``set_inputs``/``advance_to``/``visualize`` and report
+            history size as a `perf` output and in ``get_state()`` (off by
+            default).
     """
 
+    _visual_params: Tuple[str, ...] = ("svg_encoding",)
+
     def __init__(
         self,
         x_species: str = "Prey",
         y_species: str = "Predator",
         max_points: int = 5000,
+        mode: str = "trajectory",
+        density_bins: int = 64,
+        svg_encoding: str = "base64",
+        regime_crossings: int = 8,
+        regime_window: int = 50,
+        cycle_tolerance: float = 0.1,
+        fixed_point_tolerance: float = 0.02,
+        extinction_hold: int = 10,
+        perf: bool = False,
         min_dt: float = 1.0,
     ) -> None:
+        if mode not in ("trajectory", "density"):
+            raise ValueError("mode must be 'trajectory' or 'density'")
+        if density_bins < 2 or density_bins % 2:
+            raise ValueError("density_bins must be an even number >= 2")
+        if svg_encoding not in ("base64", "raw"):
+            raise ValueError("svg_encoding must be 'base64' or 'raw'")
         self.min_dt = min_dt
+        self.perf = bool(perf)
+        self._perf: Optional[PerfCounters] = PerfCounters() if perf else None
+        self.svg_encoding = svg_encoding
         self.x_species = x_species
         self.y_species = y_species
         self.max_points = max_points
-
-        self._x_values: List[int] = []
-        self._y_values: List[int] = []
+        self.mode = mode
+        self.density_bins = int(density_bins)
+        self.regime_crossings = int(regime_crossings)
+        self.regime_window = int(regime_window)
+        self.cycle_tolerance = float(cycle_tolerance)
+        self.fixed_point_tolerance = float(fixed_point_tolerance)
+        self.extinction_hold = int(extinction_hold)
+
+        self._init_storage()
         self._current_x: int = 0
         self._current_y: int = 0
         self._time: float = 0.0
-        self._outputs: Dict[str, BioSignal] = {}
+        self._generation = 0
+        self._visual_cache: Dict[str, Tuple[Any, Any]] = {}
+        self._outputs: Dict[str, BioSignal] = EMPTY_OUTPUTS
+
+    def _init_storage(self) -> None:
+        if self.mode == "density":
+            self._trajectory: Optional[_PhaseRing] = None
+            self._density: Optional[_DensityGrid] = _DensityGrid(self.density_bins)
+        else:
+            self._trajectory = _PhaseRing(self.max_points)
+            self._density = None
+        self._regime = _RegimeDetector(
+            self.regime_crossings,
+            self.regime_window,
+            self.cycle_tolerance,
+            self.fixed_point_tolerance,
+            self.extinction_hold,
+        )
 
     def inputs(self) -> Set[str]:
         return {"population_state"}
 
     def outputs(self) -> Set[str]:
-        return {"phase_point"}
+        return {"phase_point", "regime", "perf"} if self.perf else {"phase_point", "regime"}
 
     def reset(self) -> None:
-        self._x_values = []
-        self._y_values = []
+        self._generation += 1
+        self._init_storage()
         self._current_x = 0
         self._current_y = 0
         self._time = 0.0
-        self._outputs = {}
+        self._outputs = EMPTY_OUTPUTS
 
+    @timed
     def set_inputs(self, signals: Dict[str, BioSignal]) -> None:
         signal = signals.get("population_state")
-        if signal is None or not isinstance(signal.value, dict):
+        if signal is None:
+            return
+        state = population_state(signal.value, signal.time, species="")
+        if state is None:
             return
-        species = str(signal.value.get("species", ""))
-        count = int(signal.value.get("count", 0))
 
-        if species == self.x_species:
-            self._current_x = count
-        elif species == self.y_species:
-            self._current_y = count
+        if state.species == self.x_species:
+            self._current_x = state.count
+        elif state.species == self.y_species:
+            self._current_y = state.count
 
+    @timed
     def advance_to(self, t: float) -> None:
-        # Record current point
-        self._x_values.append(self._current_x)
-        self._y_values.append(self._current_y)
-
-        # Trim if over limit
-        if len(self._x_values) > self.max_points:
-            self._x_values = self._x_values[-self.max_points:]
-            self._y_values = self._y_values[-self.max_points:]
+        self._generation += 1
+        self._time = float(t)
+        # Record current point; the ring drops the oldest once full
+        if self._density is not None:
+            self._density.add(self._current_x, self._current_y)
+        else:
+            self._trajectory.append(self._current_x, self._current_y)
+        self._regime.push(float(t), float(self._current_x), float(self._current_y))
 
         source = getattr(self, "_world_name", self.__class__.__name__)
-        self._outputs = {
+        self._outputs = ReadOnlyOutputs({
             "phase_point": BioSignal(
                 source=source,
                 name="phase_point",
@@ -94,26 +481,57 @@ class PhaseSpaceMonitor(BioModule):
                     "y": int(self._current_y),
                 },
                 time=float(t),
-                metadata=SignalMetadata(description="Phase space current point", kind="state"),
-            )
-        }
+                metadata=_PHASE_POINT_META,
+            ),
+            "regime": BioSignal(
+                source=source,
+                name="regime",
+                value={"t": float(t), **self._regime.summary()},
+                time=float(t),
+                metadata=_REGIME_META,
+            ),
+        })
+        if self._perf is not None:
+            self._outputs = with_perf(self._outputs, source, t, self._perf_snapshot())
 
     def get_outputs(self) -> Dict[str, BioSignal]:
-        return dict(self._outputs)
+        return self._outputs
 
+    def _history_size(self) -> Tuple[int, int]:
+        if self._density is not None:
+            return self._density.total, self._density.counts.nbytes
+        return len(self._trajectory), self._trajectory.nbytes
+
+    def _perf_snapshot(self) -> Dict[str, Any]:
+        return self._perf.snapshot(*self._history_size())  # type: ignore[union-attr]
+
+    def get_state(self) -> Dict[str, Any]:
+        state: Dict[str, Any] = {
+            "time": self._time,
+            "x": self._current_x,
+            "y": self._current_y,
+        }
+        if self._perf is not None:
+            state["perf"] = self._perf_snapshot()
+        return state
+
+    @timed
+    @memoized_visual
     def visualize(self) -> Optional["VisualSpec"]:
-        """Generate SVG phase space plot."""
-        if len(self._x_values) < 2:
+        """Generate SVG phase space plot (trajectory or density heatmap)."""
+        if self._density is not None:
+            if self._density.total == 0:
+                return None
+            svg = _density_svg(self._density, self.x_species, self.y_species)
+        elif len(self._trajectory) < 2:
             return None
-
-        svg = self._generate_phase_svg()
-        svg_b64 = base64.b64encode(svg.encode("utf-8")).decode("ascii")
-        data_uri = f"data:image/svg+xml;base64,{svg_b64}"
+        else:
+            svg = self._generate_phase_svg()
 
         return {
             "render": "image",
             "data": {
-                "src": data_uri,
+                "src": svg_data_uri(svg, self.svg_encoding),
                 "alt": f"Phase space: {self.x_species} vs {self.y_species}",
                 "width": 500,
                 "height": 400,
@@ -122,80 +540,5 @@ class PhaseSpaceMonitor(BioModule):
 
     def _generate_phase_svg(self) -> str:
         """Generate SVG phase space plot."""
-        w, h = 500, 400
-        margin = {"top": 30, "right": 30, "bottom": 50, "left": 60}
-        plot_w = w - margin["left"] - margin["right"]
-        plot_h = h - margin["top"] - margin["bottom"]
-
-        # Determine ranges
-        x_min = min(self._x_values) if self._x_values else 0
-        x_max = max(self._x_values) if self._x_values else 1
-        y_min = min(self._y_values) if self._y_values else 0
-        y_max = max(self._y_values) if self._y_values else 1
-
-        # Add padding
-        x_range = x_max - x_min if x_max > x_min else 1
-        y_range = y_max - y_min if y_max > y_min else 1
-        x_min -= x_range * 0.05
-        x_max += x_range * 0.05
-        y_min -= y_range * 0.05
-        y_max += y_range * 0.05
-
-        def x_scale(v: float) -> float:
-            return margin["left"] + ((v - x_min) / (x_max - x_min)) * plot_w
-
-        def y_scale(v: float) -> float:
-            return margin["top"] + (1 - (v - y_min) / (y_max - y_min)) * plot_h
-
-        lines = [
-            f'<svg xmlns="http://www.w3.org/2000/svg" width="{w}" height="{h}" viewBox="0 0 {w} {h}">',
-            '  <style>',
-            '    .axis { stroke: #333; stroke-width: 1; }',
-            '    .label { font-family: sans-serif; font-size: 11px; fill: #333; }',
-            '    .title { font-family: sans-serif; font-size: 13px; fill: #333; font-weight: bold; }',
-            '    .trajectory { fill: none; stroke: #2563eb; stroke-width: 1.5; opacity: 0.7; }',
-            '    .start { fill: #22c55e; }',
-            '    .end { fill: #ef4444; }',
-            '  </style>',
-            f'  <rect width="{w}" height="{h}" fill="white"/>',
-        ]
-
-        # Draw axes
-        x0 = margin["left"]
-        x1 = margin["left"] + plot_w
-        y0 = margin["top"]
-        y1 = margin["top"] + plot_h
-
-        lines.append(f'  <line class="axis" x1="{x0}" y1="{y1}" x2="{x1}" y2="{y1}"/>')
-        lines.append(f'  <line class="axis" x1="{x0}" y1="{y0}" x2="{x0}" y2="{y1}"/>')
-
-        # X-axis label
-        lines.append(f'  <text class="label" x="{x0 + plot_w/2}" y="{h - 10}" text-anchor="middle">{self.x_species}</text>')
-
-        # Y-axis label
-        lines.append(f'  <text class="label" x="15" y="{y0 + plot_h/2}" text-anchor="middle" transform="rotate(-90, 15, {y0 + plot_h/2})">{self.y_species}</text>')
-
-        # Title
-        lines.append(f'  <text class="title" x="{w/2}" y="18" text-anchor="middle">Phase Space</text>')
-
-        # Draw trajectory
-        if len(self._x_values) >= 2:
-            points = []
-            for x, y in zip(self._x_values, self._y_values):
-                px = x_scale(x)
-                py = y_scale(y)
-                points.append(f"{px},{py}")
-
-            path_d = "M " + " L ".join(points)
-            lines.append(f'  <path class="trajectory" d="{path_d}"/>')
-
-            # Start point (green)
-            sx, sy = x_scale(self._x_values[0]), y_scale(self._y_values[0])
-            lines.append(f'  <circle class="start" cx="{sx}" cy="{sy}" r="5"/>')
-
-            # End point (red)
-            ex, ey = x_scale(self._x_values[-1]), y_scale(self._y_values[-1])
-            lines.append(f'  <circle class="end" cx="{ex}" cy="{ey}" r="5"/>')
-
-        lines.append('</svg>')
-        return "\n".join(lines)
+        xs, ys = self._trajectory.arrays()
+        return phase_svg(xs, ys, self._trajectory.bounds(), self.x_species, self.y_species)
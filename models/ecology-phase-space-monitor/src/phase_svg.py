@@ -0,0 +1,176 @@
+# SPDX-FileCopyrightText: 2025-present Demi <bjaiye1@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""SVG phase plots shared by the phase-space monitor packages.
+
+This file in ``libs/`` is the original; see ``libs/ecology_support.py`` and
+``scripts/sync_libs.py`` for how the copies in ``src/`` are kept in step.
+"""
+from __future__ import annotations
+
+import base64
+from urllib.parse import quote
+from typing import List, Set, Tuple
+
+import numpy as np
+
+
+SVG_W, SVG_H = 500, 400
+MARGIN = {"top": 30, "right": 30, "bottom": 50, "left": 60}
+PLOT_W = SVG_W - MARGIN["left"] - MARGIN["right"]
+PLOT_H = SVG_H - MARGIN["top"] - MARGIN["bottom"]
+
+
+def svg_frame(x_label: str, y_label: str, title: str) -> List[str]:
+    """Opening SVG lines: styles, background, axes, axis labels and title."""
+    w, h = SVG_W, SVG_H
+    lines = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{w}" height="{h}" viewBox="0 0 {w} {h}">',
+        '  <style>',
+        '    .axis { stroke: #333; stroke-width: 1; }',
+        '    .label { font-family: sans-serif; font-size: 11px; fill: #333; }',
+        '    .title { font-family: sans-serif; font-size: 13px; fill: #333; font-weight: bold; }',
+        '    .trajectory { fill: none; stroke: #2563eb; stroke-width: 1.5; opacity: 0.7; }',
+        '    .start { fill: #22c55e; }',
+        '    .end { fill: #ef4444; }',
+        '  </style>',
+        f'  <rect width="{w}" height="{h}" fill="white"/>',
+    ]
+
+    # Draw axes
+    x0 = MARGIN["left"]
+    x1 = MARGIN["left"] + PLOT_W
+    y0 = MARGIN["top"]
+    y1 = MARGIN["top"] + PLOT_H
+
+    lines.append(f'  <line class="axis" x1="{x0}" y1="{y1}" x2="{x1}" y2="{y1}"/>')
+    lines.append(f'  <line class="axis" x1="{x0}" y1="{y0}" x2="{x0}" y2="{y1}"/>')
+
+    # X-axis label
+    lines.append(f'  <text class="label" x="{x0 + PLOT_W/2}" y="{h - 10}" text-anchor="middle">{x_label}</text>')
+
+    # Y-axis label
+    lines.append(f'  <text class="label" x="15" y="{y0 + PLOT_H/2}" text-anchor="middle" transform="rotate(-90, 15, {y0 + PLOT_H/2})">{y_label}</text>')
+
+    # Title
+    lines.append(f'  <text class="title" x="{w/2}" y="18" text-anchor="middle">{title}</text>')
+    return lines
+
+
+def phase_svg(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    bounds: Tuple[float, float, float, float],
+    x_label: str,
+    y_label: str,
+    title: str = "Phase Space",
+) -> str:
+    """Render a trajectory as an SVG phase plot.
+
+    The path is snapped to the pixel grid and simplified (see
+    `trajectory_path`), so its size is bounded by the plot area rather than
+    by the number of points.
+    """
+    x_min, x_max, y_min, y_max = (float(b) for b in bounds)
+
+    # Add padding
+    x_range = x_max - x_min if x_max > x_min else 1
+    y_range = y_max - y_min if y_max > y_min else 1
+    x_min -= x_range * 0.05
+    x_max += x_range * 0.05
+    y_min -= y_range * 0.05
+    y_max += y_range * 0.05
+
+    px = MARGIN["left"] + (np.asarray(xs, dtype=np.float64) - x_min) / (x_max - x_min) * PLOT_W
+    py = MARGIN["top"] + (1 - (np.asarray(ys, dtype=np.float64) - y_min) / (y_max - y_min)) * PLOT_H
+
+    lines = svg_frame(x_label, y_label, title)
+
+    # Draw trajectory
+    if len(px) >= 2:
+        lines.append(f'  <path class="trajectory" d="{trajectory_path(px, py)}"/>')
+
+        # Start point (green)
+        lines.append(f'  <circle class="start" cx="{px[0]:.1f}" cy="{py[0]:.1f}" r="5"/>')
+
+        # End point (red)
+        lines.append(f'  <circle class="end" cx="{px[-1]:.1f}" cy="{py[-1]:.1f}" r="5"/>')
+
+    lines.append('</svg>')
+    return "\n".join(lines)
+
+
+def rdp_keep(points: np.ndarray, epsilon: float) -> np.ndarray:
+    """Ramer-Douglas-Peucker: mask of vertices kept within ``epsilon`` pixels."""
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j <= i + 1:
+            continue
+        seg = points[j] - points[i]
+        rel = points[i + 1:j] - points[i]
+        norm = float(np.hypot(seg[0], seg[1]))
+        if norm == 0.0:
+            dist = np.hypot(rel[:, 0], rel[:, 1])
+        else:
+            dist = np.abs(seg[0] * rel[:, 1] - seg[1] * rel[:, 0]) / norm
+        k = int(np.argmax(dist))
+        if dist[k] > epsilon:
+            mid = i + 1 + k
+            keep[mid] = True
+            stack.append((i, mid))
+            stack.append((mid, j))
+    return keep
+
+
+def trajectory_path(px: np.ndarray, py: np.ndarray, epsilon: float = 0.5) -> str:
+    """Compact SVG path data for a trajectory in pixel coordinates.
+
+    Points are snapped to whole pixels and consecutive duplicates dropped.
+    Pixel segments already drawn earlier in the trajectory (a limit cycle
+    retraced lap after lap) are skipped, splitting the path into runs. Each
+    run is simplified with Ramer-Douglas-Peucker at ``epsilon`` pixels and
+    written as an absolute move followed by relative integer line commands.
+    """
+    q = np.column_stack((np.rint(px), np.rint(py))).astype(np.int64)
+    if len(q) > 1:
+        q = q[np.concatenate(([True], np.any(q[1:] != q[:-1], axis=1)))]
+    if len(q) < 2:
+        x, y = q[0]
+        return f"M{x} {y}h0"
+
+    runs = []
+    run = [0]
+    seen: Set[Tuple[int, int, int, int]] = set()
+    coords = q.tolist()
+    for k in range(1, len(coords)):
+        a, b = coords[k - 1], coords[k]
+        key = (a[0], a[1], b[0], b[1]) if (a[0], a[1]) <= (b[0], b[1]) else (b[0], b[1], a[0], a[1])
+        if key in seen:
+            if len(run) > 1:
+                runs.append(run)
+            run = [k]
+            continue
+        seen.add(key)
+        run.append(k)
+    if len(run) > 1:
+        runs.append(run)
+
+    parts = []
+    for run in runs:
+        pts = q[run]
+        pts = pts[rdp_keep(pts.astype(np.float64), epsilon)]
+        deltas = np.diff(pts, axis=0).ravel().tolist()
+        parts.append(f"M{pts[0, 0]} {pts[0, 1]}l" + " ".join(str(d) for d in deltas))
+    return "".join(parts)
+
+
+def svg_data_uri(svg: str, encoding: str) -> str:
+    """Embed an SVG document as a data URI, base64- or percent-encoded."""
+    if encoding == "raw":
+        return "data:image/svg+xml," + quote(svg, safe=" =:/'\",.-;()!*")
+    svg_b64 = base64.b64encode(svg.encode("utf-8")).decode("ascii")
+    return f"data:image/svg+xml;base64,{svg_b64}"
@@ -35,3 +35,281 @@ def test_emits_phase_point(biosim):
     assert payload["x"] == 80
     assert payload["y"] == 12
 
+
+
+def _pair(x, y, t):
+    from biosim.signals import BioSignal, SignalMetadata
+
+    meta = SignalMetadata(description="test", kind="state")
+    return [
+        {
+            "population_state": BioSignal(
+                source="x", name="population_state", value={"species": "Rabbits", "count": x, "t": t}, time=t, metadata=meta
+            )
+        },
+        {
+            "population_state": BioSignal(
+                source="y", name="population_state", value={"species": "Foxes", "count": y, "t": t}, time=t, metadata=meta
+            )
+        },
+    ]
+
+
+def test_ring_keeps_latest_points_and_bounds(biosim):
+    import random
+
+    from src.phase_space import PhaseSpaceMonitor
+
+    rng = random.Random(0)
+    mon = PhaseSpaceMonitor(x_species="Rabbits", y_species="Foxes", max_points=25, min_dt=1.0)
+    xs, ys = [], []
+    for i in range(200):
+        x, y = rng.randint(0, 1000), rng.randint(0, 300)
+        xs.append(x)
+        ys.append(y)
+        for signals in _pair(x, y, float(i)):
+            mon.set_inputs(signals)
+        mon.advance_to(float(i + 1))
+
+        kept_x, kept_y = xs[-25:], ys[-25:]
+        assert mon._trajectory.bounds() == (min(kept_x), max(kept_x), min(kept_y), max(kept_y))
+
+    got_x, got_y = mon._trajectory.arrays()
+    assert got_x.tolist() == xs[-25:]
+    assert got_y.tolist() == ys[-25:]
+    assert mon._trajectory.first() == (xs[-25], ys[-25])
+    assert mon._trajectory.last() == (xs[-1], ys[-1])
+
+    spec = mon.visualize()
+    assert spec["render"] == "image"
+    assert spec["data"]["src"].startswith("data:image/svg+xml")
+
+    mon.reset()
+    assert mon.visualize() is None
+
+
+def _cycle_monitor(n_points, **kwargs):
+    import math
+
+    from src.phase_space import PhaseSpaceMonitor
+
+    mon = PhaseSpaceMonitor(x_species="Rabbits", y_species="Foxes", max_points=n_points, min_dt=1.0, **kwargs)
+    for i in range(n_points):
+        x = int(round(500 + 300 * math.cos(2 * math.pi * i / 97)))
+        y = int(round(100 + 60 * math.sin(2 * math.pi * i / 97)))
+        for signals in _pair(x, y, float(i)):
+            mon.set_inputs(signals)
+        mon.advance_to(float(i + 1))
+    return mon
+
+
+def test_svg_payload_bounded_by_pixels_not_points(biosim):
+    short = _cycle_monitor(500).visualize()["data"]["src"]
+    long = _cycle_monitor(20000).visualize()["data"]["src"]
+    assert len(long) < 1.5 * len(short)
+    assert len(long) < 40000
+
+
+def test_trajectory_path_is_on_grid_and_keeps_endpoints(biosim):
+    import re
+
+    import numpy as np
+    from src.phase_svg import trajectory_path
+
+    rng = np.random.default_rng(0)
+    px = np.cumsum(rng.normal(0, 3, size=400)) + 200
+    py = np.cumsum(rng.normal(0, 3, size=400)) + 150
+    d = trajectory_path(px, py)
+
+    vertices = []
+    for run in re.findall(r"M(-?\d+) (-?\d+)l([-\d ]*)", d):
+        x, y = int(run[0]), int(run[1])
+        vertices.append((x, y))
+        deltas = [int(v) for v in run[2].split()]
+        for dx, dy in zip(deltas[::2], deltas[1::2]):
+            x, y = x + dx, y + dy
+            vertices.append((x, y))
+    vertices = np.array(vertices, dtype=np.float64)
+
+    assert np.all(vertices == np.rint(vertices))
+    assert np.allclose(vertices[0], np.rint([px[0], py[0]]))
+    assert np.allclose(vertices[-1], np.rint([px[-1], py[-1]]))
+
+
+def test_raw_svg_encoding(biosim):
+    from urllib.parse import unquote
+
+    import pytest
+    from src.phase_space import PhaseSpaceMonitor
+
+    with pytest.raises(ValueError):
+        PhaseSpaceMonitor(svg_encoding="gzip")
+
+    raw = _cycle_monitor(300, svg_encoding="raw").visualize()["data"]["src"]
+    b64 = _cycle_monitor(300).visualize()["data"]["src"]
+    assert raw.startswith("data:image/svg+xml,")
+    assert unquote(raw.split(",", 1)[1]).startswith("<svg")
+    assert len(raw) < len(b64)
+
+
+def test_visualize_is_cached_until_the_next_tick(biosim):
+    mon = _cycle_monitor(200)
+    spec = mon.visualize()
+    assert mon.visualize()["data"] is spec["data"]
+    spec["render"] = "table"
+    assert mon.visualize()["render"] == "image"
+
+    mon.svg_encoding = "raw"
+    raw = mon.visualize()
+    assert raw["data"] is not spec["data"] and raw["data"]["src"].startswith("data:image/svg+xml,")
+    assert mon.visualize()["data"] is raw["data"]
+
+    for signals in _pair(900, 10, 200.0):
+        mon.set_inputs(signals)
+    mon.advance_to(201.0)
+    assert mon.visualize()["data"] is not raw["data"]
+
+    mon.reset()
+    assert mon.visualize() is None
+
+
+def test_density_grid_matches_histogram_after_rescaling(biosim):
+    import numpy as np
+    from src.phase_space import _DensityGrid
+
+    rng = np.random.default_rng(4)
+    xs = np.concatenate((rng.integers(480, 520, size=500), rng.integers(-3000, 9000, size=500)))
+    ys = np.concatenate((rng.integers(90, 110, size=500), rng.integers(0, 700, size=500)))
+
+    grid = _DensityGrid(16)
+    for x, y in zip(xs.tolist(), ys.tolist()):
+        grid.add(x, y)
+
+    x_lo, x_hi, y_lo, y_hi = grid.extent()
+    assert x_lo <= xs.min() and xs.max() < x_hi
+    assert y_lo <= ys.min() and ys.max() < y_hi
+    expected, _, _ = np.histogram2d(
+        xs, ys, bins=16, range=[[x_lo, x_hi], [y_lo, y_hi]]
+    )
+    assert grid.total == 1000
+    assert np.array_equal(grid.counts, expected.astype(np.int64))
+
+
+def test_density_mode_renders_constant_size_heatmap(biosim):
+    import pytest
+    from src.phase_space import PhaseSpaceMonitor
+
+    with pytest.raises(ValueError):
+        PhaseSpaceMonitor(mode="scatter")
+
+    short = _cycle_monitor(500, mode="density", density_bins=32)
+    long = _cycle_monitor(20000, mode="density", density_bins=32)
+    assert long._trajectory is None
+    assert long._density.total == 20000
+    src_short = short.visualize()["data"]["src"]
+    src_long = long.visualize()["data"]["src"]
+    assert src_long.startswith("data:image/svg+xml")
+    assert len(src_long) < 1.5 * len(src_short)
+
+    long.reset()
+    assert long.visualize() is None
+
+
+def _run_regime(xs, ys, **kwargs):
+    from src.phase_space import PhaseSpaceMonitor
+
+    mon = PhaseSpaceMonitor(x_species="Rabbits", y_species="Foxes", max_points=100, min_dt=1.0, **kwargs)
+    regimes = []
+    for i, (x, y) in enumerate(zip(xs, ys)):
+        for signals in _pair(x, y, float(i)):
+            mon.set_inputs(signals)
+        mon.advance_to(float(i + 1))
+        regimes.append(mon.get_outputs()["regime"].value)
+    return mon, regimes
+
+
+def test_regime_detects_limit_cycle_period_and_amplitude(biosim):
+    import math
+
+    import numpy as np
+
+    rng = np.random.default_rng(8)
+    n = 1200
+    xs = [int(round(800 + 300 * math.sin(2 * math.pi * i / 40) + rng.normal(0, 5))) for i in range(n)]
+    ys = [int(round(120 + 40 * math.cos(2 * math.pi * i / 40) + rng.normal(0, 2))) for i in range(n)]
+    mon, regimes = _run_regime(xs, ys)
+
+    final = regimes[-1]
+    assert final["regime"] == "limit_cycle"
+    assert final["confidence"] > 0.8
+    assert abs(final["period"] - 40.0) < 1.0
+    assert abs(final["amplitude"] - 300.0) < 20.0
+    # Only recent crossings are kept.
+    assert final["n_crossings"] <= 8
+    assert regimes[10]["regime"] == "transient"
+    assert set(mon.get_outputs()) == mon.outputs()
+
+
+def test_regime_detects_fixed_point_and_extinction(biosim):
+    import math
+
+    import numpy as np
+
+    rng = np.random.default_rng(9)
+    xs = [int(round(600 + 400 * math.exp(-i / 30) * math.cos(i / 5) + rng.normal(0, 3))) for i in range(600)]
+    ys = [int(round(90 + 50 * math.exp(-i / 30) * math.sin(i / 5) + rng.normal(0, 1))) for i in range(600)]
+    _, regimes = _run_regime(xs, ys)
+    assert regimes[-1]["regime"] == "fixed_point"
+    assert regimes[-1]["confidence"] > 0.5
+
+    mon, regimes = _run_regime([500] * 50 + [300] * 50, [40] * 50 + [0] * 50)
+    assert regimes[-1]["regime"] == "extinction"
+    assert regimes[-1]["confidence"] == 1.0
+
+    mon.reset()
+    for signals in _pair(500, 40, 0.0):
+        mon.set_inputs(signals)
+    mon.advance_to(1.0)
+    assert mon.get_outputs()["regime"].value["regime"] == "transient"
+
+
+def test_regime_reports_extinction_only_after_a_held_zero(biosim):
+    from src.phase_space import PhaseSpaceMonitor
+
+    # No input yet: both counts are still the default zero.
+    mon = PhaseSpaceMonitor(x_species="Rabbits", y_species="Foxes", min_dt=1.0)
+    for i in range(30):
+        mon.advance_to(float(i + 1))
+        assert mon.get_outputs()["regime"].value["regime"] != "extinction"
+
+    # An x_species that never matches stays at zero while y is alive.
+    mismatched = PhaseSpaceMonitor(x_species="Hares", y_species="Foxes", extinction_hold=5, min_dt=1.0)
+    for i in range(30):
+        for signals in _pair(500, 40, float(i)):
+            mismatched.set_inputs(signals)
+        mismatched.advance_to(float(i + 1))
+        assert mismatched.get_outputs()["regime"].value["regime"] != "extinction"
+
+    # A dip to zero shorter than the hold window is not an extinction.
+    _, regimes = _run_regime([500] * 20 + [300] * 20, [40] * 20 + [0] * 4 + [40] * 16, extinction_hold=5)
+    assert all(r["regime"] != "extinction" for r in regimes)
+
+    _, regimes = _run_regime([500] * 20 + [300] * 10, [40] * 20 + [0] * 10, extinction_hold=5)
+    assert [r["regime"] == "extinction" for r in regimes[20:]] == [False] * 4 + [True] * 6
+
+
+def test_perf_counts_survive_reset_and_state_tracks_time(biosim):
+    from src.phase_space import PhaseSpaceMonitor
+
+    mon = PhaseSpaceMonitor(x_species="Rabbits", y_species="Foxes", perf=True, min_dt=1.0)
+    mon.reset()
+    mon.reset()
+    for signals in _pair(500, 40, 0.0):
+        mon.set_inputs(signals)
+    mon.advance_to(3.0)
+    state = mon.get_state()
+    assert state["perf"]["calls"]["advance_to"] == 1
+    assert state["perf"]["calls"]["set_inputs"] == 2
+    assert state["time"] == 3.0
+    mon.reset()
+    assert mon.get_state()["time"] == 0.0
@@ -4,7 +4,13 @@
 """Ecology metrics: summary statistics for ecological simulations."""
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING
+import math
+import sys
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Sequence, Set, Tuple, TYPE_CHECKING
+
+import numpy as np
 
 if TYPE_CHECKING:  # pragma: no cover - typing only
     from biosim import BioWorld
@@ -13,182 +19,387 @@ if TYPE_CHECKING:  # pragma: no cover - typing only
 from biosim import BioModule
 from biosim.signals import BioSignal, SignalMetadata
 
+from .ecology_support import (
+    EMPTY_OUTPUTS,
+    PerfCounters,
+    ReadOnlyOutputs,
+    memoized_visual,
+    population_state,
+    timed,
+    with_perf,
+)
+
+
+_METRICS_META = SignalMetadata(description="Ecology summary metrics", kind="state")
+
+
+@dataclass
+class _RunningStats:
+    """Streaming (Welford) mean/variance of one species' population count."""
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    last: int = 0
+
+    def push(self, value: int) -> None:
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+        self.last = value
+
+    def cv(self) -> Optional[float]:
+        """Coefficient of variation (population std / mean)."""
+        if self.n < 2 or self.mean <= 0:
+            return None
+        return (self.m2 / self.n) ** 0.5 / self.mean
+
+
+class _WindowStats:
+    """Rolling statistics over the last ``size`` samples with O(1) updates.
+
+    A circular buffer supplies the value leaving the window; running sums of
+    x, x^2 and j*x (j = position in window) give mean, variance and the
+    least-squares trend slope, and monotonic deques give min/max.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._buf = np.zeros(size, dtype=np.float64)
+        self._n = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._sum_jx = 0.0
+        self._min: Deque[Tuple[int, float]] = deque()
+        self._max: Deque[Tuple[int, float]] = deque()
+
+    def push(self, value: float) -> None:
+        i = self._n
+        slot = i % self.size
+        if i >= self.size:
+            old = float(self._buf[slot])
+            # Every remaining sample moves one position towards the window start.
+            self._sum_jx -= self._sum - old
+            self._sum -= old
+            self._sumsq -= old * old
+            j = self.size - 1
+        else:
+            j = i
+        self._buf[slot] = value
+        self._sum += value
+        self._sumsq += value * value
+        self._sum_jx += j * value
+
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((i, value))
+        if self._min[0][0] <= i - self.size:
+            self._min.popleft()
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((i, value))
+        if self._max[0][0] <= i - self.size:
+            self._max.popleft()
+
+        self._n += 1
+
+    @property
+    def nbytes(self) -> int:
+        return self._buf.nbytes
+
+    def summary(self) -> Dict[str, Any]:
+        m = min(self._n, self.size)
+        if m == 0:
+            return {"n": 0, "mean": 0.0, "cv": None, "min": None, "max": None, "trend_slope": 0.0}
+        mean = self._sum / m
+        var = max(0.0, self._sumsq / m - mean * mean)
+        cv = var ** 0.5 / mean if m >= 2 and mean > 0 else None
+        slope = 0.0
+        if m >= 2:
+            sum_j = m * (m - 1) / 2.0
+            sum_jj = (m - 1) * m * (2 * m - 1) / 6.0
+            slope = (m * self._sum_jx - sum_j * self._sum) / (m * sum_jj - sum_j * sum_j)
+        return {
+            "n": m,
+            "mean": mean,
+            "cv": cv,
+            "min": self._min[0][1],
+            "max": self._max[0][1],
+            "trend_slope": slope,
+        }
+
 
 class EcologyMetrics(BioModule):
     """Compute summary statistics for ecological simulations.
 
     Produces a table with metrics like:
     - Total population across all species
-    - Species diversity (Shannon index)
+    - Species diversity (Shannon, Simpson, Hill numbers, Pielou evenness,
+      richness, Berger-Parker dominance)
     - Population stability (coefficient of variation)
     - Extinction events
+
+    Statistics are accumulated online, so per-tick cost is O(species) and
+    memory does not grow with run length. Diversity indices are computed
+    from a species-indexed abundance vector of the latest counts.
+
+    Parameters:
+        keep_history: Also retain every count per species (memory grows
+            with run length).
+        hill_orders: Orders q of the Hill numbers to report.
+        window: If > 0, also publish rolling CV, min/max and trend slope
+            (per sample) over the last ``window`` samples of each species.
+        perf: Time ``set_inputs``/``advance_to``/``visualize`` and report
+            history size as a `perf` output and in ``get_state()`` (off by
+            default).
     """
 
-    def __init__(self, min_dt: float = 1.0) -> None:
+    def __init__(
+        self,
+        keep_history: bool = False,
+        hill_orders: Sequence[float] = (0.0, 1.0, 2.0),
+        window: int = 0,
+        perf: bool = False,
+        min_dt: float = 1.0,
+    ) -> None:
         self.min_dt = min_dt
+        self.perf = bool(perf)
+        self._perf: Optional[PerfCounters] = PerfCounters() if perf else None
+        self.keep_history = keep_history
+        self.hill_orders = [float(q) for q in hill_orders]
+        self.window = int(window)
+        # Per-species state lives in lists indexed by a local slot;
+        # _species_index maps a species name to its slot.
+        self._names: List[str] = []
+        self._species_index: Dict[str, int] = {}
+        self._stats: List[_RunningStats] = []
+        self._windows: List[_WindowStats] = []
+        self._abundance = np.zeros(8, dtype=np.float64)
         self._populations: Dict[str, List[int]] = {}
         self._extinctions: Dict[str, float] = {}  # species -> extinction time
+        self._total: int = 0  # sum of latest counts
+        self._peak_total: int = 0
+        self._slice_t: Optional[float] = None
         self._t_start: Optional[float] = None
         self._t_end: float = 0.0
-        self._outputs: Dict[str, BioSignal] = {}
+        self._generation = 0
+        self._visual_cache: Dict[str, Tuple[Any, Any]] = {}
+        self._outputs: Dict[str, BioSignal] = EMPTY_OUTPUTS
 
     def inputs(self) -> Set[str]:
         return {"population_state"}
 
     def outputs(self) -> Set[str]:
-        return {"metrics"}
+        return {"metrics", "perf"} if self.perf else {"metrics"}
 
     def reset(self) -> None:
+        self._generation += 1
+        self._names = []
+        self._species_index = {}
+        self._stats = []
+        self._windows = []
+        self._abundance = np.zeros(8, dtype=np.float64)
         self._populations = {}
         self._extinctions = {}
+        self._total = 0
+        self._peak_total = 0
+        self._slice_t = None
         self._t_start = None
         self._t_end = 0.0
-        self._outputs = {}
+        self._outputs = EMPTY_OUTPUTS
 
+    @timed
     def set_inputs(self, signals: Dict[str, BioSignal]) -> None:
         signal = signals.get("population_state")
-        if signal is None or not isinstance(signal.value, dict):
+        if signal is None:
+            return
+        state = population_state(signal.value, signal.time)
+        if state is None:
             return
-        species = str(signal.value.get("species", "Unknown"))
-        count = int(signal.value.get("count", 0))
-        t = float(signal.value.get("t", signal.time))
+        self._generation += 1
+        count, t = state.count, state.t
 
         if self._t_start is None:
             self._t_start = t
         self._t_end = t
 
-        if species not in self._populations:
-            self._populations[species] = []
+        # The total at the end of each time slice is a candidate peak.
+        if t != self._slice_t:
+            if self._stats:
+                self._peak_total = max(self._peak_total, self._total)
+            self._slice_t = t
 
-        self._populations[species].append(count)
+        slot = self._species_index.get(state.species, -1)
+        if slot < 0:
+            slot = self._add_species(state.species)
+        stats = self._stats[slot]
+        self._total += count - stats.last
+        stats.push(count)
+        self._abundance[slot] = count
+
+        if self.keep_history:
+            self._populations.setdefault(state.species, []).append(count)
+
+        if self.window > 0:
+            self._windows[slot].push(count)
 
         # Track extinctions
-        if count == 0 and species not in self._extinctions:
-            self._extinctions[species] = t
+        if count == 0 and state.species not in self._extinctions:
+            self._extinctions[state.species] = t
+
+    def _add_species(self, name: str) -> int:
+        slot = self._species_index[name] = len(self._names)
+        if slot == self._abundance.shape[0]:
+            self._abundance = np.concatenate([self._abundance, np.zeros_like(self._abundance)])
+        self._names.append(name)
+        self._stats.append(_RunningStats())
+        if self.window > 0:
+            self._windows.append(_WindowStats(self.window))
+        return slot
+
+    def _diversity(self) -> Dict[str, Any]:
+        """Diversity indices of the current abundance vector."""
+        counts = self._abundance[: len(self._species_index)]
+        present = counts[counts > 0]
+        richness = int(present.size)
+        if richness == 0:
+            return {
+                "richness": 0,
+                "shannon": 0.0,
+                "simpson_index": 0.0,
+                "gini_simpson": 0.0,
+                "hill_numbers": {f"{q:g}": 0.0 for q in self.hill_orders},
+                "pielou_evenness": 0.0,
+                "berger_parker_dominance": 0.0,
+            }
+
+        p = present / present.sum()
+        shannon = float(-(p * np.log(p)).sum())
+        simpson = float((p * p).sum())
+        hill: Dict[str, float] = {}
+        for q in self.hill_orders:
+            if q == 1.0:
+                hill[f"{q:g}"] = math.exp(shannon)
+            else:
+                hill[f"{q:g}"] = float((p ** q).sum() ** (1.0 / (1.0 - q)))
 
-    def advance_to(self, t: float) -> None:
-        # Emit incremental metrics as a state signal for persistence.
-        self._t_end = max(self._t_end, float(t))
-        duration = self._t_end - (self._t_start or 0.0)
+        return {
+            "richness": richness,
+            "shannon": shannon,
+            "simpson_index": simpson,
+            "gini_simpson": 1.0 - simpson,
+            "hill_numbers": hill,
+            "pielou_evenness": shannon / math.log(richness) if richness > 1 else 0.0,
+            "berger_parker_dominance": float(p.max()),
+        }
 
-        final_total = sum((h[-1] if h else 0) for h in self._populations.values())
-        n_species = len(self._populations)
+    def _summary(self) -> Dict[str, Any]:
+        """Current metric values from the running accumulators."""
+        n_species = len(self._stats)
         n_extinct = len(self._extinctions)
-        n_surviving = n_species - n_extinct
-        shannon = self._compute_shannon_diversity()
-
-        cvs = []
-        for history in self._populations.values():
-            cv = self._compute_cv(history)
-            if cv is not None:
-                cvs.append(cv)
+
+        cvs = [cv for cv in (s.cv() for s in self._stats) if cv is not None]
         avg_cv = sum(cvs) / len(cvs) if cvs else 0.0
+        diversity = self._diversity()
+
+        return {
+            "duration": self._t_end - (self._t_start or 0.0),
+            "n_species": n_species,
+            "n_surviving": n_species - n_extinct,
+            "n_extinct": n_extinct,
+            "final_total_population": self._total,
+            "peak_total_population": max(self._peak_total, self._total) if self._stats else 0,
+            "shannon_diversity": diversity["shannon"],
+            "avg_population_cv": avg_cv,
+            "diversity": diversity,
+        }
+
+    @timed
+    def advance_to(self, t: float) -> None:
+        self._generation += 1
+        # Emit incremental metrics as a state signal for persistence.
+        self._t_end = max(self._t_end, float(t))
+        summary = self._summary()
+        diversity = summary["diversity"]
 
         source = getattr(self, "_world_name", self.__class__.__name__)
-        self._outputs = {
+        self._outputs = ReadOnlyOutputs({
             "metrics": BioSignal(
                 source=source,
                 name="metrics",
                 value={
                     "t": float(t),
-                    "duration": float(duration),
-                    "n_species": int(n_species),
-                    "n_surviving": int(n_surviving),
-                    "n_extinct": int(n_extinct),
-                    "final_total_population": int(final_total),
-                    "shannon_diversity": float(shannon),
-                    "avg_population_cv": float(avg_cv),
+                    "duration": float(summary["duration"]),
+                    "n_species": int(summary["n_species"]),
+                    "n_surviving": int(summary["n_surviving"]),
+                    "n_extinct": int(summary["n_extinct"]),
+                    "final_total_population": int(summary["final_total_population"]),
+                    "peak_total_population": int(summary["peak_total_population"]),
+                    "shannon_diversity": float(summary["shannon_diversity"]),
+                    "avg_population_cv": float(summary["avg_population_cv"]),
+                    "species_richness": int(diversity["richness"]),
+                    "simpson_index": float(diversity["simpson_index"]),
+                    "gini_simpson": float(diversity["gini_simpson"]),
+                    "hill_numbers": dict(diversity["hill_numbers"]),
+                    "pielou_evenness": float(diversity["pielou_evenness"]),
+                    "berger_parker_dominance": float(diversity["berger_parker_dominance"]),
                     "extinctions": {k: float(v) for k, v in self._extinctions.items()},
+                    "windowed": {k: w.summary() for k, w in zip(self._names, self._windows)},
                 },
                 time=float(t),
-                metadata=SignalMetadata(description="Ecology summary metrics", kind="state"),
+                metadata=_METRICS_META,
             )
-        }
+        })
+        if self._perf is not None:
+            self._outputs = with_perf(self._outputs, source, t, self._perf_snapshot())
 
     def get_outputs(self) -> Dict[str, BioSignal]:
-        return dict(self._outputs)
-
-    def _compute_shannon_diversity(self) -> float:
-        """Compute Shannon diversity index from final populations."""
-        import math
-
-        final_pops = {}
-        for species, history in self._populations.items():
-            if history:
-                final_pops[species] = history[-1]
-
-        total = sum(final_pops.values())
-        if total <= 0:
-            return 0.0
-
-        H = 0.0
-        for count in final_pops.values():
-            if count > 0:
-                p = count / total
-                H -= p * math.log(p)
-
-        return H
-
-    def _compute_cv(self, values: List[int]) -> Optional[float]:
-        """Compute coefficient of variation."""
-        if len(values) < 2:
-            return None
-
-        mean = sum(values) / len(values)
-        if mean <= 0:
-            return None
-
-        variance = sum((v - mean) ** 2 for v in values) / len(values)
-        std = variance ** 0.5
-        return std / mean
+        return self._outputs
+
+    def _history_size(self) -> Tuple[int, int]:
+        # keep_history lists are sized by their container only.
+        points = sum(len(v) for v in self._populations.values())
+        nbytes = sum(sys.getsizeof(v) for v in self._populations.values())
+        nbytes += sum(w.nbytes for w in self._windows) + self._abundance.nbytes
+        return points, nbytes
+
+    def _perf_snapshot(self) -> Dict[str, Any]:
+        return self._perf.snapshot(*self._history_size())  # type: ignore[union-attr]
+
+    def get_state(self) -> Dict[str, Any]:
+        state: Dict[str, Any] = {
+            "time": self._t_end,
+            "n_species": len(self._names),
+            "total_population": self._total,
+        }
+        if self._perf is not None:
+            state["perf"] = self._perf_snapshot()
+        return state
 
+    @timed
+    @memoized_visual
     def visualize(self) -> Optional["VisualSpec"]:
         """Generate ecology metrics table."""
-        duration = self._t_end - (self._t_start or 0.0)
-
-        # Compute metrics
-        final_total = sum(
-            history[-1] if history else 0
-            for history in self._populations.values()
-        )
-
-        n_species = len(self._populations)
-        n_extinct = len(self._extinctions)
-        n_surviving = n_species - n_extinct
-
-        shannon = self._compute_shannon_diversity()
-
-        # Average CV across species (population stability)
-        cvs = []
-        for history in self._populations.values():
-            cv = self._compute_cv(history)
-            if cv is not None:
-                cvs.append(cv)
-        avg_cv = sum(cvs) / len(cvs) if cvs else 0.0
-
-        # Peak total population
-        max_totals = []
-        if self._populations:
-            first_species = list(self._populations.keys())[0]
-            n_steps = len(self._populations[first_species])
-            for i in range(n_steps):
-                total = sum(
-                    history[i] if i < len(history) else 0
-                    for history in self._populations.values()
-                )
-                max_totals.append(total)
-        peak_pop = max(max_totals) if max_totals else 0
+        summary = self._summary()
+        diversity = summary["diversity"]
 
         rows = [
-            ["Duration (time units)", f"{duration:.2f}"],
-            ["Number of Species", str(n_species)],
-            ["Surviving Species", str(n_surviving)],
-            ["Extinctions", str(n_extinct)],
-            ["Final Total Population", str(final_total)],
-            ["Peak Total Population", str(peak_pop)],
-            ["Shannon Diversity Index", f"{shannon:.3f}"],
-            ["Avg Population CV", f"{avg_cv:.3f}"],
+            ["Duration (time units)", f"{summary['duration']:.2f}"],
+            ["Number of Species", str(summary["n_species"])],
+            ["Surviving Species", str(summary["n_surviving"])],
+            ["Extinctions", str(summary["n_extinct"])],
+            ["Final Total Population", str(summary["final_total_population"])],
+            ["Peak Total Population", str(summary["peak_total_population"])],
+            ["Shannon Diversity Index", f"{summary['shannon_diversity']:.3f}"],
+            ["Avg Population CV", f"{summary['avg_population_cv']:.3f}"],
+            ["Species Richness", str(diversity["richness"])],
+            ["Simpson Index", f"{diversity['simpson_index']:.3f}"],
+            ["Gini-Simpson Diversity", f"{diversity['gini_simpson']:.3f}"],
+            ["Pielou Evenness", f"{diversity['pielou_evenness']:.3f}"],
+            ["Berger-Parker Dominance", f"{diversity['berger_parker_dominance']:.3f}"],
         ]
+        for q, value in diversity["hill_numbers"].items():
+            rows.append([f"Hill Number (q={q})", f"{value:.3f}"])
 
         # Add extinction details
         if self._extinctions:
@@ -34,3 +34,108 @@ def test_emits_metrics_signal(biosim):
     payload = out["metrics"].value
     assert payload["n_species"] >= 2
 
+
+def _state(species, count, t):
+    from biosim.signals import BioSignal, SignalMetadata
+
+    return {
+        "population_state": BioSignal(
+            source=species,
+            name="population_state",
+            value={"species": species, "count": count, "t": t},
+            time=t,
+            metadata=SignalMetadata(description="test", kind="state"),
+        )
+    }
+
+
+def test_streaming_statistics_match_full_history(biosim):
+    import math
+    import random
+
+    from src.ecology_metrics import EcologyMetrics
+
+    rng = random.Random(3)
+    mod = EcologyMetrics(keep_history=True, min_dt=1.0)
+    for step in range(200):
+        t = float(step)
+        for species in ("Rabbits", "Foxes", "Deer"):
+            mod.set_inputs(_state(species, rng.randint(1, 500), t))
+        mod.advance_to(t + 1.0)
+
+    payload = mod.get_outputs()["metrics"].value
+    histories = mod._populations
+    assert payload["final_total_population"] == sum(h[-1] for h in histories.values())
+    assert payload["peak_total_population"] == max(
+        sum(h[i] for h in histories.values()) for i in range(200)
+    )
+
+    cvs = []
+    for h in histories.values():
+        mean = sum(h) / len(h)
+        cvs.append(math.sqrt(sum((v - mean) ** 2 for v in h) / len(h)) / mean)
+    assert abs(payload["avg_population_cv"] - sum(cvs) / len(cvs)) < 1e-9
+
+
+def test_history_not_retained_by_default(biosim):
+    from src.ecology_metrics import EcologyMetrics
+
+    mod = EcologyMetrics(min_dt=1.0)
+    for step in range(50):
+        mod.set_inputs(_state("Rabbits", 10 + step, float(step)))
+    assert mod._populations == {}
+    mod.advance_to(50.0)
+    assert mod.get_outputs()["metrics"].value["final_total_population"] == 59
+
+
+def test_biodiversity_suite(biosim):
+    import math
+
+    from src.ecology_metrics import EcologyMetrics
+
+    mod = EcologyMetrics(hill_orders=(0, 1, 2), min_dt=1.0)
+    for species, count in (("A", 50), ("B", 30), ("C", 20), ("D", 0)):
+        mod.set_inputs(_state(species, count, 0.0))
+    mod.advance_to(1.0)
+    payload = mod.get_outputs()["metrics"].value
+
+    p = [0.5, 0.3, 0.2]
+    shannon = -sum(x * math.log(x) for x in p)
+    simpson = sum(x * x for x in p)
+    assert payload["species_richness"] == 3
+    assert abs(payload["shannon_diversity"] - shannon) < 1e-12
+    assert abs(payload["simpson_index"] - simpson) < 1e-12
+    assert abs(payload["gini_simpson"] - (1 - simpson)) < 1e-12
+    assert abs(payload["hill_numbers"]["0"] - 3.0) < 1e-12
+    assert abs(payload["hill_numbers"]["1"] - math.exp(shannon)) < 1e-12
+    assert abs(payload["hill_numbers"]["2"] - 1 / simpson) < 1e-12
+    assert abs(payload["pielou_evenness"] - shannon / math.log(3)) < 1e-12
+    assert payload["berger_parker_dominance"] == 0.5
+
+
+def test_windowed_metrics_match_naive_window(biosim):
+    import random
+
+    from src.ecology_metrics import EcologyMetrics
+
+    rng = random.Random(11)
+    window = 25
+    values = [rng.randint(1, 1000) for _ in range(140)]
+    mod = EcologyMetrics(window=window, min_dt=1.0)
+    for step, count in enumerate(values):
+        mod.set_inputs(_state("Rabbits", count, float(step)))
+    mod.advance_to(float(len(values)))
+    stats = mod.get_outputs()["metrics"].value["windowed"]["Rabbits"]
+
+    tail = values[-window:]
+    mean = sum(tail) / window
+    std = (sum((v - mean) ** 2 for v in tail) / window) ** 0.5
+    j_mean = (window - 1) / 2
+    slope = sum((j - j_mean) * (v - mean) for j, v in enumerate(tail)) / sum(
+        (j - j_mean) ** 2 for j in range(window)
+    )
+    assert stats["n"] == window
+    assert stats["min"] == min(tail)
+    assert stats["max"] == max(tail)
+    assert abs(stats["cv"] - std / mean) < 1e-9
+    assert abs(stats["trend_slope"] - slope) < 1e-9
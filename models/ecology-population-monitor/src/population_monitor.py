@@ -4,7 +4,11 @@
 """Population monitor: collect and visualize population data from multiple species."""
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING
+import json
+import os
+from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+import numpy as np
 
 if TYPE_CHECKING:  # pragma: no cover - typing only
     from biosim import BioWorld
@@ -13,58 +17,400 @@ if TYPE_CHECKING:  # pragma: no cover - typing only
 from biosim import BioModule
 from biosim.signals import BioSignal, SignalMetadata
 
+from .ecology_support import (
+    EMPTY_OUTPUTS,
+    PerfCounters,
+    ReadOnlyOutputs,
+    downsample_points,
+    memoized_visual,
+    population_state,
+    timed,
+    with_perf,
+)
+
+
+_SUMMARY_META = SignalMetadata(description="Population monitor summary", kind="state")
+
+
+class _SpeciesSeries:
+    """Bounded columnar (t, count) history for one species.
+
+    Columns grow by doubling up to ``capacity`` and then act as a ring, so an
+    append is amortized O(1) and each point costs 16 bytes.
+    """
+
+    _INITIAL = 64
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, int(capacity))
+        size = min(self.capacity, self._INITIAL)
+        self._t = np.empty(size, dtype=np.float64)
+        self._count = np.empty(size, dtype=np.int64)
+        self._n = 0
+
+    def __len__(self) -> int:
+        return min(self._n, self.capacity)
+
+    @property
+    def nbytes(self) -> int:
+        return self._t.nbytes + self._count.nbytes
+
+    def append(self, t: float, count: int) -> None:
+        size = len(self._t)
+        if self._n == size and size < self.capacity:
+            grown = min(self.capacity, 2 * size)
+            self._t = np.resize(self._t, grown)
+            self._count = np.resize(self._count, grown)
+        slot = self._n % self.capacity
+        self._t[slot] = t
+        self._count[slot] = count
+        self._n += 1
+
+    @property
+    def last_count(self) -> int:
+        return int(self._count[(self._n - 1) % self.capacity])
+
+    @property
+    def dropped(self) -> bool:
+        """Whether older points have been overwritten."""
+        return self._n > self.capacity
+
+    @property
+    def first_t(self) -> float:
+        return float(self._t[(self._n - len(self)) % self.capacity])
+
+    @property
+    def last_t(self) -> float:
+        return float(self._t[(self._n - 1) % self.capacity])
+
+    def since(self, t: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Retained points with time after ``t``, in O(log n + new points)."""
+        start = self._n % self.capacity
+        if self._n <= self.capacity or start == 0:
+            n = len(self)
+            i = int(np.searchsorted(self._t[:n], t, side="right"))
+            return self._t[i:n], self._count[i:n]
+        tail_t = self._t[:start]
+        if tail_t[0] > t:
+            # Newer segment is fully selected; look in the older one.
+            i = start + int(np.searchsorted(self._t[start:], t, side="right"))
+            return (
+                np.concatenate((self._t[i:], tail_t)),
+                np.concatenate((self._count[i:], self._count[:start])),
+            )
+        i = int(np.searchsorted(tail_t, t, side="right"))
+        return tail_t[i:], self._count[i:start]
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Retained times and counts in chronological order."""
+        if self._n <= self.capacity:
+            return self._t[: self._n], self._count[: self._n]
+        start = self._n % self.capacity
+        return (
+            np.concatenate((self._t[start:], self._t[:start])),
+            np.concatenate((self._count[start:], self._count[:start])),
+        )
+
+
+class _LevelRing:
+    """Bounded ring of aggregated buckets (mid time, min, max, mean) for one pyramid level."""
+
+    _INITIAL = 64
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, int(capacity))
+        size = min(self.capacity, self._INITIAL)
+        self._cols = {
+            "t": np.empty(size, dtype=np.float64),
+            "min": np.empty(size, dtype=np.int64),
+            "max": np.empty(size, dtype=np.int64),
+            "mean": np.empty(size, dtype=np.float64),
+        }
+        self._n = 0
+
+    def __len__(self) -> int:
+        return min(self._n, self.capacity)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(col.nbytes for col in self._cols.values())
+
+    def append(self, t: float, lo: int, hi: int, mean: float) -> None:
+        size = len(self._cols["t"])
+        if self._n == size and size < self.capacity:
+            grown = min(self.capacity, 2 * size)
+            self._cols = {name: np.resize(col, grown) for name, col in self._cols.items()}
+        slot = self._n % self.capacity
+        cols = self._cols
+        cols["t"][slot] = t
+        cols["min"][slot] = lo
+        cols["max"][slot] = hi
+        cols["mean"][slot] = mean
+        self._n += 1
+
+    @property
+    def dropped(self) -> bool:
+        return self._n > self.capacity
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Retained columns in chronological order."""
+        if self._n <= self.capacity:
+            return {name: col[: self._n] for name, col in self._cols.items()}
+        start = self._n % self.capacity
+        return {name: np.concatenate((col[start:], col[:start])) for name, col in self._cols.items()}
+
+
+class _Pyramid:
+    """Min/max/mean summaries of one species' counts at power-of-two decimations.
+
+    Level ``k`` buckets aggregate ``2**k`` consecutive points and are kept in
+    a `_LevelRing` of ``capacity`` buckets, so a level spans ``2**k`` times
+    more history than the raw ring. Each append merges completed sibling
+    buckets upwards (amortized O(1)); levels are created as history grows.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.levels: List[_LevelRing] = []
+        # Completed bucket at each level waiting for its sibling: [t0, t1, min, max, sum, n].
+        self._carry: List[Optional[List[float]]] = []
+
+    @property
+    def nbytes(self) -> int:
+        return sum(level.nbytes for level in self.levels)
+
+    def push(self, t: float, count: int) -> None:
+        bucket = [t, t, count, count, float(count), 1]
+        k = 0
+        while True:
+            if k == len(self._carry):
+                self._carry.append(None)
+            left = self._carry[k]
+            if left is None:
+                self._carry[k] = bucket
+                return
+            self._carry[k] = None
+            bucket = [
+                left[0],
+                bucket[1],
+                min(left[2], bucket[2]),
+                max(left[3], bucket[3]),
+                left[4] + bucket[4],
+                left[5] + bucket[5],
+            ]
+            if k == len(self.levels):
+                self.levels.append(_LevelRing(self.capacity))
+            self.levels[k].append(0.5 * (bucket[0] + bucket[1]), bucket[2], bucket[3], bucket[4] / bucket[5])
+            k += 1
+
+
+# Append-only spill record: one raw little-endian file per column plus metadata.
+# species_slot indexes the record's own species list, not a payload species_id.
+_SPILL_COLUMNS = (("t", "<f8"), ("species_slot", "<i4"), ("count", "<i8"))
+_SPILL_META = "meta.json"
+
+
+class PopulationSpillReader:
+    """Memory-mapped view of a record written by ``PopulationMonitor(spill_path=...)``.
+
+    Columns are mapped read-only, so opening a long record is cheap and
+    slices are read from disk on demand. ``runs`` holds the first row of each
+    run; a monitor ``reset()`` starts a new run in the same record.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(os.path.join(path, _SPILL_META), "r", encoding="utf-8") as fh:
+            meta = json.load(fh)
+        self.species: List[str] = list(meta["species"])
+        self.rows = int(meta["rows"])
+        self.runs: List[int] = list(meta.get("runs", [0]))
+        self._columns: Dict[str, np.ndarray] = {}
+        for name, dtype in _SPILL_COLUMNS:
+            if self.rows == 0:
+                self._columns[name] = np.empty(0, dtype=dtype)
+            else:
+                self._columns[name] = np.memmap(
+                    os.path.join(path, f"{name}.{dtype[1:]}"), dtype=dtype, mode="r", shape=(self.rows,)
+                )
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def column(self, name: str) -> np.ndarray:
+        """Full ``t``, ``species_slot`` or ``count`` column."""
+        return self._columns[name]
+
+    def series(self, species: str, run: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Times and counts recorded for one species, in every run or just ``run``."""
+        start, stop = 0, self.rows
+        if run is not None:
+            start = self.runs[run]
+            stop = self.runs[run + 1] if run + 1 < len(self.runs) else self.rows
+        t = self._columns["t"][start:stop]
+        counts = self._columns["count"][start:stop]
+        mask = self._columns["species_slot"][start:stop] == self.species.index(species)
+        return np.asarray(t[mask]), np.asarray(counts[mask])
+
 
 class PopulationMonitor(BioModule):
     """Collects population data from multiple species and visualizes them together.
 
     Receives `population_state` signals and produces a combined timeseries plot.
 
+    With ``spill_path`` set, every point is also buffered as a
+    ``(t, species_slot, count)`` row and flushed in chunks of ``spill_chunk``
+    rows to append-only column files in that directory (``t.f8``,
+    ``species_slot.i4``, ``count.i8`` and ``meta.json``). The in-memory
+    history then only needs to hold a short tail for plotting
+    (``max_points``) while the full record stays on disk; read it back with
+    `PopulationSpillReader`. Call ``close()`` (or ``flush()``) at the end of a
+    run to write the last partial chunk. ``reset()`` flushes and keeps
+    appending to the same record, starting a new run in it.
+
     Parameters:
         max_points: Maximum data points per species (oldest dropped).
+        spill_path: Directory for the on-disk record (disabled when None).
+        spill_chunk: Rows buffered in memory between flushes.
+        max_visual_points: Points per plotted series above which LTTB
+            downsampling applies (0 plots every point).
+        perf: Time ``set_inputs``/``advance_to``/``visualize`` and report
+            history size as a `perf` output and in ``get_state()`` (off by
+            default).
     """
 
-    def __init__(self, max_points: int = 10000, min_dt: float = 1.0) -> None:
+    _visual_params: Tuple[str, ...] = ("max_visual_points",)
+
+    def __init__(
+        self,
+        max_points: int = 10000,
+        spill_path: Optional[str] = None,
+        spill_chunk: int = 4096,
+        max_visual_points: int = 2000,
+        perf: bool = False,
+        min_dt: float = 1.0,
+    ) -> None:
         self.min_dt = min_dt
+        self.perf = bool(perf)
+        self._perf: Optional[PerfCounters] = PerfCounters() if perf else None
         self.max_points = max_points
-        self._data: Dict[str, List[Dict[str, float]]] = {}
-        self._outputs: Dict[str, BioSignal] = {}
+        self.spill_path = spill_path
+        self.spill_chunk = max(1, int(spill_chunk))
+        self.max_visual_points = max_visual_points
+        self._epoch = 0  # bumped by reset() to invalidate delta cursors
+        self._init_storage()
+        # Spill buffer and number of rows already on disk (-1: record not
+        # started). Unlike the in-memory history these outlive reset(): the
+        # record keeps its own species table and the first row of each run.
+        self._pending = {name: np.empty(self.spill_chunk, dtype=dtype) for name, dtype in _SPILL_COLUMNS}
+        self._n_pending = 0
+        self._spilled = -1
+        self._spill_slots: Dict[str, int] = {}
+        self._spill_names: List[str] = []
+        self._runs: List[int] = [0]
+        self._generation = 0
+        self._visual_cache: Dict[str, Tuple[Any, Any]] = {}
+        self._outputs: Dict[str, BioSignal] = EMPTY_OUTPUTS
+
+    def _init_storage(self) -> None:
+        # Species names are interned to integer slots indexing _series.
+        self._slots: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._series: List[_SpeciesSeries] = []
+        self._pyramids: List[_Pyramid] = []
+
+    def flush(self) -> None:
+        """Write buffered rows to the spill record (no-op without ``spill_path``)."""
+        if self.spill_path is None:
+            return
+        if self._spilled < 0:
+            os.makedirs(self.spill_path, exist_ok=True)
+            mode = "wb"
+            self._spilled = 0
+        else:
+            mode = "ab"
+        n = self._n_pending
+        for name, dtype in _SPILL_COLUMNS:
+            with open(os.path.join(self.spill_path, f"{name}.{dtype[1:]}"), mode) as fh:
+                fh.write(self._pending[name][:n].tobytes())
+        self._spilled += n
+        self._n_pending = 0
+        meta = {
+            "columns": {name: dtype for name, dtype in _SPILL_COLUMNS},
+            "rows": self._spilled,
+            "species": self._spill_names,
+            "runs": self._runs,
+        }
+        with open(os.path.join(self.spill_path, _SPILL_META), "w", encoding="utf-8") as fh:
+            json.dump(meta, fh)
+
+    def close(self) -> None:
+        """End of run: write the partial chunk still buffered to the spill record."""
+        if self._n_pending:
+            self.flush()
 
     def inputs(self) -> Set[str]:
         return {"population_state"}
 
     def outputs(self) -> Set[str]:
-        return {"population_summary"}
+        return {"population_summary", "perf"} if self.perf else {"population_summary"}
 
     def reset(self) -> None:
-        """Reset collected data."""
-        self._data = {}
-        self._outputs = {}
+        """Reset collected data; a spill record continues with a new run."""
+        self._generation += 1
+        if self._n_pending:
+            self.flush()
+        if self._spilled > self._runs[-1]:
+            self._runs.append(self._spilled)
+        self._init_storage()
+        self._epoch += 1
+        self._outputs = EMPTY_OUTPUTS
 
+    @timed
     def set_inputs(self, signals: Dict[str, BioSignal]) -> None:
         signal = signals.get("population_state")
-        if signal is None or not isinstance(signal.value, dict):
+        if signal is None:
+            return
+        state = population_state(signal.value, signal.time)
+        if state is None:
             return
-        species = str(signal.value.get("species", "Unknown"))
-        count = int(signal.value.get("count", 0))
-        t = float(signal.value.get("t", signal.time))
+        self._generation += 1
+        count, t = state.count, state.t
 
-        if species not in self._data:
-            self._data[species] = []
+        slot = self._slots.get(state.species, -1)
+        if slot < 0:
+            slot = self._slots[state.species] = len(self._names)
+            self._names.append(state.species)
+            self._series.append(_SpeciesSeries(self.max_points))
+            self._pyramids.append(_Pyramid(self.max_points))
 
-        self._data[species].append({"t": t, "count": count})
+        # Oldest point is overwritten once max_points is reached
+        self._series[slot].append(t, count)
+        self._pyramids[slot].push(t, count)
 
-        # Trim if over limit
-        if len(self._data[species]) > self.max_points:
-            self._data[species] = self._data[species][-self.max_points:]
+        if self.spill_path is not None:
+            i = self._n_pending
+            self._pending["t"][i] = t
+            spill_slot = self._spill_slots.get(state.species, -1)
+            if spill_slot < 0:
+                spill_slot = self._spill_slots[state.species] = len(self._spill_names)
+                self._spill_names.append(state.species)
+            self._pending["species_slot"][i] = spill_slot
+            self._pending["count"][i] = count
+            self._n_pending += 1
+            if self._n_pending == self.spill_chunk:
+                self.flush()
 
+    @timed
     def advance_to(self, t: float) -> None:
+        self._generation += 1
         latest: Dict[str, int] = {}
-        for species, hist in self._data.items():
-            if hist:
-                latest[species] = int(hist[-1]["count"])
+        for species, series in zip(self._names, self._series):
+            if len(series):
+                latest[species] = series.last_count
 
         source = getattr(self, "_world_name", self.__class__.__name__)
-        self._outputs = {
+        self._outputs = ReadOnlyOutputs({
             "population_summary": BioSignal(
                 source=source,
                 name="population_summary",
@@ -74,24 +420,118 @@ class PopulationMonitor(BioModule):
                     "n_species": int(len(latest)),
                 },
                 time=float(t),
-                metadata=SignalMetadata(description="Population monitor summary", kind="state"),
+                metadata=_SUMMARY_META,
             )
-        }
+        })
+        if self._perf is not None:
+            self._outputs = with_perf(self._outputs, source, t, self._perf_snapshot())
 
     def get_outputs(self) -> Dict[str, BioSignal]:
-        return dict(self._outputs)
+        return self._outputs
+
+    def _history_size(self) -> Tuple[int, int]:
+        points = sum(len(s) for s in self._series)
+        nbytes = sum(s.nbytes for s in self._series) + sum(p.nbytes for p in self._pyramids)
+        return points, nbytes
+
+    def _perf_snapshot(self) -> Dict[str, Any]:
+        return self._perf.snapshot(*self._history_size())  # type: ignore[union-attr]
+
+    def get_state(self) -> Dict[str, Any]:
+        state: Dict[str, Any] = {
+            "n_species": len(self._names),
+            "n_points": sum(len(s) for s in self._series),
+        }
+        if self._perf is not None:
+            state["perf"] = self._perf_snapshot()
+        return state
+
+    @timed
+    @memoized_visual
+    def visualize(
+        self,
+        t_start: Optional[float] = None,
+        t_end: Optional[float] = None,
+        pixels: Optional[int] = None,
+    ) -> Optional["VisualSpec"]:
+        """Generate combined population timeseries for all species.
+
+        Without arguments every retained raw point is returned. With a time
+        range and/or a ``pixels`` budget, each species is drawn from the
+        finest pyramid level that covers ``[t_start, t_end]`` in at most
+        ``pixels`` points; decimated levels add min and max envelope series.
+        """
+        if not self._names:
+            return None
+        if t_start is None and t_end is None and pixels is None:
+            return self._timeseries({name: self._series[i].arrays() for i, name in enumerate(self._names)})
+
+        lo_t = -np.inf if t_start is None else float(t_start)
+        hi_t = np.inf if t_end is None else float(t_end)
+        budget = np.inf if pixels is None else max(1, int(pixels))
+        columns: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        levels: Dict[str, int] = {}
+        for i, name in enumerate(self._names):
+            level, cols = self._select_level(i, lo_t, hi_t, budget)
+            levels[name] = level
+            columns[name] = (cols["t"], cols["mean"] if level else cols["count"])
+            if level:
+                columns[f"{name} (min)"] = (cols["t"], cols["min"])
+                columns[f"{name} (max)"] = (cols["t"], cols["max"])
+        spec = self._timeseries(columns)
+        spec["data"]["levels"] = levels
+        return spec
+
+    def _select_level(self, slot: int, lo_t: float, hi_t: float, budget: float) -> Tuple[int, Dict[str, np.ndarray]]:
+        """Finest level whose retained window covers ``lo_t`` within ``budget`` points."""
+        base = self._series[slot]
+        t, count = base.arrays()
+        candidates = [(0, base.dropped, {"t": t, "count": count})]
+        candidates += [(k + 1, ring.dropped, None) for k, ring in enumerate(self._pyramids[slot].levels)]
+
+        chosen = None
+        for level, dropped, cols in candidates:
+            if cols is None:
+                cols = self._pyramids[slot].levels[level - 1].arrays()
+            i = int(np.searchsorted(cols["t"], lo_t, side="left"))
+            j = int(np.searchsorted(cols["t"], hi_t, side="right"))
+            window = {name: col[i:j] for name, col in cols.items()}
+            chosen = (level, window)
+            covers = not dropped or (len(cols["t"]) and cols["t"][0] <= lo_t)
+            if covers and j - i <= budget:
+                break
+        return chosen
+
+    @memoized_visual
+    def visualize_delta(self, since: Optional[float] = None, epoch: Optional[int] = None) -> Optional["VisualSpec"]:
+        """Points recorded after ``since``; a full snapshot when the cursor is stale.
 
-    def visualize(self) -> Optional["VisualSpec"]:
-        """Generate combined population timeseries for all species."""
-        if not self._data:
+        Pass back ``delta["cursor"]`` and ``delta["epoch"]`` from the previous
+        result. A missing cursor, an epoch from before the last `reset`, or a
+        cursor older than the retained history returns every retained point
+        with ``delta["full"]`` set.
+        """
+        if not self._names:
             return None
+        full = (
+            since is None
+            or epoch != self._epoch
+            or any(s.dropped and s.first_t > since for s in self._series)
+        )
+        if full:
+            columns = {name: self._series[i].arrays() for i, name in enumerate(self._names)}
+        else:
+            columns = {name: self._series[i].since(since) for i, name in enumerate(self._names)}
+        cursor = max(s.last_t for s in self._series)
+        return {**self._timeseries(columns), "delta": {"epoch": self._epoch, "cursor": cursor, "full": full}}
 
+    def _timeseries(self, columns: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> "VisualSpec":
         series = []
-        for species in sorted(self._data.keys()):
-            history = self._data[species]
+        for species in sorted(columns):
+            ts, counts = columns[species]
             series.append({
                 "name": species,
-                "points": [[h["t"], h["count"]] for h in history],
+                "points": downsample_points(ts, counts, self.max_visual_points),
             })
 
         return {
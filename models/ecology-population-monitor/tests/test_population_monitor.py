@@ -23,3 +23,275 @@ def test_emits_population_summary(biosim):
     payload = out["population_summary"].value
     assert payload["latest_counts"]["Rabbits"] == 50
 
+
+
+def _state(species, count, t):
+    from biosim.signals import BioSignal, SignalMetadata
+
+    return {
+        "population_state": BioSignal(
+            source=species,
+            name="population_state",
+            value={"species": species, "count": count, "t": t},
+            time=t,
+            metadata=SignalMetadata(description="test", kind="state"),
+        )
+    }
+
+
+def test_bounded_columnar_history(biosim):
+    from src.population_monitor import PopulationMonitor
+
+    mon = PopulationMonitor(max_points=100, min_dt=1.0)
+    for i in range(250):
+        mon.set_inputs(_state("Rabbits", 1000 + i, float(i)))
+        if i % 2 == 0:
+            mon.set_inputs(_state("Foxes", i, float(i)))
+    mon.advance_to(250.0)
+
+    assert mon.get_outputs()["population_summary"].value["latest_counts"] == {"Rabbits": 1249, "Foxes": 248}
+    spec = mon.visualize()
+    series = {s["name"]: s["points"] for s in spec["data"]["series"]}
+    assert list(series) == ["Foxes", "Rabbits"]
+    assert series["Rabbits"] == [[float(i), 1000 + i] for i in range(150, 250)]
+    assert series["Foxes"] == [[float(i), i] for i in range(50, 250, 2)]
+    assert isinstance(series["Rabbits"][0][1], int)
+
+    mon.reset()
+    assert mon.visualize() is None
+
+
+def test_spill_to_disk_preserves_full_record(biosim, tmp_path):
+    import numpy as np
+    from src.population_monitor import PopulationMonitor, PopulationSpillReader
+
+    path = tmp_path / "record"
+    mon = PopulationMonitor(max_points=20, spill_path=str(path), spill_chunk=64, min_dt=1.0)
+    for i in range(1000):
+        mon.set_inputs(_state("Rabbits", 500 + i, float(i)))
+        mon.set_inputs(_state("Foxes", i % 97, float(i)))
+        mon.advance_to(float(i + 1))
+
+    # Only whole chunks are on disk until the run is closed; plotting does
+    # not write.
+    assert len(PopulationSpillReader(str(path))) == 1984
+    spec = mon.visualize()
+    assert all(len(s["points"]) == 20 for s in spec["data"]["series"])
+    assert len(PopulationSpillReader(str(path))) == 1984
+
+    mon.close()
+    mon.close()
+    reader = PopulationSpillReader(str(path))
+    assert len(reader) == 2000
+    assert reader.species == ["Rabbits", "Foxes"]
+    t, counts = reader.series("Rabbits")
+    assert np.array_equal(t, np.arange(1000, dtype=np.float64))
+    assert np.array_equal(counts, 500 + np.arange(1000))
+    t, counts = reader.series("Foxes")
+    assert np.array_equal(counts, np.arange(1000) % 97)
+
+    # A reset writes the rows still buffered and then appends a new run to
+    # the same record instead of truncating it.
+    mon.set_inputs(_state("Rabbits", 1, 1000.0))
+    mon.reset()
+    mon.set_inputs(_state("Deer", 7, 0.0))
+    mon.set_inputs(_state("Rabbits", 3, 0.0))
+    mon.flush()
+    reader = PopulationSpillReader(str(path))
+    assert len(reader) == 2003
+    assert reader.species == ["Rabbits", "Foxes", "Deer"]
+    assert reader.runs == [0, 2001]
+    assert reader.series("Rabbits")[1][-2:].tolist() == [1, 3]
+    t, counts = reader.series("Rabbits", run=0)
+    assert len(t) == 1001 and counts[-1] == 1
+    assert reader.series("Deer", run=1)[1].tolist() == [7]
+    assert reader.series("Rabbits", run=1)[1].tolist() == [3]
+    assert reader.column("species_slot")[-2:].tolist() == [2, 0]
+
+
+def test_visualize_delta_across_ring_wrap(biosim):
+    from src.population_monitor import PopulationMonitor
+
+    mon = PopulationMonitor(max_points=16, min_dt=1.0)
+    cursor = None
+    epoch = None
+    received = {}
+    for step in range(12):
+        for i in range(step * 5, step * 5 + 5):
+            mon.set_inputs(_state("Rabbits", i, float(i)))
+            if i % 3 == 0:
+                mon.set_inputs(_state("Foxes", -i, float(i)))
+        spec = mon.visualize_delta(since=cursor, epoch=epoch)
+        for series in spec["data"]["series"]:
+            received.setdefault(series["name"], []).extend(series["points"])
+        assert spec["delta"]["full"] is (cursor is None)
+        cursor, epoch = spec["delta"]["cursor"], spec["delta"]["epoch"]
+    assert len(received["Rabbits"]) == 60
+    assert received["Rabbits"] == [[float(i), i] for i in range(60)]
+    assert received["Foxes"] == [[float(i), -i] for i in range(0, 60, 3)]
+
+    # A client that fell behind the retained window gets a full snapshot.
+    for i in range(60, 100):
+        mon.set_inputs(_state("Rabbits", i, float(i)))
+    spec = mon.visualize_delta(since=cursor, epoch=epoch)
+    assert spec["delta"]["full"] is True
+
+    mon.reset()
+    mon.set_inputs(_state("Rabbits", 1, 0.0))
+    spec = mon.visualize_delta(since=cursor, epoch=epoch)
+    assert spec["delta"] == {"epoch": 1, "cursor": 0.0, "full": True}
+
+
+def test_pyramid_levels_match_direct_decimation(biosim):
+    import numpy as np
+    from src.population_monitor import _Pyramid
+
+    rng = np.random.default_rng(3)
+    counts = rng.integers(0, 1000, size=1000)
+    pyramid = _Pyramid(capacity=4096)
+    for i, c in enumerate(counts.tolist()):
+        pyramid.push(float(i), c)
+
+    for k, ring in enumerate(pyramid.levels, start=1):
+        size = 2 ** k
+        n = len(counts) // size
+        blocks = counts[: n * size].reshape(n, size)
+        cols = ring.arrays()
+        assert np.array_equal(cols["min"], blocks.min(axis=1))
+        assert np.array_equal(cols["max"], blocks.max(axis=1))
+        assert np.allclose(cols["mean"], blocks.mean(axis=1))
+        assert np.allclose(cols["t"], np.arange(n) * size + (size - 1) / 2)
+
+
+def test_zoomable_visualize_respects_pixel_budget(biosim):
+    from src.population_monitor import PopulationMonitor
+
+    mon = PopulationMonitor(max_points=500, min_dt=1.0)
+    for i in range(20000):
+        mon.set_inputs(_state("Rabbits", i % 250, float(i)))
+
+    # Overview of the whole run comes from a coarse level that still reaches t=0.
+    spec = mon.visualize(pixels=300)
+    series = {s["name"]: s["points"] for s in spec["data"]["series"]}
+    level = spec["data"]["levels"]["Rabbits"]
+    # 2**6-point buckets would need 312 points; 2**7 needs 156.
+    assert level == 7
+    assert len(series["Rabbits"]) == 20000 // 128
+    assert series["Rabbits"][0][0] == 63.5
+    assert series["Rabbits (min)"][0][1] == 0
+    assert series["Rabbits (max)"][0][1] == 127
+
+    # A narrow recent zoom is served at full resolution.
+    spec = mon.visualize(t_start=19900.0, t_end=19999.0, pixels=300)
+    assert spec["data"]["levels"]["Rabbits"] == 0
+    points = spec["data"]["series"][0]["points"]
+    assert points[0] == [19900.0, 19900 % 250] and len(points) == 100
+
+    # Unbounded call keeps returning the raw retained tail.
+    assert len(mon.visualize()["data"]["series"][0]["points"]) == 500
+
+
+def test_lttb_downsampling_caps_points_and_keeps_peaks(biosim):
+    from src.population_monitor import PopulationMonitor
+
+    mon = PopulationMonitor(max_points=50000, max_visual_points=500, min_dt=1.0)
+    for i in range(20000):
+        count = 5000 if i == 12345 else 100 + (i % 50)
+        mon.set_inputs(_state("Rabbits", count, float(i)))
+
+    points = mon.visualize()["data"]["series"][0]["points"]
+    assert len(points) == 500
+    assert points[0] == [0.0, 100] and points[-1] == [19999.0, 149]
+    assert [12345.0, 5000] in points
+    assert [p[0] for p in points] == sorted(p[0] for p in points)
+
+    mon.max_visual_points = 0
+    assert len(mon.visualize()["data"]["series"][0]["points"]) == 20000
+
+
+def test_visual_specs_are_cached_per_generation(biosim):
+    from src.population_monitor import PopulationMonitor
+
+    mon = PopulationMonitor(max_points=100, min_dt=1.0)
+    for i in range(10):
+        mon.set_inputs(_state("Rabbits", 100 + i, float(i)))
+    spec = mon.visualize()
+    assert mon.visualize()["data"] is spec["data"]
+    assert mon.visualize(t_start=2.0)["data"] is not spec["data"]
+    assert mon.visualize(t_start=2.0)["data"] is mon.visualize(t_start=2.0)["data"]
+
+    # Each caller gets its own top-level dict.
+    spec["note"] = "mine"
+    assert "note" not in mon.visualize()
+    delta = mon.visualize_delta()
+    assert "delta" not in mon.visualize() and mon.visualize_delta()["delta"] == delta["delta"]
+
+    # Samples arriving between ticks invalidate the cache too.
+    mon.set_inputs(_state("Rabbits", 500, 10.0))
+    fresh = mon.visualize()
+    assert fresh["data"] is not spec["data"]
+    assert fresh["data"]["series"][0]["points"][-1] == [10.0, 500]
+    mon.advance_to(11.0)
+    assert mon.visualize()["data"] is not fresh["data"]
+
+
+def test_payloads_with_and_without_species_id_share_slots(biosim):
+    import zlib
+
+    from biosim.signals import BioSignal, SignalMetadata
+    from src.population_monitor import PopulationMonitor
+
+    def with_id(species, count, t):
+        value = {"species": species, "count": count, "t": t, "species_id": zlib.crc32(species.encode("utf-8"))}
+        return {
+            "population_state": BioSignal(
+                source="pop",
+                name="population_state",
+                value=value,
+                time=t,
+                metadata=SignalMetadata(description="test", kind="state"),
+            )
+        }
+
+    mon = PopulationMonitor(max_points=100, min_dt=1.0)
+    mon.set_inputs(_state("Rabbits", 10, 0.0))
+    mon.set_inputs(with_id("Rabbits", 11, 1.0))
+    mon.set_inputs(with_id("Foxes", 3, 1.0))
+    mon.set_inputs(_state("Foxes", 4, 2.0))
+    mon.advance_to(2.0)
+
+    assert mon._names == ["Rabbits", "Foxes"]
+    assert mon.get_outputs()["population_summary"].value["latest_counts"] == {"Rabbits": 11, "Foxes": 4}
+
+
+def test_perf_counters_count_each_call_once(biosim, tmp_path):
+    import copy
+
+    from src.population_monitor import PopulationMonitor
+
+    mon = PopulationMonitor(perf=True, min_dt=1.0)
+    assert mon.outputs() == {"population_summary", "perf"}
+    for i in range(10):
+        mon.set_inputs(_state("Rabbits", 100 + i, float(i)))
+        mon.advance_to(float(i + 1))
+    mon.visualize()
+    perf = mon.get_state()["perf"]
+    assert perf["calls"] == {"set_inputs": 10, "advance_to": 10, "visualize": 1}
+    assert perf["history_len"] == 10
+    assert "rng_draws" not in perf
+    assert mon.get_outputs()["perf"].value["calls"]["advance_to"] == 9
+
+    # Counters live on the module, so a deep copy times its own calls only.
+    clone = copy.deepcopy(mon)
+    clone.set_inputs(_state("Rabbits", 200, 10.0))
+    clone.advance_to(11.0)
+    assert clone.get_state()["perf"]["calls"]["advance_to"] == 11
+    assert mon.get_state()["perf"]["calls"]["advance_to"] == 10
+
+    # Chunk flushes must not count the timed methods twice.
+    spilled = PopulationMonitor(perf=True, spill_path=str(tmp_path / "rec"), spill_chunk=1, min_dt=1.0)
+    for i in range(2000):
+        spilled.set_inputs(_state("Rabbits", i, float(i)))
+        spilled.advance_to(float(i + 1))
+    spilled.close()
+    assert spilled.get_state()["perf"]["calls"]["set_inputs"] == 2000
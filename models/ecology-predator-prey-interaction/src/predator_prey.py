@@ -5,7 +5,9 @@
 from __future__ import annotations
 
 import random
-from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+import numpy as np
 
 if TYPE_CHECKING:  # pragma: no cover - typing only
     from biosim import BioWorld
@@ -14,6 +16,40 @@ if TYPE_CHECKING:  # pragma: no cover - typing only
 from biosim import BioModule
 from biosim.signals import BioSignal, SignalMetadata
 
+from .ecology_support import (
+    CountingRandom,
+    EMPTY_OUTPUTS,
+    History,
+    PerfCounters,
+    ReadOnlyOutputs,
+    downsample_points,
+    memoized_visual,
+    population_state,
+    timed,
+    with_perf,
+)
+
+
+_PREDATION_META = SignalMetadata(units=None, description="Predation events", kind="event")
+_FOOD_GAINED_META = SignalMetadata(units=None, description="Food gained", kind="event")
+_COMPETITION_META = SignalMetadata(units=None, description="Competition pressures", kind="state")
+_MUTUALISM_META = SignalMetadata(units=None, description="Mutualism benefits", kind="event")
+
+
+_PREDATION_COLUMNS = {
+    "t": np.float64,
+    "kills": np.int64,
+    "food_gained": np.float64,
+    "prey_count": np.int64,
+    "predator_count": np.int64,
+}
+
+_COMPETITION_COLUMNS = {
+    "t": np.float64,
+    "total_population": np.int64,
+    "n_species": np.int64,
+}
+
 
 class PredatorPreyInteraction(BioModule):
     """Models predator-prey interactions using Lotka-Volterra-style dynamics.
@@ -27,8 +63,17 @@ class PredatorPreyInteraction(BioModule):
         satiation_factor: Predators hunt less when well-fed (0 = no effect, 1 = strong effect).
         min_prey_for_hunt: Minimum prey count before hunting is possible.
         seed: Random seed for reproducibility.
+        history: Per-tick history retention: ``"full"``, ``"decimate:N"``,
+            ``"ring:N"`` or ``"none"``.
+        max_visual_points: Points per plotted series above which LTTB
+            downsampling applies (0 plots every point).
+        perf: Time ``set_inputs``/``advance_to``/``visualize``, count RNG draws
+            and report history size as a `perf` output and in
+            ``get_state()`` (off by default).
     """
 
+    _visual_params: Tuple[str, ...] = ("max_visual_points",)
+
     def __init__(
         self,
         predation_rate: float = 0.001,
@@ -36,50 +81,72 @@ class PredatorPreyInteraction(BioModule):
         satiation_factor: float = 0.0,
         min_prey_for_hunt: int = 0,
         seed: Optional[int] = None,
+        history: str = "full",
+        max_visual_points: int = 2000,
+        perf: bool = False,
         min_dt: float = 1.0,
     ) -> None:
         self.min_dt = min_dt
+        self.perf = bool(perf)
+        self._perf: Optional[PerfCounters] = PerfCounters(count_rng=True) if perf else None
         self.predation_rate = predation_rate
         self.conversion_efficiency = conversion_efficiency
         self.satiation_factor = satiation_factor
         self.min_prey_for_hunt = min_prey_for_hunt
         self.seed = seed
-        self._rng = random.Random(seed)
+        self._rng = self._new_rng()
 
         self._prey_count: int = 0
         self._prey_species: str = "Prey"
         self._predator_count: int = 0
         self._predator_species: str = "Predator"
         self._time: float = 0.0
-        self._history: List[Dict[str, Any]] = []
-        self._outputs: Dict[str, BioSignal] = {}
+        self.history = history
+        self.max_visual_points = max_visual_points
+        self._history = History(_PREDATION_COLUMNS, history)
+        self._epoch = 0  # bumped by reset() to invalidate delta cursors
+        self._generation = 0
+        self._visual_cache: Dict[str, Tuple[Any, Any]] = {}
+        self._outputs: Dict[str, BioSignal] = EMPTY_OUTPUTS
 
     def inputs(self) -> Set[str]:
         return {"prey_state", "predator_state"}
 
     def outputs(self) -> Set[str]:
-        return {"predation", "food_gained"}
+        return {"predation", "food_gained", "perf"} if self.perf else {"predation", "food_gained"}
 
     def reset(self) -> None:
         """Reset interaction state."""
-        self._rng = random.Random(self.seed)
+        self._generation += 1
+        self._rng = self._new_rng()
         self._prey_count = 0
         self._predator_count = 0
         self._time = 0.0
-        self._history = []
-        self._outputs = {}
+        self._history = History(_PREDATION_COLUMNS, self.history)
+        self._epoch += 1
+        self._outputs = EMPTY_OUTPUTS
 
+    def _new_rng(self) -> random.Random:
+        if self._perf is None:
+            return random.Random(self.seed)
+        return CountingRandom(self.seed, self._perf)
+
+    @timed
     def set_inputs(self, signals: Dict[str, BioSignal]) -> None:
         prey = signals.get("prey_state")
-        if prey is not None and isinstance(prey.value, dict):
-            self._prey_count = int(prey.value.get("count", 0))
-            self._prey_species = str(prey.value.get("species", "Prey"))
+        state = None if prey is None else population_state(prey.value, prey.time, species="Prey")
+        if state is not None:
+            self._prey_count = state.count
+            self._prey_species = state.species
         predator = signals.get("predator_state")
-        if predator is not None and isinstance(predator.value, dict):
-            self._predator_count = int(predator.value.get("count", 0))
-            self._predator_species = str(predator.value.get("species", "Predator"))
+        state = None if predator is None else population_state(predator.value, predator.time, species="Predator")
+        if state is not None:
+            self._predator_count = state.count
+            self._predator_species = state.species
 
+    @timed
     def advance_to(self, t: float) -> None:
+        self._generation += 1
         dt = t - self._time if t > self._time else self.min_dt
         self._time = t
 
@@ -126,16 +193,16 @@ class PredatorPreyInteraction(BioModule):
             food_gained = kills * self.conversion_efficiency
 
         # Record history
-        self._history.append({
-            "t": t,
-            "kills": kills,
-            "food_gained": food_gained,
-            "prey_count": self._prey_count,
-            "predator_count": self._predator_count,
-        })
+        self._history.append(
+            t=t,
+            kills=kills,
+            food_gained=food_gained,
+            prey_count=self._prey_count,
+            predator_count=self._predator_count,
+        )
 
         source_name = getattr(self, "_world_name", self.__class__.__name__)
-        self._outputs = {
+        self._outputs = ReadOnlyOutputs({
             "predation": BioSignal(
                 source=source_name,
                 name="predation",
@@ -145,36 +212,70 @@ class PredatorPreyInteraction(BioModule):
                     "t": t,
                 },
                 time=t,
-                metadata=SignalMetadata(units=None, description="Predation events", kind="event"),
+                metadata=_PREDATION_META,
             ),
             "food_gained": BioSignal(
                 source=source_name,
                 name="food_gained",
                 value=food_gained,
                 time=t,
-                metadata=SignalMetadata(units=None, description="Food gained", kind="event"),
+                metadata=_FOOD_GAINED_META,
             ),
-        }
+        })
+        if self._perf is not None:
+            self._outputs = with_perf(self._outputs, source_name, t, self._perf_snapshot())
 
     def get_outputs(self) -> Dict[str, BioSignal]:
-        return dict(self._outputs)
+        return self._outputs
 
+    def _perf_snapshot(self) -> Dict[str, Any]:
+        return self._perf.snapshot(len(self._history), self._history.nbytes)  # type: ignore[union-attr]
+
+    def get_state(self) -> Dict[str, Any]:
+        state: Dict[str, Any] = {
+            "time": self._time,
+            "prey_count": self._prey_count,
+            "predator_count": self._predator_count,
+        }
+        if self._perf is not None:
+            state["perf"] = self._perf_snapshot()
+        return state
+
+    @timed
+    @memoized_visual
     def visualize(self) -> Optional["VisualSpec"]:
         """Generate visualization of predation events over time."""
-        if not self._history:
+        if not len(self._history):
             return None
+        return self._timeseries(self._history.columns())
+
+    @memoized_visual
+    def visualize_delta(self, since: Optional[float] = None, epoch: Optional[int] = None) -> Optional["VisualSpec"]:
+        """Points recorded after ``since``; a full snapshot when the cursor is stale.
+
+        Pass back ``delta["cursor"]`` and ``delta["epoch"]`` from the previous
+        result. A missing cursor, an epoch from before the last `reset`, or a
+        cursor older than a ``ring:N`` history returns every retained point
+        with ``delta["full"]`` set.
+        """
+        if not len(self._history):
+            return None
+        full = since is None or epoch != self._epoch or not self._history.covers(since)
+        delta = {"epoch": self._epoch, "cursor": self._history.last("t"), "full": full}
+        return {**self._timeseries(self._history.columns(None if full else since)), "delta": delta}
 
+    def _timeseries(self, cols: Dict[str, np.ndarray]) -> "VisualSpec":
         return {
             "render": "timeseries",
             "data": {
                 "series": [
                     {
                         "name": "Kills per Step",
-                        "points": [[h["t"], h["kills"]] for h in self._history],
+                        "points": downsample_points(cols["t"], cols["kills"], self.max_visual_points),
                     },
                     {
                         "name": "Food Gained",
-                        "points": [[h["t"], h["food_gained"]] for h in self._history],
+                        "points": downsample_points(cols["t"], cols["food_gained"], self.max_visual_points),
                     },
                 ],
                 "title": f"Predation: {self._predator_species} \u2192 {self._prey_species}",
@@ -191,22 +292,37 @@ class CompetitionInteraction(BioModule):
     Parameters:
         competition_coefficient: How strongly competitors affect each other (0-1).
         resource_type: Type of resource competed for ("food", "space", "water").
+        history: Per-tick history retention: ``"full"``, ``"decimate:N"``,
+            ``"ring:N"`` or ``"none"``.
+        max_visual_points: Points per plotted series above which LTTB
+            downsampling applies (0 plots every point).
     """
 
+    _visual_params: Tuple[str, ...] = ("max_visual_points",)
+
     def __init__(
         self,
         competition_coefficient: float = 0.5,
         resource_type: str = "food",
+        history: str = "full",
+        max_visual_points: int = 2000,
         min_dt: float = 1.0,
     ) -> None:
         self.min_dt = min_dt
         self.competition_coefficient = competition_coefficient
         self.resource_type = resource_type
 
-        self._populations: Dict[str, int] = {}  # species -> count
+        # Latest count per species slot; _species_index maps names to slots.
+        self._names: List[str] = []
+        self._species_index: Dict[str, int] = {}
+        self._counts: List[int] = []
         self._time: float = 0.0
-        self._history: List[Dict[str, Any]] = []
-        self._outputs: Dict[str, BioSignal] = {}
+        self.history = history
+        self.max_visual_points = max_visual_points
+        self._history = History(_COMPETITION_COLUMNS, history)
+        self._generation = 0
+        self._visual_cache: Dict[str, Tuple[Any, Any]] = {}
+        self._outputs: Dict[str, BioSignal] = EMPTY_OUTPUTS
 
     def inputs(self) -> Set[str]:
         return {"population_state"}
@@ -216,30 +332,40 @@ class CompetitionInteraction(BioModule):
 
     def reset(self) -> None:
         """Reset competition state."""
-        self._populations = {}
+        self._generation += 1
+        self._names = []
+        self._species_index = {}
+        self._counts = []
         self._time = 0.0
-        self._history = []
-        self._outputs = {}
+        self._history = History(_COMPETITION_COLUMNS, self.history)
+        self._outputs = EMPTY_OUTPUTS
 
     def set_inputs(self, signals: Dict[str, BioSignal]) -> None:
         signal = signals.get("population_state")
-        if signal is None or not isinstance(signal.value, dict):
+        if signal is None:
             return
-        species = str(signal.value.get("species", "Unknown"))
-        count = int(signal.value.get("count", 0))
-        self._populations[species] = count
+        state = population_state(signal.value, signal.time)
+        if state is None:
+            return
+        slot = self._species_index.get(state.species, -1)
+        if slot < 0:
+            slot = self._species_index[state.species] = len(self._names)
+            self._names.append(state.species)
+            self._counts.append(0)
+        self._counts[slot] = state.count
 
     def advance_to(self, t: float) -> None:
+        self._generation += 1
         self._time = t
 
-        if len(self._populations) < 2:
+        if len(self._counts) < 2:
             return  # Need at least 2 species to compete
 
-        total_pop = sum(self._populations.values())
+        total_pop = sum(self._counts)
 
         # Calculate competition pressure for each species
         entries: List[Dict[str, Any]] = []
-        for species, count in self._populations.items():
+        for species, count in zip(self._names, self._counts):
             if count <= 0:
                 continue
 
@@ -261,30 +387,28 @@ class CompetitionInteraction(BioModule):
             )
 
         # Record history
-        self._history.append({
-            "t": t,
-            "total_population": total_pop,
-            "populations": dict(self._populations),
-        })
+        self._history.append(t=t, total_population=total_pop, n_species=len(self._counts))
 
         source_name = getattr(self, "_world_name", self.__class__.__name__)
-        self._outputs = {
+        self._outputs = ReadOnlyOutputs({
             "competition": BioSignal(
                 source=source_name,
                 name="competition",
                 value=entries,
                 time=t,
-                metadata=SignalMetadata(units=None, description="Competition pressures", kind="state"),
+                metadata=_COMPETITION_META,
             )
-        }
+        })
 
     def get_outputs(self) -> Dict[str, BioSignal]:
-        return dict(self._outputs)
+        return self._outputs
 
+    @memoized_visual
     def visualize(self) -> Optional["VisualSpec"]:
         """Visualize total competing population over time."""
-        if not self._history:
+        if not len(self._history):
             return None
+        cols = self._history.columns()
 
         return {
             "render": "timeseries",
@@ -292,7 +416,7 @@ class CompetitionInteraction(BioModule):
                 "series": [
                     {
                         "name": "Total Competing Pop",
-                        "points": [[h["t"], h["total_population"]] for h in self._history],
+                        "points": downsample_points(cols["t"], cols["total_population"], self.max_visual_points),
                     },
                 ],
                 "title": f"Competition for {self.resource_type}",
@@ -311,6 +435,8 @@ class MutualismInteraction(BioModule):
         benefit_type: Type of benefit ("food", "protection", "reproduction").
     """
 
+    _visual_params: Tuple[str, ...] = ()
+
     def __init__(
         self,
         benefit_rate: float = 0.1,
@@ -326,7 +452,9 @@ class MutualismInteraction(BioModule):
         self._species_b_count: int = 0
         self._species_b_name: str = "Species B"
         self._time: float = 0.0
-        self._outputs: Dict[str, BioSignal] = {}
+        self._generation = 0
+        self._visual_cache: Dict[str, Tuple[Any, Any]] = {}
+        self._outputs: Dict[str, BioSignal] = EMPTY_OUTPUTS
 
     def inputs(self) -> Set[str]:
         return {"species_a_state", "species_b_state"}
@@ -335,22 +463,26 @@ class MutualismInteraction(BioModule):
         return {"mutualism_benefit"}
 
     def reset(self) -> None:
+        self._generation += 1
         self._species_a_count = 0
         self._species_b_count = 0
         self._time = 0.0
-        self._outputs = {}
+        self._outputs = EMPTY_OUTPUTS
 
     def set_inputs(self, signals: Dict[str, BioSignal]) -> None:
-        a_state = signals.get("species_a_state")
-        if a_state is not None and isinstance(a_state.value, dict):
-            self._species_a_count = int(a_state.value.get("count", 0))
-            self._species_a_name = str(a_state.value.get("species", "Species A"))
-        b_state = signals.get("species_b_state")
-        if b_state is not None and isinstance(b_state.value, dict):
-            self._species_b_count = int(b_state.value.get("count", 0))
-            self._species_b_name = str(b_state.value.get("species", "Species B"))
+        a_signal = signals.get("species_a_state")
+        state = None if a_signal is None else population_state(a_signal.value, a_signal.time, species="Species A")
+        if state is not None:
+            self._species_a_count = state.count
+            self._species_a_name = state.species
+        b_signal = signals.get("species_b_state")
+        state = None if b_signal is None else population_state(b_signal.value, b_signal.time, species="Species B")
+        if state is not None:
+            self._species_b_count = state.count
+            self._species_b_name = state.species
 
     def advance_to(self, t: float) -> None:
+        self._generation += 1
         self._time = t
 
         if self._species_a_count > 0 and self._species_b_count > 0:
@@ -374,18 +506,19 @@ class MutualismInteraction(BioModule):
                 },
             ]
             source_name = getattr(self, "_world_name", self.__class__.__name__)
-            self._outputs = {
+            self._outputs = ReadOnlyOutputs({
                 "mutualism_benefit": BioSignal(
                     source=source_name,
                     name="mutualism_benefit",
                     value=entries,
                     time=t,
-                    metadata=SignalMetadata(units=None, description="Mutualism benefits", kind="event"),
+                    metadata=_MUTUALISM_META,
                 )
-            }
+            })
 
     def get_outputs(self) -> Dict[str, BioSignal]:
-        return dict(self._outputs)
+        return self._outputs
 
+    @memoized_visual
     def visualize(self) -> Optional["VisualSpec"]:
         return None  # Mutualism effects are reflected in population dynamics
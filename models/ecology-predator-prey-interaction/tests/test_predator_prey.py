@@ -30,3 +30,53 @@ def test_predation_emits_events(biosim):
     assert "predation" in out
     assert out["predation"].value["kills"] > 0
 
+
+
+def test_competition_history_is_columnar(biosim):
+    from biosim.signals import BioSignal, SignalMetadata
+    from src.predator_prey import CompetitionInteraction
+
+    mod = CompetitionInteraction(history="ring:5", min_dt=1.0)
+    for i in range(12):
+        for species, count in (("Rabbits", 100 + i), ("Deer", 50)):
+            mod.set_inputs(
+                {
+                    "population_state": BioSignal(
+                        source=species,
+                        name="population_state",
+                        value={"species": species, "count": count, "t": float(i)},
+                        time=float(i),
+                        metadata=SignalMetadata(description="test", kind="state"),
+                    )
+                }
+            )
+        mod.advance_to(float(i))
+
+    points = mod.visualize()["data"]["series"][0]["points"]
+    assert points == [[float(i), 150 + i] for i in range(7, 12)]
+    assert mod._history.columns()["n_species"].tolist() == [2] * 5
+
+
+def test_competition_keeps_species_with_colliding_ids_apart(biosim):
+    import zlib
+
+    from biosim.signals import BioSignal, SignalMetadata
+    from src.predator_prey import CompetitionInteraction
+
+    a, b = "sp29685295", "sp32060020"
+    assert zlib.crc32(a.encode()) == zlib.crc32(b.encode())
+    mod = CompetitionInteraction(min_dt=1.0)
+    for species, count in ((a, 100), (b, 50)):
+        mod.set_inputs(
+            {
+                "population_state": BioSignal(
+                    source=species,
+                    name="population_state",
+                    value={"species": species, "count": count, "t": 0.0},
+                    time=0.0,
+                    metadata=SignalMetadata(description="test", kind="state"),
+                )
+            }
+        )
+    assert mod._names == [a, b]
+    assert mod._counts == [100, 50]
@@ -0,0 +1,195 @@
+# SPDX-FileCopyrightText: 2025-present Demi <bjaiye1@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Predator-prey lag monitor: streaming cross-correlation over a bounded lag range."""
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Set, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from biosim import BioWorld
+    from biosim.visuals import VisualSpec
+
+from biosim import BioModule
+from biosim.signals import BioSignal, SignalMetadata
+
+from .ecology_support import EMPTY_OUTPUTS, ReadOnlyOutputs, memoized_visual, population_state
+
+
+_LAG_CORRELATION_META = SignalMetadata(description="Prey-predator lag correlation", kind="state")
+
+
+class PredatorPreyLagMonitor(BioModule):
+    """Estimates the phase lag between prey and predator cycles online.
+
+    Receives prey and predator population states, samples both once per
+    `advance_to`, and maintains running lagged cross-products
+    ``sum(prey[t - k] * predator[t])`` and ``sum(predator[t - k] * prey[t])``
+    for ``k = 0..max_lag`` from circular buffers of the last ``max_lag + 1``
+    samples. Correlations use the running means and variances of both
+    series, so each tick costs O(max_lag) and memory does not grow.
+
+    A positive lag means predator peaks follow prey peaks.
+
+    Parameters:
+        max_lag: Largest lag, in samples, considered in either direction.
+    """
+
+    def __init__(self, max_lag: int = 50, min_dt: float = 1.0) -> None:
+        if max_lag < 1:
+            raise ValueError("max_lag must be at least 1")
+        self.min_dt = min_dt
+        self.max_lag = int(max_lag)
+        self._lags = np.arange(self.max_lag + 1)
+
+        self._prey_count: int = 0
+        self._prey_species: str = "Prey"
+        self._predator_count: int = 0
+        self._predator_species: str = "Predator"
+        self._seen_prey = False
+        self._seen_predator = False
+        self._init_stats()
+        self._generation = 0
+        self._visual_cache: Dict[str, Tuple[Any, Any]] = {}
+        self._outputs: Dict[str, BioSignal] = EMPTY_OUTPUTS
+
+    def _init_stats(self) -> None:
+        size = self.max_lag + 1
+        self._prey_buf = np.zeros(size, dtype=np.float64)
+        self._predator_buf = np.zeros(size, dtype=np.float64)
+        # _lead_prey[k]: sum prey[t-k] * predator[t]; _lead_predator[k]: sum predator[t-k] * prey[t]
+        self._lead_prey = np.zeros(size, dtype=np.float64)
+        self._lead_predator = np.zeros(size, dtype=np.float64)
+        self._n = 0
+        self._sum_x = 0.0
+        self._sum_y = 0.0
+        self._sum_xx = 0.0
+        self._sum_yy = 0.0
+        self._t_first: Optional[float] = None
+        self._dt: float = self.min_dt
+
+    def inputs(self) -> Set[str]:
+        return {"prey_state", "predator_state"}
+
+    def outputs(self) -> Set[str]:
+        return {"lag_correlation"}
+
+    def reset(self) -> None:
+        self._generation += 1
+        self._prey_count = 0
+        self._predator_count = 0
+        self._seen_prey = False
+        self._seen_predator = False
+        self._init_stats()
+        self._outputs = EMPTY_OUTPUTS
+
+    def set_inputs(self, signals: Dict[str, BioSignal]) -> None:
+        prey = signals.get("prey_state")
+        state = None if prey is None else population_state(prey.value, prey.time, species="Prey")
+        if state is not None:
+            self._prey_count = state.count
+            self._prey_species = state.species
+            self._seen_prey = True
+        predator = signals.get("predator_state")
+        state = None if predator is None else population_state(predator.value, predator.time, species="Predator")
+        if state is not None:
+            self._predator_count = state.count
+            self._predator_species = state.species
+            self._seen_predator = True
+
+    def _push(self, t: float, x: float, y: float) -> None:
+        i = self._n
+        size = self.max_lag + 1
+        if i == 0:
+            self._t_first = t
+        elif i == 1 and self._t_first is not None and t > self._t_first:
+            self._dt = t - self._t_first
+
+        self._prey_buf[i % size] = x
+        self._predator_buf[i % size] = y
+        m = min(i, self.max_lag) + 1
+        slots = (i - self._lags[:m]) % size
+        self._lead_prey[:m] += self._prey_buf[slots] * y
+        self._lead_predator[:m] += self._predator_buf[slots] * x
+
+        self._n += 1
+        self._sum_x += x
+        self._sum_y += y
+        self._sum_xx += x * x
+        self._sum_yy += y * y
+
+    def correlations(self) -> Optional[np.ndarray]:
+        """Correlation for lags ``-max_lag..max_lag`` (NaN where undefined)."""
+        n = self._n
+        if n < 2:
+            return None
+        mx, my = self._sum_x / n, self._sum_y / n
+        sx = max(0.0, self._sum_xx / n - mx * mx) ** 0.5
+        sy = max(0.0, self._sum_yy / n - my * my) ** 0.5
+        if sx == 0.0 or sy == 0.0:
+            return None
+
+        pairs = (n - self._lags).astype(np.float64)
+        valid = pairs >= 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pos = np.where(valid, (self._lead_prey / pairs - mx * my) / (sx * sy), np.nan)
+            neg = np.where(valid, (self._lead_predator / pairs - mx * my) / (sx * sy), np.nan)
+        # Index j maps to lag j - max_lag: predator leading (negative) ... prey leading (positive).
+        return np.concatenate((neg[:0:-1], pos))
+
+    def advance_to(self, t: float) -> None:
+        self._generation += 1
+        if self._seen_prey and self._seen_predator:
+            self._push(float(t), float(self._prey_count), float(self._predator_count))
+
+        best_lag: Optional[int] = None
+        best_corr: Optional[float] = None
+        corr = self.correlations()
+        if corr is not None and not np.all(np.isnan(corr)):
+            j = int(np.nanargmax(corr))
+            best_lag = j - self.max_lag
+            best_corr = float(corr[j])
+
+        source = getattr(self, "_world_name", self.__class__.__name__)
+        self._outputs = ReadOnlyOutputs({
+            "lag_correlation": BioSignal(
+                source=source,
+                name="lag_correlation",
+                value={
+                    "t": float(t),
+                    "prey": self._prey_species,
+                    "predator": self._predator_species,
+                    "best_lag": best_lag,
+                    "best_lag_time": None if best_lag is None else best_lag * self._dt,
+                    "best_correlation": best_corr,
+                    "n_samples": int(self._n),
+                },
+                time=float(t),
+                metadata=_LAG_CORRELATION_META,
+            )
+        })
+
+    def get_outputs(self) -> Dict[str, BioSignal]:
+        return self._outputs
+
+    @memoized_visual
+    def visualize(self) -> Optional["VisualSpec"]:
+        """Generate the cross-correlation curve over lag time."""
+        corr = self.correlations()
+        if corr is None:
+            return None
+
+        points = [
+            [float((j - self.max_lag) * self._dt), float(r)]
+            for j, r in enumerate(corr)
+            if not np.isnan(r)
+        ]
+        return {
+            "render": "timeseries",
+            "data": {
+                "series": [{"name": "Cross-correlation", "points": points}],
+                "title": f"Lag: {self._prey_species} \u2192 {self._predator_species}",
+            },
+        }
@@ -0,0 +1,238 @@
+# SPDX-FileCopyrightText: 2025-present Demi <bjaiye1@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Spatial diversity metrics: alpha/beta/gamma diversity and turnover across patches."""
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Set, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from biosim import BioWorld
+    from biosim.visuals import VisualSpec
+
+from biosim import BioModule
+from biosim.signals import BioSignal, SignalMetadata
+
+from .ecology_support import EMPTY_OUTPUTS, ReadOnlyOutputs, memoized_visual
+
+
+_SPATIAL_METRICS_META = SignalMetadata(description="Spatial diversity and turnover", kind="state")
+
+
+# Upper bound on temporaries (patch rows x patches x species) per Bray-Curtis block.
+_BLOCK_ELEMENTS = 1 << 20
+
+
+def _shannon_rows(x: np.ndarray) -> np.ndarray:
+    """Shannon index of each row of a non-negative abundance matrix."""
+    totals = x.sum(axis=1, keepdims=True)
+    p = np.divide(x, totals, out=np.zeros_like(x), where=totals > 0)
+    logs = np.log(p, out=np.zeros_like(p), where=p > 0)
+    return -(p * logs).sum(axis=1)
+
+
+def _pairwise_exact(x: np.ndarray, present: np.ndarray) -> Tuple[float, float, int]:
+    """Mean Bray-Curtis and Jaccard dissimilarity over all patch pairs.
+
+    Jaccard uses an incidence matrix product; Bray-Curtis is evaluated in row
+    blocks so temporaries stay below ``_BLOCK_ELEMENTS``.
+    """
+    n_patches, n_species = x.shape
+    n_pairs = n_patches * (n_patches - 1) // 2
+
+    b = present.astype(np.float64)
+    shared = b @ b.T
+    richness = b.sum(axis=1)
+    union = richness[:, None] + richness[None, :] - shared
+    jaccard = 1.0 - np.divide(shared, union, out=np.ones_like(shared), where=union > 0)
+    upper = np.triu_indices(n_patches, k=1)
+    jaccard_sum = float(jaccard[upper].sum())
+
+    totals = x.sum(axis=1)
+    rows = max(1, _BLOCK_ELEMENTS // max(1, n_patches * n_species))
+    bray_sum = 0.0
+    for start in range(0, n_patches - 1, rows):
+        stop = min(start + rows, n_patches)
+        block = x[start:stop]
+        num = np.abs(block[:, None, :] - x[None, :, :]).sum(axis=2)
+        den = totals[start:stop, None] + totals[None, :]
+        bc = np.divide(num, den, out=np.zeros_like(num), where=den > 0)
+        # Keep only pairs (i, j) with j > i.
+        cols = np.arange(n_patches)[None, :]
+        mask = cols > np.arange(start, stop)[:, None]
+        bray_sum += float(bc[mask].sum())
+
+    return bray_sum / n_pairs, jaccard_sum / n_pairs, n_pairs
+
+
+def _pairwise_sampled(
+    x: np.ndarray, present: np.ndarray, n_samples: int, rng: np.random.Generator
+) -> Tuple[float, float, int]:
+    """Monte Carlo estimate of mean Bray-Curtis and Jaccard over random patch pairs."""
+    n_patches = x.shape[0]
+    i = rng.integers(0, n_patches, size=n_samples)
+    j = (i + rng.integers(1, n_patches, size=n_samples)) % n_patches
+
+    xi, xj = x[i], x[j]
+    num = np.abs(xi - xj).sum(axis=1)
+    den = xi.sum(axis=1) + xj.sum(axis=1)
+    bray = np.divide(num, den, out=np.zeros_like(num), where=den > 0)
+
+    bi, bj = present[i], present[j]
+    shared = (bi & bj).sum(axis=1).astype(np.float64)
+    union = (bi | bj).sum(axis=1).astype(np.float64)
+    jaccard = 1.0 - np.divide(shared, union, out=np.ones_like(shared), where=union > 0)
+
+    return float(bray.mean()), float(jaccard.mean()), n_samples
+
+
+class SpatialDiversityMetrics(BioModule):
+    """Alpha, beta and gamma diversity plus pairwise turnover across patches.
+
+    Receives a `patch_abundance` signal holding a patches x species abundance
+    matrix (a nested list/array, or a dict with an ``"abundance"`` matrix) and
+    publishes a `spatial_metrics` signal each tick:
+
+    - Richness partition: mean patch richness (alpha), pooled richness
+      (gamma) and Whittaker beta (gamma / alpha)
+    - Shannon partition: effective numbers exp(H) for mean patch and pooled
+      abundances, and their ratio (multiplicative beta)
+    - Mean pairwise Bray-Curtis and Jaccard dissimilarity
+
+    Pairwise turnover is exact while the number of patch pairs is at most
+    ``max_pairs``; beyond that, ``max_pairs`` random pairs are sampled so the
+    cost stays O(max_pairs * species).
+
+    Parameters:
+        max_pairs: Largest number of patch pairs evaluated per tick.
+        seed: Random seed for pair sampling.
+    """
+
+    def __init__(
+        self,
+        max_pairs: int = 20000,
+        seed: Optional[int] = None,
+        min_dt: float = 1.0,
+    ) -> None:
+        self.min_dt = min_dt
+        self.max_pairs = max_pairs
+        self.seed = seed
+        self._rng = np.random.default_rng(seed)
+        self._abundance: Optional[np.ndarray] = None
+        self._latest: Dict[str, Any] = {}
+        self._generation = 0
+        self._visual_cache: Dict[str, Tuple[Any, Any]] = {}
+        self._outputs: Dict[str, BioSignal] = EMPTY_OUTPUTS
+
+    def inputs(self) -> Set[str]:
+        return {"patch_abundance"}
+
+    def outputs(self) -> Set[str]:
+        return {"spatial_metrics"}
+
+    def reset(self) -> None:
+        self._generation += 1
+        self._rng = np.random.default_rng(self.seed)
+        self._abundance = None
+        self._latest = {}
+        self._outputs = EMPTY_OUTPUTS
+
+    def set_inputs(self, signals: Dict[str, BioSignal]) -> None:
+        signal = signals.get("patch_abundance")
+        if signal is None:
+            return
+        value = signal.value
+        if isinstance(value, dict):
+            value = value.get("abundance")
+        if value is None:
+            return
+        matrix = np.asarray(value, dtype=np.float64)
+        if matrix.ndim != 2:
+            return
+        self._abundance = np.clip(matrix, 0.0, None)
+
+    def compute(self, abundance: np.ndarray) -> Dict[str, Any]:
+        """Diversity partition and turnover summary for one abundance matrix."""
+        x = np.asarray(abundance, dtype=np.float64)
+        n_patches, n_species = x.shape
+        present = x > 0
+
+        alpha_richness = float(present.sum(axis=1).mean()) if n_patches else 0.0
+        gamma_richness = int(present.any(axis=0).sum()) if n_patches else 0
+        beta_whittaker = gamma_richness / alpha_richness if alpha_richness > 0 else 0.0
+
+        alpha_shannon = float(np.exp(_shannon_rows(x).mean())) if n_patches else 0.0
+        gamma_shannon = float(np.exp(_shannon_rows(x.sum(axis=0, keepdims=True))[0])) if n_patches else 0.0
+        beta_shannon = gamma_shannon / alpha_shannon if alpha_shannon > 0 else 0.0
+
+        n_pairs = n_patches * (n_patches - 1) // 2
+        sampled = n_pairs > self.max_pairs
+        if n_pairs == 0:
+            bray, jaccard, evaluated = 0.0, 0.0, 0
+        elif sampled:
+            bray, jaccard, evaluated = _pairwise_sampled(x, present, self.max_pairs, self._rng)
+        else:
+            bray, jaccard, evaluated = _pairwise_exact(x, present)
+
+        return {
+            "n_patches": int(n_patches),
+            "n_species": int(n_species),
+            "alpha_richness": alpha_richness,
+            "gamma_richness": gamma_richness,
+            "beta_whittaker": beta_whittaker,
+            "alpha_shannon": alpha_shannon,
+            "gamma_shannon": gamma_shannon,
+            "beta_shannon": beta_shannon,
+            "mean_bray_curtis": bray,
+            "mean_jaccard": jaccard,
+            "pairs_evaluated": int(evaluated),
+            "pairs_sampled": bool(sampled),
+        }
+
+    def advance_to(self, t: float) -> None:
+        self._generation += 1
+        if self._abundance is not None:
+            self._latest = self.compute(self._abundance)
+
+        source = getattr(self, "_world_name", self.__class__.__name__)
+        self._outputs = ReadOnlyOutputs({
+            "spatial_metrics": BioSignal(
+                source=source,
+                name="spatial_metrics",
+                value={"t": float(t), **self._latest},
+                time=float(t),
+                metadata=_SPATIAL_METRICS_META,
+            )
+        })
+
+    def get_outputs(self) -> Dict[str, BioSignal]:
+        return self._outputs
+
+    @memoized_visual
+    def visualize(self) -> Optional["VisualSpec"]:
+        """Generate spatial diversity table."""
+        if not self._latest:
+            return None
+
+        m = self._latest
+        rows = [
+            ["Patches", str(m["n_patches"])],
+            ["Alpha Richness (mean per patch)", f"{m['alpha_richness']:.3f}"],
+            ["Gamma Richness", str(m["gamma_richness"])],
+            ["Whittaker Beta", f"{m['beta_whittaker']:.3f}"],
+            ["Alpha exp(H)", f"{m['alpha_shannon']:.3f}"],
+            ["Gamma exp(H)", f"{m['gamma_shannon']:.3f}"],
+            ["Shannon Beta", f"{m['beta_shannon']:.3f}"],
+            ["Mean Bray-Curtis", f"{m['mean_bray_curtis']:.3f}"],
+            ["Mean Jaccard", f"{m['mean_jaccard']:.3f}"],
+            ["Pairs Evaluated", f"{m['pairs_evaluated']}{' (sampled)' if m['pairs_sampled'] else ''}"],
+        ]
+        return {
+            "render": "table",
+            "data": {
+                "columns": ["Metric", "Value"],
+                "rows": rows,
+            },
+        }
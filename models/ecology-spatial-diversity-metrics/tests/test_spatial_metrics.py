@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+
+def _naive_turnover(matrix):
+    n = len(matrix)
+    bray, jaccard, pairs = 0.0, 0.0, 0
+    for i in range(n):
+        for j in range(i + 1, n):
+            a, b = matrix[i], matrix[j]
+            den = sum(a) + sum(b)
+            bray += sum(abs(x - y) for x, y in zip(a, b)) / den if den else 0.0
+            sa = {k for k, v in enumerate(a) if v > 0}
+            sb = {k for k, v in enumerate(b) if v > 0}
+            union = sa | sb
+            jaccard += 1 - len(sa & sb) / len(union) if union else 0.0
+            pairs += 1
+    return bray / pairs, jaccard / pairs
+
+
+def _patch_signal(matrix):
+    from biosim.signals import BioSignal, SignalMetadata
+
+    return {
+        "patch_abundance": BioSignal(
+            source="landscape",
+            name="patch_abundance",
+            value={"abundance": matrix},
+            time=0.0,
+            metadata=SignalMetadata(description="test", kind="state"),
+        )
+    }
+
+
+def test_exact_partition_and_turnover(biosim):
+    import random
+
+    from src.spatial_metrics import SpatialDiversityMetrics
+
+    rng = random.Random(5)
+    matrix = [[rng.choice([0, 0, rng.randint(1, 50)]) for _ in range(6)] for _ in range(9)]
+    mod = SpatialDiversityMetrics(min_dt=1.0)
+    mod.set_inputs(_patch_signal(matrix))
+    mod.advance_to(1.0)
+    m = mod.get_outputs()["spatial_metrics"].value
+
+    bray, jaccard = _naive_turnover(matrix)
+    richness = [sum(1 for v in row if v > 0) for row in matrix]
+    gamma = sum(1 for k in range(6) if any(row[k] > 0 for row in matrix))
+    assert not m["pairs_sampled"]
+    assert m["pairs_evaluated"] == 36
+    assert abs(m["mean_bray_curtis"] - bray) < 1e-12
+    assert abs(m["mean_jaccard"] - jaccard) < 1e-12
+    assert m["gamma_richness"] == gamma
+    assert abs(m["alpha_richness"] - sum(richness) / len(richness)) < 1e-12
+
+
+def test_large_landscapes_sample_pairs(biosim):
+    import numpy as np
+
+    from src.spatial_metrics import SpatialDiversityMetrics
+
+    rng = np.random.default_rng(0)
+    matrix = rng.poisson(3.0, size=(120, 8))
+    exact = SpatialDiversityMetrics(max_pairs=10**6).compute(matrix)
+    sampled = SpatialDiversityMetrics(max_pairs=4000, seed=1).compute(matrix)
+    assert not exact["pairs_sampled"]
+    assert sampled["pairs_sampled"]
+    assert sampled["pairs_evaluated"] == 4000
+    assert abs(sampled["mean_bray_curtis"] - exact["mean_bray_curtis"]) < 0.02
+    assert abs(sampled["mean_jaccard"] - exact["mean_jaccard"]) < 0.02
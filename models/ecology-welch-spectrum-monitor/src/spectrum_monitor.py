@@ -0,0 +1,194 @@
+# SPDX-FileCopyrightText: 2025-present Demi <bjaiye1@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+"""Welch spectrum monitor: streaming power spectral density of population cycles."""
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Set, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from biosim import BioWorld
+    from biosim.visuals import VisualSpec
+
+from biosim import BioModule
+from biosim.signals import BioSignal, SignalMetadata
+
+from .ecology_support import EMPTY_OUTPUTS, ReadOnlyOutputs, memoized_visual, population_state
+
+
+_SPECTRUM_META = SignalMetadata(description="Welch spectral summary per species", kind="state")
+
+
+class _WelchAccumulator:
+    """Constant-memory Welch PSD estimate for one sampled series.
+
+    Keeps the last ``nperseg`` samples in a circular buffer and, every
+    ``hop`` samples, adds the Hann-windowed, mean-detrended periodogram of
+    that segment to a running sum.
+    """
+
+    def __init__(self, nperseg: int, hop: int) -> None:
+        self.nperseg = nperseg
+        self.hop = hop
+        self._window = np.hanning(nperseg)
+        self._buf = np.zeros(nperseg, dtype=np.float64)
+        self._psd_sum = np.zeros(nperseg // 2 + 1, dtype=np.float64)
+        self._n = 0
+        self._t_first: Optional[float] = None
+        self.dt: float = 1.0
+        self.n_segments = 0
+
+    def push(self, t: float, value: float) -> None:
+        if self._n == 0:
+            self._t_first = t
+        elif self._n == 1 and self._t_first is not None and t > self._t_first:
+            self.dt = t - self._t_first
+
+        self._buf[self._n % self.nperseg] = value
+        self._n += 1
+        if self._n >= self.nperseg and (self._n - self.nperseg) % self.hop == 0:
+            start = self._n % self.nperseg
+            segment = np.concatenate((self._buf[start:], self._buf[:start]))
+            segment -= segment.mean()
+            self._psd_sum += np.abs(np.fft.rfft(segment * self._window)) ** 2
+            self.n_segments += 1
+
+    def frequencies(self) -> np.ndarray:
+        return np.fft.rfftfreq(self.nperseg, d=self.dt)
+
+    def psd(self) -> Optional[np.ndarray]:
+        """One-sided power spectral density averaged over completed segments."""
+        if self.n_segments == 0:
+            return None
+        fs = 1.0 / self.dt
+        psd = self._psd_sum / (self.n_segments * fs * float((self._window ** 2).sum()))
+        if self.nperseg % 2 == 0:
+            psd[1:-1] *= 2.0
+        else:
+            psd[1:] *= 2.0
+        return psd
+
+
+class WelchSpectrumMonitor(BioModule):
+    """Streams Welch power spectral density estimates for each species.
+
+    Receives `population_state` signals and keeps, per species, a circular
+    buffer of ``segment_length`` samples plus the running sum of segment
+    periodograms, so memory is constant in run length. Publishes a
+    `spectrum` signal with the dominant cycle period and spectral power of
+    each species, and visualizes the current spectra (frequency on the x
+    axis).
+
+    Parameters:
+        segment_length: Samples per Welch segment.
+        overlap: Fraction of each segment shared with the next (0 <= overlap < 1).
+    """
+
+    def __init__(
+        self,
+        segment_length: int = 64,
+        overlap: float = 0.5,
+        min_dt: float = 1.0,
+    ) -> None:
+        if segment_length < 4:
+            raise ValueError("segment_length must be at least 4")
+        if not 0.0 <= overlap < 1.0:
+            raise ValueError("overlap must be in [0, 1)")
+        self.min_dt = min_dt
+        self.segment_length = int(segment_length)
+        self.overlap = float(overlap)
+        self._hop = max(1, int(round(self.segment_length * (1.0 - self.overlap))))
+        self._spectra: Dict[str, _WelchAccumulator] = {}
+        self._generation = 0
+        self._visual_cache: Dict[str, Tuple[Any, Any]] = {}
+        self._outputs: Dict[str, BioSignal] = EMPTY_OUTPUTS
+
+    def inputs(self) -> Set[str]:
+        return {"population_state"}
+
+    def outputs(self) -> Set[str]:
+        return {"spectrum"}
+
+    def reset(self) -> None:
+        self._generation += 1
+        self._spectra = {}
+        self._outputs = EMPTY_OUTPUTS
+
+    def set_inputs(self, signals: Dict[str, BioSignal]) -> None:
+        signal = signals.get("population_state")
+        if signal is None:
+            return
+        state = population_state(signal.value, signal.time)
+        if state is None:
+            return
+        self._generation += 1
+        species, count, t = state.species, state.count, state.t
+
+        acc = self._spectra.get(species)
+        if acc is None:
+            acc = self._spectra[species] = _WelchAccumulator(self.segment_length, self._hop)
+        acc.push(t, count)
+
+    def _summary(self, acc: _WelchAccumulator) -> Optional[Dict[str, Any]]:
+        psd = acc.psd()
+        if psd is None:
+            return None
+        freqs = acc.frequencies()
+        peak = 1 + int(np.argmax(psd[1:]))
+        return {
+            "dominant_frequency": float(freqs[peak]),
+            "dominant_period": float(1.0 / freqs[peak]),
+            "dominant_power": float(psd[peak]),
+            "total_power": float(psd[1:].sum() * (freqs[1] - freqs[0])),
+            "n_segments": int(acc.n_segments),
+        }
+
+    def advance_to(self, t: float) -> None:
+        self._generation += 1
+        species: Dict[str, Dict[str, Any]] = {}
+        for name, acc in self._spectra.items():
+            summary = self._summary(acc)
+            if summary is not None:
+                species[name] = summary
+
+        source = getattr(self, "_world_name", self.__class__.__name__)
+        self._outputs = ReadOnlyOutputs({
+            "spectrum": BioSignal(
+                source=source,
+                name="spectrum",
+                value={"t": float(t), "species": species},
+                time=float(t),
+                metadata=_SPECTRUM_META,
+            )
+        })
+
+    def get_outputs(self) -> Dict[str, BioSignal]:
+        return self._outputs
+
+    @memoized_visual
+    def visualize(self) -> Optional["VisualSpec"]:
+        """Generate power spectral density curves (frequency vs power)."""
+        series = []
+        for species in sorted(self._spectra.keys()):
+            acc = self._spectra[species]
+            psd = acc.psd()
+            if psd is None:
+                continue
+            freqs = acc.frequencies()
+            series.append({
+                "name": species,
+                "points": [[float(f), float(p)] for f, p in zip(freqs[1:], psd[1:])],
+            })
+
+        if not series:
+            return None
+
+        return {
+            "render": "timeseries",
+            "data": {
+                "series": series,
+                "title": "Power Spectral Density (Welch)",
+            },
+        }
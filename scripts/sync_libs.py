@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Copy shared helper modules from libs/ into the model packages that use them.
+
+Each model package is loaded on its own (its directory on ``sys.path``, its
+entrypoint imported as ``src.<module>``), so it cannot import from ``libs/``
+directly. Instead it carries a byte-identical copy of each shared module in
+``src/``. Edit the original in ``libs/`` and run this script; ``--check``
+reports copies that have drifted without writing anything.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Shared module in libs/ -> model packages that carry a copy in src/.
+SHARED: dict[str, list[str]] = {
+    "ecology_support.py": [
+        "ecology-abiotic-environment",
+        "ecology-early-warning-monitor",
+        "ecology-multi-phase-space-monitor",
+        "ecology-organism-population",
+        "ecology-phase-space-monitor",
+        "ecology-population-metrics",
+        "ecology-population-monitor",
+        "ecology-predator-prey-interaction",
+        "ecology-predator-prey-lag-monitor",
+        "ecology-spatial-diversity-metrics",
+        "ecology-welch-spectrum-monitor",
+    ],
+    "phase_svg.py": [
+        "ecology-multi-phase-space-monitor",
+        "ecology-phase-space-monitor",
+    ],
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="fail on drifted copies instead of rewriting them")
+    args = parser.parse_args()
+
+    stale: list[str] = []
+    for name, packages in SHARED.items():
+        original = (ROOT / "libs" / name).read_bytes()
+        for package in packages:
+            copy = ROOT / "models" / package / "src" / name
+            if copy.exists() and copy.read_bytes() == original:
+                continue
+            stale.append(str(copy.relative_to(ROOT)))
+            if not args.check:
+                copy.write_bytes(original)
+
+    if args.check and stale:
+        for path in stale:
+            print(f"out of date: {path}", file=sys.stderr)
+        print("Run: python scripts/sync_libs.py", file=sys.stderr)
+        return 1
+    for path in stale:
+        print(f"updated {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
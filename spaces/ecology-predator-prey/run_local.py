@@ -9,6 +9,8 @@ from pathlib import Path
 
 import yaml
 
+from seeding import resolve_seed
+
 
 def _load_space() -> dict:
     return yaml.safe_load((Path(__file__).resolve().parent / "space.yaml").read_text(encoding="utf-8")) or {}
@@ -46,10 +48,20 @@ def _clear_module_cache(module_name: str) -> None:
         sys.modules.pop(k, None)
 
 
+def _close_modules(modules: list) -> None:
+    """End of run: let modules flush buffered records and release resources."""
+    for module in modules:
+        close = getattr(module, "close", None)
+        if callable(close):
+            close()
+
+
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--duration", default="auto")
     parser.add_argument("--tick-dt", default="auto")
+    parser.add_argument("--seed-root", default="auto")
+    parser.add_argument("--replicate", default="auto")
     args = parser.parse_args()
 
     current_repo_root = Path(__file__).resolve().parents[2]
@@ -62,8 +74,14 @@ def main() -> None:
 
     space = _load_space()
     repo_map = _repo_root_map(current_repo_root)
+    runtime = space.get("runtime", {})
+    seed_root = runtime.get("seed_root") if args.seed_root == "auto" else int(args.seed_root)
+    replicate = runtime.get("replicate", 0) if args.replicate == "auto" else int(args.replicate)
+    # The literal seeds in space.yaml belong to its own seed_root/replicate.
+    rederive = args.seed_root != "auto" or args.replicate != "auto"
     world = biosim.BioWorld()
     wb = biosim.WiringBuilder(world)
+    modules = []
 
     for m in space.get("models", []):
         manifest_path = _resolve_model_manifest(repo_map, m)
@@ -81,21 +99,25 @@ def main() -> None:
         _clear_module_cache(module_name)
         importlib.invalidate_caches()
         cls = getattr(importlib.import_module(module_name), class_name)
-        wb.add(m["alias"], cls(**kwargs))
+        resolve_seed(kwargs, cls, m["alias"], seed_root, replicate, rederive)
+        modules.append(cls(**kwargs))
+        wb.add(m["alias"], modules[-1])
 
     for w in space.get("wiring", []):
         wb.connect(w["from"], w.get("to", []))
 
     wb.apply()
-    runtime = space.get("runtime", {})
     duration = runtime.get("duration", 10.0) if args.duration == "auto" else float(args.duration)
     tick_dt = runtime.get("tick_dt", 1.0) if args.tick_dt == "auto" else float(args.tick_dt)
 
-    world.run(duration=float(duration), tick_dt=float(tick_dt))
-
-    visuals = world.collect_visuals()
+    try:
+        world.run(duration=float(duration), tick_dt=float(tick_dt))
+        visuals = world.collect_visuals()
+    finally:
+        _close_modules(modules)
     print(f"Ran space '{space.get('title', 'ecology-predator-prey')}'")
     print(f"Duration={duration}, tick_dt={tick_dt}")
+    print(f"seed_root={seed_root}, replicate={replicate}")
     print(f"Modules={len(getattr(world, 'module_names', []))}, visuals={len(visuals)}")
 
 
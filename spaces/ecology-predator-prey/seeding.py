@@ -0,0 +1,53 @@
+"""Per-module RNG seeds for ecology-predator-prey, shared by the runners and tests."""
+from __future__ import annotations
+
+import inspect
+import zlib
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+def module_seed(seed_root: int, replicate: int, alias: str) -> int:
+    """Derive the RNG seed for one module alias of one replicate.
+
+    The seed comes from ``SeedSequence(seed_root, spawn_key=(replicate,
+    crc32(alias)))``. This is not a child that ``SeedSequence.spawn`` would
+    hand out, since ``spawn`` numbers children sequentially. Building the key
+    from the replicate index and a stable hash of the alias lets any worker
+    rebuild any replicate's streams without coordination or knowing the
+    model order. The seed is 32 bits wide so the literal copies written into
+    ``space.yaml`` and ``wiring.yaml`` survive any YAML or JSON loader intact.
+    """
+    key = (int(replicate), zlib.crc32(alias.encode("utf-8")))
+    return int(np.random.SeedSequence(int(seed_root), spawn_key=key).generate_state(1, np.uint32)[0])
+
+
+def accepts_seed(cls: type) -> bool:
+    """Whether ``cls`` takes a ``seed`` constructor argument."""
+    try:
+        return "seed" in inspect.signature(cls).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def resolve_seed(
+    kwargs: Dict[str, Any],
+    cls: type,
+    alias: str,
+    seed_root: Optional[int],
+    replicate: int,
+    rederive: bool = False,
+) -> None:
+    """Set ``kwargs["seed"]`` for one module of the space.
+
+    ``space.yaml`` and ``wiring.yaml`` carry literal seeds equal to
+    ``module_seed(seed_root, replicate, alias)`` for their runtime section, so
+    loaders that ignore ``seed_root`` still run seeded and reproducibly. A
+    literal seed is kept unless ``rederive`` is set (the caller asked for
+    another seed root or replicate); a missing one is derived.
+    """
+    if seed_root is None or not accepts_seed(cls):
+        return
+    if rederive or kwargs.get("seed") is None:
+        kwargs["seed"] = module_seed(seed_root, replicate, alias)
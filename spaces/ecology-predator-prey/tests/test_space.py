@@ -7,6 +7,9 @@ from pathlib import Path
 import pytest
 import yaml
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from seeding import accepts_seed, module_seed, resolve_seed  # noqa: E402
+
 
 def _load_space():
     return yaml.safe_load((Path(__file__).resolve().parents[1] / "space.yaml").read_text(encoding="utf-8"))
@@ -29,6 +32,46 @@ def _clear_module_cache(module_name: str) -> None:
         sys.modules.pop(k, None)
 
 
+def _import_biosim():
+    current_repo_root = Path(__file__).resolve().parents[3]
+    monorepo_root = current_repo_root.parents[1]
+    bsim_src = monorepo_root / "bsim" / "src"
+    if bsim_src.exists():
+        sys.path.insert(0, str(bsim_src))
+    return pytest.importorskip("biosim"), _repo_root_map(current_repo_root)
+
+
+def _build_world(biosim, s: dict, repo_map: dict[str, Path], replicate: int | None = None):
+    seed_root = s["runtime"].get("seed_root")
+    rederive = replicate is not None
+    if replicate is None:
+        replicate = s["runtime"].get("replicate", 0)
+    world = biosim.BioWorld()
+    wb = biosim.WiringBuilder(world)
+    modules = {}
+    for m in s["models"]:
+        manifest_path = _resolve_model_manifest(repo_map, m)
+        manifest = yaml.safe_load(manifest_path.read_text(encoding="utf-8"))
+        meta = manifest.get("biosim") or {}
+        ep = meta["entrypoint"]
+        module_name, class_name = ep.split(":", 1)
+        model_dir = manifest_path.parent
+        sys.path.insert(0, str(model_dir))
+        kwargs = dict(meta.get("init_kwargs") or {})
+        kwargs.update(dict(m.get("parameters") or {}))
+        _clear_module_cache(module_name)
+        importlib.invalidate_caches()
+        cls = getattr(importlib.import_module(module_name), class_name)
+        resolve_seed(kwargs, cls, m["alias"], seed_root, replicate, rederive)
+        modules[m["alias"]] = cls(**kwargs)
+        wb.add(m["alias"], modules[m["alias"]])
+
+    for w in s["wiring"]:
+        wb.connect(w["from"], w.get("to", []))
+    wb.apply()
+    return world, modules
+
+
 def test_space_schema_and_paths():
     s = _load_space()
     assert s["schema_version"] == "2.0"
@@ -52,37 +95,73 @@ def test_wiring_alias_references():
 
 
 def test_space_smoke_runs_if_bsim_available():
-    current_repo_root = Path(__file__).resolve().parents[3]
-    monorepo_root = current_repo_root.parents[1]
-    bsim_src = monorepo_root / "bsim" / "src"
-    if bsim_src.exists():
-        sys.path.insert(0, str(bsim_src))
-    biosim = pytest.importorskip("biosim")
+    biosim, repo_map = _import_biosim()
     s = _load_space()
-    repo_map = _repo_root_map(current_repo_root)
+    world, modules = _build_world(biosim, s, repo_map)
+    tick_dt = float(s["runtime"]["tick_dt"])
+    duration = min(float(s["runtime"]["duration"]), tick_dt * 20)
+    try:
+        world.run(duration=duration, tick_dt=tick_dt)
+        visuals = world.collect_visuals()
+    finally:
+        for module in modules.values():
+            close = getattr(module, "close", None)
+            if callable(close):
+                close()
+    assert isinstance(visuals, list)
 
-    world = biosim.BioWorld()
-    wb = biosim.WiringBuilder(world)
+
+def test_module_seeds_are_derived_per_alias_and_replicate():
+    s = _load_space()
+    root = s["runtime"]["seed_root"]
+    aliases = [m["alias"] for m in s["models"]]
+    seeds = {(r, a): module_seed(root, r, a) for r in range(3) for a in aliases}
+    assert len(set(seeds.values())) == len(seeds)
+    # Derivation depends only on (root, replicate, alias), not on call order.
+    assert module_seed(root, 2, "foxes") == seeds[(2, "foxes")]
+    assert module_seed(root + 1, 2, "foxes") != seeds[(2, "foxes")]
+
+
+def test_literal_seeds_match_the_derived_ones():
+    s = _load_space()
+    wiring = yaml.safe_load((Path(__file__).resolve().parents[1] / "wiring.yaml").read_text(encoding="utf-8"))
+    root, replicate = s["runtime"]["seed_root"], s["runtime"]["replicate"]
+    for key in ("seed_root", "replicate"):
+        assert wiring["runtime"][key] == s["runtime"][key]
+    seeded = set()
     for m in s["models"]:
-        manifest_path = _resolve_model_manifest(repo_map, m)
-        manifest = yaml.safe_load(manifest_path.read_text(encoding="utf-8"))
-        meta = manifest.get("biosim") or {}
-        ep = meta["entrypoint"]
-        module_name, class_name = ep.split(":", 1)
-        model_dir = manifest_path.parent
-        sys.path.insert(0, str(model_dir))
-        kwargs = dict(meta.get("init_kwargs") or {})
-        kwargs.update(dict(m.get("parameters") or {}))
-        _clear_module_cache(module_name)
-        importlib.invalidate_caches()
-        cls = getattr(importlib.import_module(module_name), class_name)
-        wb.add(m["alias"], cls(**kwargs))
+        seed = (m.get("parameters") or {}).get("seed")
+        assert wiring["modules"][m["alias"]]["args"].get("seed") == seed
+        if seed is not None:
+            assert seed == module_seed(root, replicate, m["alias"])
+            assert 0 <= seed < 2**32
+            seeded.add(m["alias"])
+    assert seeded == {"environment", "rabbits", "foxes", "predation"}
 
-    for w in s["wiring"]:
-        wb.connect(w["from"], w.get("to", []))
-    wb.apply()
+
+def test_replicates_are_reproducible_without_coordination():
+    biosim, repo_map = _import_biosim()
+    s = _load_space()
     tick_dt = float(s["runtime"]["tick_dt"])
     duration = min(float(s["runtime"]["duration"]), tick_dt * 20)
-    world.run(duration=duration, tick_dt=tick_dt)
-    visuals = world.collect_visuals()
-    assert isinstance(visuals, list)
+
+    def trajectory(replicate: int):
+        world, modules = _build_world(biosim, s, repo_map, replicate)
+        world.run(duration=duration, tick_dt=tick_dt)
+        return modules["rabbits"].get_state()["count"], modules["foxes"].get_state()["count"]
+
+    first = trajectory(1)
+    other = trajectory(0)
+    assert trajectory(1) == first
+    assert other != first
+    # The literal seeds are replicate 0 of the space's seed_root.
+    assert trajectory(None) == other
+
+
+def test_every_seedable_module_has_a_literal_seed():
+    biosim, repo_map = _import_biosim()
+    s = _load_space()
+    _, modules = _build_world(biosim, s, repo_map)
+    for m in s["models"]:
+        if accepts_seed(type(modules[m["alias"]])):
+            assert "seed" in (m.get("parameters") or {}), m["alias"]